@@ -1,4 +1,5 @@
 # backend/app/main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import create_engine
@@ -14,13 +15,15 @@ from .models.user import Base
 from .models.student import Student, Class, Teacher
 from .models.grade import Grade, Attendance
 from .models.fee import Fee
+from .models.counter import EntityCounter
+from .models.risk import StudentRiskScore
 # Import all models from timetable.py (they're all defined in this file)
 from .models.timetable import TimeSlot, Event, Message, ReportCard, GradeSummary, LearningMaterial, ClassMaterial
 
 # Import routers
 from .routers import auth, students, analytics, fees, attendance
 # Import new routers
-from .routers import teachers, classes, dashboard, financial
+from .routers import teachers, classes, dashboard, financial, parents
 # Conditionally import other routers if they exist
 try:
     from .routers import events, messages, report_cards, materials
@@ -28,14 +31,43 @@ try:
 except ImportError:
     has_additional_routers = False
 
+# Import background jobs
+from .services.scheduler import scheduler
+from .services.fee_jobs import run_overdue_sweep, build_missing_accounts, OVERDUE_SWEEP_INTERVAL_SECONDS
+from .services.counters import run_counter_reconciliation, seed_counters, COUNTER_RECONCILE_INTERVAL_SECONDS
+from .services.analytics_snapshot import run_snapshot_export, SNAPSHOT_INTERVAL_SECONDS
+from .services.risk_scoring import run_risk_scoring, RISK_SCORING_INTERVAL_SECONDS
+from .services.student_search import run_search_index_refresh, REFRESH_INTERVAL_SECONDS
+from .services.forecast import run_forecast_refresh, FORECAST_REFRESH_INTERVAL_SECONDS
+from .services.financial_reports import run_report_cleanup, REPORT_CLEANUP_INTERVAL_SECONDS
+
 # Create database tables
 engine = create_engine(DATABASE_URL)
 Base.metadata.create_all(bind=engine)
 
+# Register periodic maintenance jobs
+scheduler.add_job("overdue-fee-sweep", run_overdue_sweep, OVERDUE_SWEEP_INTERVAL_SECONDS)
+scheduler.add_job("entity-counter-reconciliation", run_counter_reconciliation, COUNTER_RECONCILE_INTERVAL_SECONDS)
+scheduler.add_job("analytics-snapshot-export", run_snapshot_export, SNAPSHOT_INTERVAL_SECONDS)
+scheduler.add_job("student-risk-scoring", run_risk_scoring, RISK_SCORING_INTERVAL_SECONDS)
+scheduler.add_job("student-search-index", run_search_index_refresh, REFRESH_INTERVAL_SECONDS)
+scheduler.add_job("cash-flow-forecast-inputs", run_forecast_refresh, FORECAST_REFRESH_INTERVAL_SECONDS)
+scheduler.add_job("report-cleanup", run_report_cleanup, REPORT_CLEANUP_INTERVAL_SECONDS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    build_missing_accounts()
+    # Seed entity counters before serving, so no request races the scheduler to insert them
+    seed_counters()
+    scheduler.start()
+    yield
+    scheduler.shutdown()
+
 app = FastAPI(
     title="Downtown Nursery School Management System",
     description="API for the Downtown Nursery School Management System with the motto: 'We shall reach the shore'",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -45,6 +77,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Cache-Age"],
 )
 
 # Include routers
@@ -59,6 +92,7 @@ app.include_router(teachers.router)
 app.include_router(classes.router)
 app.include_router(dashboard.router)
 app.include_router(financial.router)
+app.include_router(parents.router)
 
 # Include additional routers if they exist
 if has_additional_routers:
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from .user import Base
+
+class EntityCounter(Base):
+    """Maintained row count for a headline entity, e.g. "students" or "users:parent" """
+    __tablename__ = "entity_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+    reconciled_at = Column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .user import Base
 
@@ -6,14 +6,79 @@ class Fee(Base):
     __tablename__ = "fees"
 
     id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("students.id"))
+    student_id = Column(Integer, ForeignKey("students.id"), index=True)
     amount = Column(Float)
     description = Column(String)
-    due_date = Column(Date)
+    due_date = Column(Date, index=True)
     paid = Column(Float, default=0.0)
     status = Column(String)  # "paid", "pending", "overdue"
     term = Column(String)
     academic_year = Column(String)
-    
+
+    # Relationships
+    student = relationship("Student", back_populates="fees")
+    payments = relationship("FeePayment", back_populates="fee", cascade="all, delete-orphan")
+
+# Partial index covering only fees with an outstanding balance, used by the
+# payments-due listing (due date range + amount > paid)
+Index(
+    "ix_fees_unpaid_due_date",
+    Fee.due_date,
+    Fee.student_id,
+    postgresql_where=(Fee.amount > Fee.paid),
+    sqlite_where=(Fee.amount > Fee.paid),
+)
+
+class StudentAccount(Base):
+    """Denormalized per-student fee totals, kept in step with the fees table"""
+    __tablename__ = "student_accounts"
+
+    student_id = Column(Integer, ForeignKey("students.id"), primary_key=True)
+    total_billed = Column(Float, default=0.0, nullable=False)
+    total_paid = Column(Float, default=0.0, nullable=False)
+    balance = Column(Float, default=0.0, nullable=False, index=True)
+    oldest_unpaid_due_date = Column(Date, nullable=True)
+
+    # Relationships
+    student = relationship("Student", back_populates="account")
+
+class UnmatchedBankLine(Base):
+    """Bank statement line that reconciliation could not apply, awaiting review"""
+    __tablename__ = "unmatched_bank_lines"
+
+    id = Column(Integer, primary_key=True, index=True)
+    import_id = Column(String, index=True)
+    line_number = Column(Integer)
+    transaction_date = Column(String)
+    amount = Column(Float)
+    reference = Column(String)
+    reason = Column(String)  # "no match", "no open fees", "overpayment", "invalid amount"
+    status = Column(String, default="pending", index=True)  # "pending", "resolved", "dismissed"
+    fee_id = Column(Integer, ForeignKey("fees.id"), nullable=True)
+    created_at = Column(DateTime)
+
+class ImportedBankLine(Base):
+    """Fingerprint of every statement line already imported, so re-imports skip it"""
+    __tablename__ = "imported_bank_lines"
+
+    id = Column(Integer, primary_key=True, index=True)
+    line_hash = Column(String, unique=True, nullable=False)
+    import_id = Column(String, index=True)
+    line_number = Column(Integer)
+    imported_at = Column(DateTime)
+
+class FeePayment(Base):
+    """A single payment applied to a fee, kept as payment history"""
+    __tablename__ = "fee_payments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    fee_id = Column(Integer, ForeignKey("fees.id"), index=True)
+    student_id = Column(Integer, ForeignKey("students.id"), index=True)
+    amount = Column(Float)
+    paid_at = Column(DateTime, index=True)
+    method = Column(String)  # "manual", "bank"
+    reference = Column(String, nullable=True)
+    recorded_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+
     # Relationships
-    student = relationship("Student", back_populates="fees")
\ No newline at end of file
+    fee = relationship("Fee", back_populates="payments")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from .user import Base
 
@@ -16,6 +16,9 @@ class Grade(Base):
     # Relationships
     student = relationship("Student", back_populates="grades")
 
+# Serves per-student and per-class grade analytics filtered by subject and term
+Index("ix_grades_student_subject_term", Grade.student_id, Grade.subject, Grade.term)
+
 class Attendance(Base):
     __tablename__ = "attendance"
     
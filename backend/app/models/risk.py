@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from .user import Base
+
+class StudentRiskScore(Base):
+    """Latest early-warning score per student, rebuilt by the nightly scoring job"""
+    __tablename__ = "student_risk_scores"
+
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False, index=True)  # 0 (no concern) to 100
+    risk_level = Column(String, nullable=False, index=True)  # 'low', 'medium', 'high'
+    attendance_rate = Column(Float, nullable=True)  # None when no attendance was taken
+    grade_average = Column(Float, nullable=True)
+    grade_slope = Column(Float, nullable=True)  # score points per 30 days
+    balance = Column(Float, default=0.0, nullable=False)
+    days_overdue = Column(Integer, default=0, nullable=False)
+    computed_at = Column(DateTime, nullable=False)
+
+    student = relationship("Student", back_populates="risk_score")
@@ -21,6 +21,8 @@ class Student(Base):
     admission_number = Column(String, unique=True, index=True)
     parent_id = Column(Integer, ForeignKey("users.id"))
     fees = relationship("Fee", back_populates="student", cascade="all, delete-orphan")
+    account = relationship("StudentAccount", back_populates="student", uselist=False, cascade="all, delete-orphan")
+    risk_score = relationship("StudentRiskScore", back_populates="student", uselist=False, cascade="all, delete-orphan")
     
     # Relationships
     parent = relationship("User", back_populates="students")
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, extract, and_, or_
+from sqlalchemy import func, case, extract, and_, or_, select
 from typing import List, Dict, Any, Optional
 from datetime import date, datetime, timedelta
 from pydantic import BaseModel
@@ -10,7 +10,14 @@ from ..models.user import User, UserRole
 from ..models.student import Student, Class, Teacher, student_class
 from ..models.grade import Grade, Attendance
 from ..models.fee import Fee
+from ..models.risk import StudentRiskScore
+from ..services.fee_summary import get_fee_totals
+from ..services.dashboard import SECTION_FALLBACKS
+from ..services.sections import run_sections
+from ..services.counters import get_headline_counts
+from ..services.analytics_snapshot import current_snapshot
 from ..utils.auth_utils import get_current_active_user
+from ..utils.sql_dates import date_bucket, bucket_start, term_number
 
 # Initialize the router
 router = APIRouter(
@@ -26,6 +33,7 @@ class DashboardStatsResponse(BaseModel):
     class_count: int
     financial_summary: Dict[str, float]
     attendance_today: Dict[str, Any]
+    degraded_sections: List[str] = []
 
 # Define new response model for dashboard charts
 class DashboardChartsResponse(BaseModel):
@@ -34,45 +42,65 @@ class DashboardChartsResponse(BaseModel):
     performance_trends: List[Dict[str, Any]]
     fee_collection: List[Dict[str, Any]]
     fee_distribution: List[Dict[str, Any]]
+    degraded_sections: List[str] = []
+    source: str = "live"
+
+# Sample chart data shown until the school has recorded any
+SAMPLE_GRADE_DISTRIBUTION = [
+    {"grade": "A", "count": 30},
+    {"grade": "B", "count": 45},
+    {"grade": "C", "count": 28},
+    {"grade": "D", "count": 15},
+    {"grade": "F", "count": 5},
+]
+
+SAMPLE_PERFORMANCE_TRENDS = [
+    {"month": "Jan", "averageScore": 75, "highestScore": 95, "lowestScore": 55, "subject": "Overall"},
+    {"month": "Feb", "averageScore": 78, "highestScore": 98, "lowestScore": 58, "subject": "Overall"},
+    {"month": "Mar", "averageScore": 80, "highestScore": 96, "lowestScore": 62, "subject": "Overall"},
+    {"month": "Apr", "averageScore": 82, "highestScore": 97, "lowestScore": 65, "subject": "Overall"},
+    {"month": "May", "averageScore": 79, "highestScore": 94, "lowestScore": 60, "subject": "Overall"},
+    {"month": "Jun", "averageScore": 81, "highestScore": 96, "lowestScore": 63, "subject": "Overall"},
+]
+
+SAMPLE_FEE_DISTRIBUTION = [
+    {"status": "paid", "count": 35},
+    {"status": "pending", "count": 15},
+    {"status": "overdue", "count": 8}
+]
+
+def attendance_counts_today(db: Session) -> Dict[str, int]:
+    """Today's attendance counts by status"""
+    attendance_counts = db.query(
+        Attendance.status,
+        func.count(Attendance.id).label("count")
+    ).filter(
+        Attendance.date == date.today()
+    ).group_by(
+        Attendance.status
+    ).all()
+    
+    return {status: count for status, count in attendance_counts}
 
 @router.get("/dashboard-stats", response_model=DashboardStatsResponse)
 def get_dashboard_stats(
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get comprehensive dashboard statistics"""
     if current_user.role not in ["admin", "teacher"]:
         raise HTTPException(status_code=403, detail="Not authorized to view analytics")
     
-    # Count users by role
-    student_count = db.query(Student).count()
-    teacher_count = db.query(Teacher).count()
-    parent_count = db.query(User).filter(User.role == UserRole.PARENT).count()
-    class_count = db.query(Class).count()
-    
-    # Get financial summary
-    fee_summary = db.query(
-        func.sum(Fee.amount).label("total_amount"),
-        func.sum(Fee.paid).label("total_paid")
-    ).first()
+    # Independent aggregates run concurrently, each in its own session
+    results, degraded = run_sections({
+        # Maintained counters: one primary-key read instead of four COUNT(*)s
+        "headline_counts": get_headline_counts,
+        # Served from the shared fee summary cache
+        "financial_summary": get_fee_totals,
+        "attendance_counts": attendance_counts_today
+    }, SECTION_FALLBACKS)
     
-    total_amount = fee_summary.total_amount or 0
-    total_paid = fee_summary.total_paid or 0
-    total_balance = float(total_amount) - float(total_paid)
-    payment_rate = (float(total_paid) / float(total_amount) * 100) if total_amount > 0 else 0
-    
-    # Get today's attendance
-    today = date.today()
-    
-    # Get counts by status
-    attendance_counts = db.query(
-        Attendance.status,
-        func.count(Attendance.id).label("count")
-    ).filter(
-        Attendance.date == today
-    ).group_by(
-        Attendance.status
-    ).all()
+    counts = results["headline_counts"]
+    student_count = counts["student_count"]
     
     attendance_stats = {
         "present": 0,
@@ -83,7 +111,7 @@ def get_dashboard_stats(
         "rate": 0
     }
     
-    for status, count in attendance_counts:
+    for status, count in results["attendance_counts"].items():
         if status in attendance_stats:
             attendance_stats[status] = count
     
@@ -95,67 +123,60 @@ def get_dashboard_stats(
         attendance_stats["rate"] = (attendance_stats["present"] / total_checked) * 100
     
     return {
-        "student_count": student_count,
-        "teacher_count": teacher_count,
-        "parent_count": parent_count,
-        "class_count": class_count,
-        "financial_summary": {
-            "total_amount": float(total_amount),
-            "total_paid": float(total_paid),
-            "total_balance": float(total_balance),
-            "payment_rate": float(payment_rate)
-        },
-        "attendance_today": attendance_stats
+        **counts,
+        "financial_summary": results["financial_summary"],
+        "attendance_today": attendance_stats,
+        "degraded_sections": degraded
     }
 
-@router.get("/dashboard-charts", response_model=DashboardChartsResponse)
-def get_dashboard_charts(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-    time_period: str = "6m"  # Default to 6 months
-):
-    """Get all chart data for the dashboard"""
-    if current_user.role not in ["admin", "teacher"]:
-        raise HTTPException(status_code=403, detail="Not authorized to view analytics")
-    
-    # Get attendance data for the specified time period
-    today = date.today()
-    
-    # Determine time period in days
-    if time_period == "1y":
-        days_ago = 365
-    elif time_period == "3m":
-        days_ago = 90
-    else:  # Default to 6m
-        days_ago = 180
-    
-    start_date = today - timedelta(days=days_ago)
-    
-    # Generate attendance data points (weekly)
-    attendance_data = []
+def bucket_label(start: date, period: str) -> str:
+    """Chart label for a time bucket"""
+    if period == "month":
+        return start.strftime("%b %Y")
+    if period == "term":
+        return f"Term {term_number(start)} {start.year}"
+    return start.strftime("%b %d")
+
+def attendance_series(
+    db: Session,
+    start_date: date,
+    end_date: Optional[date] = None,
+    period: str = "week",
+    class_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Present/absent counts per time bucket in one grouped query"""
+    bucket = date_bucket(db, Attendance.date, period).label("bucket")
     
-    # Get weekly attendance using status field
-    weekly_attendance = db.query(
-        func.date_trunc('week', Attendance.date).label('week'),
+    query = db.query(
+        bucket,
         func.sum(case((Attendance.status == 'present', 1), else_=0)).label('present'),
         func.sum(case((Attendance.status == 'absent', 1), else_=0)).label('absent')
     ).filter(
         Attendance.date >= start_date
-    ).group_by(
-        func.date_trunc('week', Attendance.date)
-    ).order_by(
-        func.date_trunc('week', Attendance.date)
-    ).all()
+    )
     
-    for week, present, absent in weekly_attendance:
-        if week:
-            attendance_data.append({
-                "date": week.strftime("%b %d"),
-                "present": int(present or 0),
-                "absent": int(absent or 0)
-            })
+    if end_date:
+        query = query.filter(Attendance.date <= end_date)
+    
+    if class_id is not None:
+        query = query.filter(
+            Attendance.student_id.in_(select(student_class.c.student_id).where(student_class.c.class_id == class_id))
+        )
     
-    # Get grade distribution
+    rows = query.group_by(bucket).order_by(bucket).all()
+    
+    return [
+        {
+            "date": bucket_label(bucket_start(value, period), period),
+            "present": int(present or 0),
+            "absent": int(absent or 0)
+        }
+        for value, present, absent in rows
+        if value is not None
+    ]
+
+def grade_distribution_data(db: Session) -> List[Dict[str, Any]]:
+    """Count of grades per letter"""
     grade_distribution = db.query(
         Grade.grade_letter.label("grade"),
         func.count(Grade.id).label("count")
@@ -166,21 +187,21 @@ def get_dashboard_charts(
     grade_data = [{"grade": grade, "count": count} for grade, count in grade_distribution]
     
     # If no grade data, provide fallback sample data
-    if not grade_data:
-        grade_data = [
-            {"grade": "A", "count": 30},
-            {"grade": "B", "count": 45},
-            {"grade": "C", "count": 28},
-            {"grade": "D", "count": 15},
-            {"grade": "F", "count": 5},
-        ]
-    
-    # Get performance trends (monthly average scores)
+    return grade_data or SAMPLE_GRADE_DISTRIBUTION
+
+# Months covered by the performance and fee collection charts
+MONTHS_TO_ANALYZE = 6
+
+def analysis_months() -> List[date]:
+    """A day in each charted month, oldest first"""
+    today = date.today()
+    return [today - timedelta(days=30 * month_offset) for month_offset in range(MONTHS_TO_ANALYZE-1, -1, -1)]
+
+def performance_trends_data(db: Session) -> List[Dict[str, Any]]:
+    """Monthly average, highest and lowest scores"""
     performance_data = []
-    months_to_analyze = 6  # Last 6 months
     
-    for month_offset in range(months_to_analyze-1, -1, -1):
-        month_date = today - timedelta(days=30 * month_offset)
+    for month_date in analysis_months():
         month_name = month_date.strftime("%b")
         
         # Get average scores by month
@@ -203,21 +224,13 @@ def get_dashboard_charts(
             })
     
     # If no performance data, provide fallback sample data
-    if not performance_data:
-        performance_data = [
-            {"month": "Jan", "averageScore": 75, "highestScore": 95, "lowestScore": 55, "subject": "Overall"},
-            {"month": "Feb", "averageScore": 78, "highestScore": 98, "lowestScore": 58, "subject": "Overall"},
-            {"month": "Mar", "averageScore": 80, "highestScore": 96, "lowestScore": 62, "subject": "Overall"},
-            {"month": "Apr", "averageScore": 82, "highestScore": 97, "lowestScore": 65, "subject": "Overall"},
-            {"month": "May", "averageScore": 79, "highestScore": 94, "lowestScore": 60, "subject": "Overall"},
-            {"month": "Jun", "averageScore": 81, "highestScore": 96, "lowestScore": 63, "subject": "Overall"},
-        ]
-    
-    # Get fee collection data (monthly)
+    return performance_data or SAMPLE_PERFORMANCE_TRENDS
+
+def fee_collection_data(db: Session) -> List[Dict[str, Any]]:
+    """Fees collected per month of due date"""
     monthly_collection = []
     
-    for month_offset in range(months_to_analyze-1, -1, -1):
-        month_date = today - timedelta(days=30 * month_offset)
+    for month_date in analysis_months():
         month_name = month_date.strftime("%b")
         
         # Calculate fees collected for this month
@@ -233,7 +246,10 @@ def get_dashboard_charts(
             "amount": float(fees_collected)
         })
     
-    # Get fee status distribution
+    return monthly_collection
+
+def fee_distribution_data(db: Session) -> List[Dict[str, Any]]:
+    """Count of fees per status"""
     fee_statuses = db.query(
         Fee.status,
         func.count(Fee.id).label("count")
@@ -244,17 +260,277 @@ def get_dashboard_charts(
     fee_distribution = [{"status": status, "count": count} for status, count in fee_statuses]
     
     # If there's no fee status data, provide fallback data
-    if not fee_distribution:
-        fee_distribution = [
-            {"status": "paid", "count": 35},
-            {"status": "pending", "count": 15},
-            {"status": "overdue", "count": 8}
-        ]
+    return fee_distribution or SAMPLE_FEE_DISTRIBUTION
+
+@router.get("/dashboard-charts", response_model=DashboardChartsResponse)
+def get_dashboard_charts(
+    current_user: User = Depends(get_current_active_user),
+    time_period: str = "6m",  # Default to 6 months
+    source: str = Query("auto", pattern="^(auto|snapshot|live)$")
+):
+    """Get all chart data for the dashboard"""
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Not authorized to view analytics")
     
-    return {
-        "attendance_data": attendance_data,
-        "grade_distribution": grade_data,
-        "performance_trends": performance_data,
-        "fee_collection": monthly_collection,
-        "fee_distribution": fee_distribution
-    }
\ No newline at end of file
+    # Determine time period in days
+    if time_period == "1y":
+        days_ago = 365
+    elif time_period == "3m":
+        days_ago = 90
+    else:  # Default to 6m
+        days_ago = 180
+    
+    start_date = date.today() - timedelta(days=days_ago)
+    
+    # Prefer the columnar snapshot so charts don't compete with daytime writes
+    snapshot = current_snapshot() if source != "live" else None
+    if source == "snapshot" and snapshot is None:
+        raise HTTPException(status_code=503, detail="No recent analytics snapshot is available")
+    
+    if snapshot is not None:
+        months = analysis_months()
+        return {
+            "attendance_data": snapshot.weekly_attendance(start_date),
+            "grade_distribution": snapshot.grade_distribution() or SAMPLE_GRADE_DISTRIBUTION,
+            "performance_trends": snapshot.monthly_grade_stats(months) or SAMPLE_PERFORMANCE_TRENDS,
+            "fee_collection": snapshot.monthly_fee_collection(months),
+            "fee_distribution": snapshot.fee_status_counts() or SAMPLE_FEE_DISTRIBUTION,
+            "source": "snapshot"
+        }
+    
+    # Each chart is independent, so they run concurrently in their own sessions
+    results, degraded = run_sections({
+        "attendance_data": lambda db: attendance_series(db, start_date),
+        "grade_distribution": grade_distribution_data,
+        "performance_trends": performance_trends_data,
+        "fee_collection": fee_collection_data,
+        "fee_distribution": fee_distribution_data
+    }, SECTION_FALLBACKS)
+    
+    return dict(results, degraded_sections=degraded)
+
+@router.get("/attendance-data")
+def get_attendance_data(
+    period: str = Query("week", pattern="^(day|week|month|term)$"),
+    class_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Present/absent counts per day, week, month or term"""
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Not authorized to view analytics")
+    
+    if start_date is None:
+        start_date = (end_date or date.today()) - timedelta(days=180)
+    
+    return attendance_series(db, start_date, end_date, period, class_id)
+
+# Letters pivoted into columns; modifiers such as "B+" count towards their letter
+GRADE_LETTERS = ["A", "B", "C", "D", "E", "F"]
+
+class SubjectComparison(BaseModel):
+    subject: str
+    average: Optional[float] = None
+    classAverage: Optional[float] = None
+    highestScore: Optional[float] = None
+    lowestScore: Optional[float] = None
+    count: int
+    letters: Dict[str, int]
+
+def filter_grades(
+    query,
+    class_id: Optional[int] = None,
+    term: Optional[str] = None,
+    subject: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """Apply the common grade analytics filters to a query over grades"""
+    if class_id is not None:
+        query = query.filter(
+            Grade.student_id.in_(select(student_class.c.student_id).where(student_class.c.class_id == class_id))
+        )
+    
+    if term:
+        query = query.filter(Grade.term == term)
+    
+    if subject:
+        query = query.filter(Grade.subject == subject)
+    
+    if start_date:
+        query = query.filter(Grade.date_recorded >= start_date)
+    
+    if end_date:
+        query = query.filter(Grade.date_recorded <= end_date)
+    
+    return query
+
+def letter_counts(condition=None):
+    """One conditional count column per grade letter, optionally only over rows matching condition"""
+    letter = func.upper(func.substr(Grade.grade_letter, 1, 1))
+    if condition is not None:
+        # NULL, so never counted, for the other rows
+        letter = case((condition, letter))
+    return [
+        func.sum(case((letter == grade_letter, 1), else_=0)).label(grade_letter)
+        for grade_letter in GRADE_LETTERS
+    ]
+
+@router.get("/subject-comparison", response_model=List[SubjectComparison])
+def get_subject_comparison(
+    student_id: Optional[int] = None,
+    class_id: Optional[int] = None,
+    term: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Compare subjects by average, range and letter counts in one pivot query
+    
+    With student_id every figure is the student's, compared against
+    classAverage over the student's classes (or class_id when given).
+    """
+    if current_user.role == "parent":
+        if student_id is None:
+            raise HTTPException(status_code=403, detail="Not authorized to view analytics")
+        student = db.query(Student).filter(Student.id == student_id).first()
+        if not student or student.parent_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to view this student's grades")
+    
+    # With a student every figure is theirs except classAverage, which is
+    # taken over the classes they belong to (or class_id when given)
+    if student_id is not None:
+        is_student = Grade.student_id == student_id
+        score = case((is_student, Grade.score))
+        count = func.sum(case((is_student, 1), else_=0))
+        letters = letter_counts(is_student)
+    else:
+        score = Grade.score
+        count = func.count(Grade.id)
+        letters = letter_counts()
+    
+    query = db.query(
+        Grade.subject,
+        func.avg(score).label("average"),
+        func.avg(Grade.score).label("class_average"),
+        func.max(score).label("highest"),
+        func.min(score).label("lowest"),
+        count.label("count"),
+        *letters
+    )
+    if student_id is not None:
+        if class_id is not None:
+            cohort_classes = [class_id]
+        else:
+            cohort_classes = select(student_class.c.class_id).where(student_class.c.student_id == student_id)
+        cohort = select(student_class.c.student_id).where(student_class.c.class_id.in_(cohort_classes))
+        query = filter_grades(query, None, term, None, start_date, end_date)
+        # Only subjects the student has grades in
+        query = query.filter(or_(is_student, Grade.student_id.in_(cohort))).having(count > 0)
+    else:
+        query = filter_grades(query, class_id, term, None, start_date, end_date)
+    rows = query.group_by(Grade.subject).order_by(Grade.subject).all()
+    
+    return [
+        {
+            "subject": row.subject,
+            "average": round(float(row.average), 1) if row.average is not None else None,
+            "classAverage": round(float(row.class_average), 1) if row.class_average is not None else None,
+            "highestScore": row.highest,
+            "lowestScore": row.lowest,
+            "count": row.count,
+            "letters": {grade_letter: int(getattr(row, grade_letter) or 0) for grade_letter in GRADE_LETTERS}
+        }
+        for row in rows
+        if row.subject is not None
+    ]
+
+@router.get("/grade-distribution")
+def get_grade_distribution(
+    class_id: Optional[int] = None,
+    subject: Optional[str] = None,
+    term: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Count grades per letter in one conditional-aggregate query"""
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Not authorized to view analytics")
+    
+    row = filter_grades(db.query(*letter_counts()), class_id, term, subject, start_date, end_date).one()
+    
+    return [
+        {"grade": grade_letter, "count": int(getattr(row, grade_letter) or 0)}
+        for grade_letter in GRADE_LETTERS
+        if grade_letter != "E" or getattr(row, grade_letter)
+    ]
+
+class AtRiskStudent(BaseModel):
+    student_id: int
+    student_name: str
+    admission_number: Optional[str] = None
+    score: float
+    risk_level: str
+    attendance_rate: Optional[float] = None
+    grade_average: Optional[float] = None
+    grade_slope: Optional[float] = None
+    balance: float
+    days_overdue: int
+    computed_at: datetime
+
+@router.get("/at-risk", response_model=List[AtRiskStudent])
+def get_at_risk_students(
+    risk_level: Optional[str] = Query(None, pattern="^(low|medium|high)$"),
+    min_score: float = Query(0, ge=0, le=100),
+    class_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List students by nightly risk score, highest first"""
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Not authorized to view analytics")
+    
+    query = db.query(
+        StudentRiskScore,
+        Student.first_name,
+        Student.last_name,
+        Student.admission_number
+    ).join(Student, Student.id == StudentRiskScore.student_id).filter(
+        StudentRiskScore.score >= min_score
+    )
+    
+    if risk_level:
+        query = query.filter(StudentRiskScore.risk_level == risk_level)
+    
+    if class_id is not None:
+        query = query.filter(
+            StudentRiskScore.student_id.in_(select(student_class.c.student_id).where(student_class.c.class_id == class_id))
+        )
+    
+    rows = query.order_by(
+        StudentRiskScore.score.desc(), StudentRiskScore.student_id
+    ).offset(skip).limit(limit).all()
+    
+    return [
+        {
+            "student_id": risk.student_id,
+            "student_name": f"{first_name} {last_name}",
+            "admission_number": admission_number,
+            "score": risk.score,
+            "risk_level": risk.risk_level,
+            "attendance_rate": risk.attendance_rate,
+            "grade_average": risk.grade_average,
+            "grade_slope": risk.grade_slope,
+            "balance": risk.balance,
+            "days_overdue": risk.days_overdue,
+            "computed_at": risk.computed_at
+        }
+        for risk, first_name, last_name, admission_number in rows
+    ]
@@ -8,6 +8,8 @@ from ..services.database import get_db
 from ..models.user import User
 from ..models.student import Student, Class
 from ..models.grade import Attendance
+from ..services.live_updates import live_updates
+from ..services.calendar_month import invalidate_calendar_day
 from ..utils.auth_utils import get_current_active_user
 
 router = APIRouter(
@@ -55,9 +57,12 @@ def create_attendance(
     
     if existing:
         # Update existing record
+        old_status = existing.status
         existing.status = attendance.status
         db.commit()
         db.refresh(existing)
+        live_updates.attendance_recorded(attendance.date, old_status, attendance.status)
+        invalidate_calendar_day(attendance.date)
         return existing
     
     # Create new record
@@ -69,6 +74,8 @@ def create_attendance(
     db.add(db_attendance)
     db.commit()
     db.refresh(db_attendance)
+    live_updates.attendance_recorded(attendance.date, None, attendance.status)
+    invalidate_calendar_day(attendance.date)
     
     # Include student name in response
     setattr(db_attendance, "student_name", f"{student.first_name} {student.last_name}")
@@ -101,9 +108,12 @@ def create_batch_attendance(
         
         if existing:
             # Update existing record
+            old_status = existing.status
             existing.status = attendance.status
             db.commit()
             db.refresh(existing)
+            live_updates.attendance_recorded(attendance.date, old_status, attendance.status)
+            invalidate_calendar_day(attendance.date)
             
             # Include student name in response
             setattr(existing, "student_name", f"{student.first_name} {student.last_name}")
@@ -118,6 +128,8 @@ def create_batch_attendance(
             db.add(db_attendance)
             db.commit()
             db.refresh(db_attendance)
+            live_updates.attendance_recorded(attendance.date, None, attendance.status)
+            invalidate_calendar_day(attendance.date)
             
             # Include student name in response
             setattr(db_attendance, "student_name", f"{student.first_name} {student.last_name}")
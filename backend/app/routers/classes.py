@@ -1,13 +1,15 @@
 # backend/app/routers/classes.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 
 from ..services.database import get_db
 from ..models.user import User, UserRole
 from ..models.student import Teacher, Class, Student, student_class
 from ..utils.auth_utils import get_current_active_user
+from ..utils.fieldsets import resolve_fieldsets, load_columns, pick, sparse_response
 
 router = APIRouter(
     prefix="/classes",
@@ -51,57 +53,104 @@ class ClassResponse(ClassBase):
     class Config:
         from_attributes = True
 
+def teacher_brief(teacher: Optional[Teacher]) -> Optional[Dict[str, Any]]:
+    if teacher is None:
+        return None
+    return {
+        "id": teacher.id,
+        "specialization": teacher.specialization,
+        "user_id": teacher.user_id,
+        "user_full_name": teacher.user.full_name if teacher.user else None
+    }
+
+# Columns and relations selectable with fields= and include= on the listing
+CLASS_COLUMNS = ["id", "name", "grade_level", "teacher_id"]
+CLASS_RELATIONS = ["teacher", "students", "student_count"]
+
+STUDENT_BRIEF_COLUMNS = list(StudentBrief.model_fields)
+
+def class_responses(
+    db: Session,
+    classes: List[Class],
+    current_user: User,
+    columns: List[str] = CLASS_COLUMNS,
+    relations: List[str] = CLASS_RELATIONS
+) -> List[Dict[str, Any]]:
+    """Attach the requested relations to classes, one query per relation
+
+    When "teacher" is requested the classes must be loaded with their
+    teacher and the teacher's user. Parents only see their own children;
+    the count covers the whole class.
+    """
+    class_ids = [cls.id for cls in classes]
+    
+    student_counts = {}
+    if "student_count" in relations:
+        student_counts = dict(
+            db.query(student_class.c.class_id, func.count(student_class.c.student_id))
+            .filter(student_class.c.class_id.in_(class_ids))
+            .group_by(student_class.c.class_id)
+            .all()
+        )
+    
+    students_by_class: Dict[int, List[Dict[str, Any]]] = {}
+    if "students" in relations:
+        students_query = db.query(
+            student_class.c.class_id, *(getattr(Student, name) for name in STUDENT_BRIEF_COLUMNS)
+        ).join(
+            Student, Student.id == student_class.c.student_id
+        ).filter(
+            student_class.c.class_id.in_(class_ids)
+        )
+        if current_user.role not in ["admin", "teacher"]:
+            students_query = students_query.filter(Student.parent_id == current_user.id)
+        
+        for class_id, *values in students_query.order_by(Student.id).all():
+            students_by_class.setdefault(class_id, []).append(dict(zip(STUDENT_BRIEF_COLUMNS, values)))
+    
+    responses = []
+    for cls in classes:
+        response = pick(cls, columns)
+        if "teacher" in relations:
+            response["teacher"] = teacher_brief(cls.teacher)
+        if "students" in relations:
+            response["students"] = students_by_class.get(cls.id, [])
+        if "student_count" in relations:
+            response["student_count"] = student_counts.get(cls.id, 0)
+        responses.append(response)
+    
+    return responses
+
 @router.get("/", response_model=List[ClassResponse])
 def get_all_classes(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    fields: Optional[str] = None,
+    include: Optional[str] = None
 ):
-    """Get all classes with their associated teachers and student counts"""
+    """Get all classes with their associated teachers and student counts
+
+    fields= (e.g. "id,name") and include= (teacher, students, student_count)
+    trim the payload; relations that are not included are never loaded.
+    """
     # Everyone can view classes, but the data shown might differ based on role
+    columns, relations = resolve_fieldsets(fields, include, CLASS_COLUMNS, CLASS_RELATIONS)
     
-    classes = db.query(Class).offset(skip).limit(limit).all()
+    query = db.query(Class)
+    if columns is not None:
+        query = query.options(load_columns(Class, set(columns) | {"teacher_id"}))
     
-    # Get related data for each class
-    for cls in classes:
-        # Get teacher info
-        if not hasattr(cls, 'teacher') or cls.teacher is None:
-            cls.teacher = db.query(Teacher).filter(Teacher.id == cls.teacher_id).first()
-            
-            # Add teacher's user full name
-            if cls.teacher:
-                teacher_user = db.query(User).filter(User.id == cls.teacher.user_id).first()
-                if teacher_user:
-                    cls.teacher.user_full_name = teacher_user.full_name
-        
-        # Get student count
-        if not hasattr(cls, 'student_count'):
-            cls.student_count = db.query(student_class).filter(student_class.c.class_id == cls.id).count()
-        
-        # Get students if admin or teacher
-        if current_user.role in ["admin", "teacher"]:
-            if not hasattr(cls, 'students') or cls.students is None:
-                cls.students = db.query(Student).join(
-                    student_class, 
-                    student_class.c.student_id == Student.id
-                ).filter(
-                    student_class.c.class_id == cls.id
-                ).all()
-        else:
-            # For parents, only show if their child is in this class
-            parent_students = db.query(Student).filter(Student.parent_id == current_user.id).all()
-            parent_student_ids = [student.id for student in parent_students]
-            
-            cls.students = db.query(Student).join(
-                student_class, 
-                student_class.c.student_id == Student.id
-            ).filter(
-                student_class.c.class_id == cls.id,
-                Student.id.in_(parent_student_ids)
-            ).all()
-    
-    return classes
+    # Teachers and their users are joined in; counts and students are one query each
+    if relations is None or "teacher" in relations:
+        query = query.options(joinedload(Class.teacher).joinedload(Teacher.user))
+    
+    classes = query.order_by(Class.id).offset(skip).limit(limit).all()
+    
+    if columns is None:
+        return class_responses(db, classes, current_user)
+    return sparse_response(class_responses(db, classes, current_user, columns, relations))
 
 @router.get("/{class_id}", response_model=ClassResponse)
 def get_class(
@@ -110,43 +159,13 @@ def get_class(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific class by ID with all its students"""
-    cls = db.query(Class).filter(Class.id == class_id).first()
+    cls = db.query(Class).options(
+        joinedload(Class.teacher).joinedload(Teacher.user)
+    ).filter(Class.id == class_id).first()
     if cls is None:
         raise HTTPException(status_code=404, detail="Class not found")
     
-    # Get teacher info
-    cls.teacher = db.query(Teacher).filter(Teacher.id == cls.teacher_id).first()
-    if cls.teacher:
-        teacher_user = db.query(User).filter(User.id == cls.teacher.user_id).first()
-        if teacher_user:
-            cls.teacher.user_full_name = teacher_user.full_name
-    
-    # Get students based on user role
-    if current_user.role in ["admin", "teacher"]:
-        # Admins and teachers can see all students
-        cls.students = db.query(Student).join(
-            student_class, 
-            student_class.c.student_id == Student.id
-        ).filter(
-            student_class.c.class_id == cls.id
-        ).all()
-    else:
-        # Parents can only see their children
-        parent_students = db.query(Student).filter(Student.parent_id == current_user.id).all()
-        parent_student_ids = [student.id for student in parent_students]
-        
-        cls.students = db.query(Student).join(
-            student_class, 
-            student_class.c.student_id == Student.id
-        ).filter(
-            student_class.c.class_id == cls.id,
-            Student.id.in_(parent_student_ids)
-        ).all()
-    
-    # Set student count
-    cls.student_count = len(cls.students) if hasattr(cls, 'students') and cls.students else 0
-    
-    return cls
+    return class_responses(db, [cls], current_user)[0]
 
 @router.post("/", response_model=ClassResponse)
 def create_class(
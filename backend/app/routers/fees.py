@@ -1,16 +1,22 @@
 # backend/app/routers/fees.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, desc, select, and_, not_
 from typing import List, Dict, Any, Optional
 from datetime import date, datetime, timedelta
 from pydantic import BaseModel
 
-from ..services.database import get_db
+from ..services.database import get_db, SessionLocal
 from ..models.user import User
-from ..models.student import Student
+from ..models.student import Student, student_class
 from ..models.fee import Fee
+from ..services.fee_accounts import refresh_student_account
+from ..services.fee_summary import get_fee_totals, invalidate_fee_caches
 from ..utils.auth_utils import get_current_active_user
+from ..utils.pagination import encode_cursor, keyset_filter
+from ..utils.export_utils import iter_csv, iter_ndjson, stream_query_rows
+from ..utils.fieldsets import resolve_fieldsets, load_columns, pick, sparse_response
 
 router = APIRouter(
     prefix="/fees",
@@ -34,6 +40,8 @@ class FeeCreate(FeeBase):
 class FeeResponse(FeeBase):
     id: int
     student_id: int
+    # Imported and legacy fees may have no due date
+    due_date: Optional[date] = None
 
     class Config:
         from_attributes = True
@@ -77,20 +85,143 @@ def create_fee(
         academic_year=fee.academic_year
     )
     db.add(db_fee)
+    refresh_student_account(db, student_id)
     db.commit()
+    invalidate_fee_caches()
     db.refresh(db_fee)
     return db_fee
 
+# Sortable columns for /fees/all; every ordering is tie-broken on Fee.id
+FEE_SORT_COLUMNS = {
+    "id": Fee.id,
+    "due_date": Fee.due_date,
+    "amount": Fee.amount,
+    "student_id": Fee.student_id,
+}
+
+# NULLs compare as neither greater nor less than a keyset cursor, so nullable
+# sort columns are ordered (and paged) by their value with NULL replaced
+# by a fixed stand-in: undated fees sort after every due date
+FEE_SORT_NULLS = {
+    "due_date": date.max,
+    "amount": 0.0,
+    "student_id": 0,
+}
+
+def fee_sort_key(sort: str):
+    """The ORDER BY expression for a sort, with any NULLs replaced by their stand-in"""
+    if sort in FEE_SORT_NULLS:
+        return func.coalesce(FEE_SORT_COLUMNS[sort], FEE_SORT_NULLS[sort])
+    return FEE_SORT_COLUMNS[sort]
+
+def fee_sort_value(fee, sort: str):
+    """A row's value of fee_sort_key, for the next page's cursor"""
+    value = getattr(fee, sort)
+    return FEE_SORT_NULLS.get(sort) if value is None else value
+
+FEE_EXPORT_COLUMNS = ["id", "student_id", "amount", "description", "due_date", "paid", "status", "term", "academic_year"]
+
+def filtered_fees_query(
+    db: Session,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    status: Optional[str] = None,
+    class_id: Optional[int] = None,
+    overdue: Optional[bool] = None,
+    columns: Optional[List] = None
+):
+    """Build a fee query with the /fees/all filters applied"""
+    query = db.query(*columns) if columns else db.query(Fee)
+    
+    if term:
+        query = query.filter(Fee.term == term)
+    
+    if academic_year:
+        query = query.filter(Fee.academic_year == academic_year)
+    
+    if status:
+        query = query.filter(Fee.status == status)
+    
+    if class_id:
+        query = query.filter(
+            Fee.student_id.in_(select(student_class.c.student_id).where(student_class.c.class_id == class_id))
+        )
+    
+    if overdue is not None:
+        is_overdue = and_(Fee.due_date < date.today(), Fee.amount > Fee.paid)
+        query = query.filter(is_overdue if overdue else not_(is_overdue))
+    
+    return query
+
 @router.get("/all", response_model=List[FeeResponse])
 def read_all_fees(
+    response: Response,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    status: Optional[str] = None,
+    class_id: Optional[int] = None,
+    overdue: Optional[bool] = None,
+    sort: str = Query("id", pattern="^(id|due_date|amount|student_id)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    format: str = Query("json", pattern="^(json|ndjson|csv)$"),
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all fees in the system"""
+    """Get fees with filtering and keyset pagination, or stream them as NDJSON/CSV
+
+    JSON pages carry the cursor for the next page in the X-Next-Cursor header.
+    fields= (e.g. "id,student_id,amount") limits the columns loaded and returned.
+    """
     if current_user.role not in ["admin", "teacher"]:
         raise HTTPException(status_code=403, detail="Not authorized to view all fees")
     
-    fees = db.query(Fee).all()
+    sort_column = fee_sort_key(sort)
+    descending = order == "desc"
+    ordering = [desc(sort_column), desc(Fee.id)] if descending else [sort_column, Fee.id]
+    filters = dict(term=term, academic_year=academic_year, status=status, class_id=class_id, overdue=overdue)
+    columns, _ = resolve_fieldsets(fields, None, FEE_EXPORT_COLUMNS)
+    
+    # Exports stream every matching row from a server-side cursor
+    if format != "json":
+        names = columns or FEE_EXPORT_COLUMNS
+        export_columns = [getattr(Fee, name) for name in names]
+        rows = stream_query_rows(
+            SessionLocal,
+            lambda stream_db: filtered_fees_query(stream_db, columns=export_columns, **filters).order_by(*ordering)
+        )
+        
+        if format == "csv":
+            return StreamingResponse(
+                iter_csv(rows, names),
+                media_type="text/csv",
+                headers={"Content-Disposition": "attachment; filename=fees.csv"}
+            )
+        return StreamingResponse(iter_ndjson(rows, names), media_type="application/x-ndjson")
+    
+    query = filtered_fees_query(db, **filters)
+    if columns is not None:
+        # The sort key is loaded too, for the next page's cursor
+        query = query.options(load_columns(Fee, set(columns) | {sort}))
+    
+    after_cursor = keyset_filter(sort_column, Fee.id, cursor, descending)
+    if after_cursor is not None:
+        query = query.filter(after_cursor)
+    
+    # Fetch one extra row to know whether another page exists
+    fees = query.order_by(*ordering).limit(limit + 1).all()
+    
+    if len(fees) > limit:
+        fees = fees[:limit]
+        last = fees[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor([fee_sort_value(last, sort), last.id])
+    
+    if columns is not None:
+        next_cursor = response.headers.get("X-Next-Cursor")
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return sparse_response([pick(fee, columns) for fee in fees], headers=headers)
     return fees
 
 @router.get("/summary", response_model=FeeSummary)
@@ -102,23 +233,7 @@ def get_fee_summary(
     if current_user.role not in ["admin", "teacher"]:
         raise HTTPException(status_code=403, detail="Not authorized to view fee summary")
     
-    # Calculate total amount, total paid, and balance
-    result = db.query(
-        func.sum(Fee.amount).label("total_amount"),
-        func.sum(Fee.paid).label("total_paid")
-    ).first()
-    
-    total_amount = result.total_amount or 0
-    total_paid = result.total_paid or 0
-    total_balance = total_amount - total_paid
-    payment_rate = (total_paid / total_amount * 100) if total_amount > 0 else 0
-    
-    return {
-        "total_amount": total_amount,
-        "total_paid": total_paid,
-        "total_balance": total_balance,
-        "payment_rate": payment_rate
-    }
+    return get_fee_totals(db)
 
 @router.get("/summary", response_model=DailySummary)
 def get_daily_summary(
@@ -236,6 +351,8 @@ def update_fee(
     for key, value in fee_update.dict().items():
         setattr(db_fee, key, value)
     
+    refresh_student_account(db, db_fee.student_id)
     db.commit()
+    invalidate_fee_caches()
     db.refresh(db_fee)
     return db_fee
\ No newline at end of file
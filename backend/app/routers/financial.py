@@ -1,16 +1,43 @@
 # backend/app/routers/financial.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import io
+import os
+import csv
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import StreamingResponse, FileResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, cast, Date, extract
+from sqlalchemy import func, desc, cast, Date, extract, select, case
+from sqlalchemy.exc import IntegrityError
 from typing import List, Dict, Any, Optional
 from datetime import date, datetime, timedelta
 from pydantic import BaseModel
 
 from ..services.database import get_db
 from ..models.user import User
-from ..models.student import Student, Class
-from ..models.fee import Fee
+from ..models.student import Student, Class, student_class
+from ..models.fee import Fee, FeePayment, StudentAccount, UnmatchedBankLine
+from ..services.fee_accounts import refresh_student_account
+from ..services.fee_summary import get_fee_summary_data, invalidate_fee_caches, fee_cache_stats
+from ..services import forecast
+from ..services.live_updates import live_updates
+from ..services.reconciliation import iter_statement_lines, reconcile_bank_statement
+from ..services.invoices import load_invoices, iter_invoices, render_invoices, iter_rendered_invoices, invoice_filename
+from ..services.family_statements import (
+    iter_family_statements,
+    render_family_statement_pdf,
+    iter_family_statements_html,
+    family_statement_filename
+)
+from ..utils.export_utils import iter_zip
+from ..services.financial_reports import (
+    Workbook,
+    iter_statement_csv,
+    write_statement_file,
+    submit_statement_job,
+    get_report_job
+)
 from ..utils.auth_utils import get_current_active_user
 
 router = APIRouter(
@@ -53,6 +80,133 @@ class PaymentDue(BaseModel):
     term: Optional[str] = None
     academic_year: Optional[str] = None
 
+class AgingRow(BaseModel):
+    group_id: Optional[int] = None
+    group_name: str
+    fee_count: int
+    current: float
+    days_1_30: float
+    days_31_60: float
+    days_61_90: float
+    days_over_90: float
+    no_due_date: float = 0.0
+    total: float
+
+class AgingReport(BaseModel):
+    as_of: date
+    group_by: str
+    totals: AgingRow
+    rows: List[AgingRow]
+
+AGING_BUCKETS = ["current", "days_1_30", "days_31_60", "days_61_90", "days_over_90", "no_due_date"]
+
+class ForecastWeek(BaseModel):
+    week_start: date
+    projected_amount: float
+    fee_count: int
+
+class CashFlowForecast(BaseModel):
+    as_of: date
+    weeks: List[ForecastWeek]
+    open_balance: float
+    projected_total: float
+    beyond_horizon: float
+    fee_count: int
+    prior_delay_days: float
+
+class StudentAccountResponse(BaseModel):
+    student_id: int
+    total_billed: float
+    total_paid: float
+    balance: float
+    oldest_unpaid_due_date: Optional[date] = None
+
+    class Config:
+        from_attributes = True
+
+class ReportJobResponse(BaseModel):
+    job_id: str
+    status: str
+    group_by: str
+    format: str
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
+
+def _report_job_response(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "group_by": job["group_by"],
+        "format": job["format"],
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+        "error": job["error"],
+        "download_url": f"/financial/reports/jobs/{job['id']}/download" if job["status"] == "completed" else None
+    }
+
+def _check_report_access(current_user: User, file_format: str):
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Not authorized to export financial reports")
+    
+    if file_format == "xlsx" and Workbook is None:
+        raise HTTPException(status_code=501, detail="XLSX export requires openpyxl to be installed")
+
+class ReconciliationResult(BaseModel):
+    import_id: str
+    lines: int
+    matched_lines: int
+    unmatched_lines: int
+    amount_applied: float
+    amount_unmatched: float
+    fees_updated: int
+    duplicate_lines: int = 0
+
+class UnmatchedBankLineResponse(BaseModel):
+    id: int
+    import_id: str
+    line_number: int
+    transaction_date: Optional[str] = None
+    amount: Optional[float] = None
+    reference: Optional[str] = None
+    reason: str
+    status: str
+    fee_id: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+def payments_due_query(db: Session, start_date: date, end_date: date, parent_id: Optional[int] = None):
+    """Build a single joined query for unpaid fees due between two dates"""
+    # Served by the partial index on unpaid due dates (ix_fees_unpaid_due_date);
+    # student names come from the join instead of a lookup per fee
+    query = db.query(
+        Fee.id,
+        Fee.student_id,
+        Fee.amount,
+        Fee.paid,
+        Fee.description,
+        Fee.due_date,
+        Fee.term,
+        Fee.academic_year,
+        Student.first_name,
+        Student.last_name
+    ).join(
+        Student, Student.id == Fee.student_id
+    ).filter(
+        Fee.due_date.between(start_date, end_date),
+        Fee.amount > Fee.paid
+    )
+    
+    if parent_id is not None:
+        query = query.filter(
+            Fee.student_id.in_(select(Student.id).where(Student.parent_id == parent_id))
+        )
+    
+    return query.order_by(Fee.due_date)
+
 @router.get("/summary", response_model=FeeSummary)
 async def get_fee_summary(
     term: Optional[str] = None,
@@ -61,66 +215,17 @@ async def get_fee_summary(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a summary of fee collection status"""
-    query = db.query(Fee)
-    
-    if term:
-        query = query.filter(Fee.term == term)
-    
-    if academic_year:
-        query = query.filter(Fee.academic_year == academic_year)
-    
-    # Get total amounts
-    fee_summary = query.with_entities(
-        func.sum(Fee.amount).label("total_amount"),
-        func.sum(Fee.paid).label("total_paid")
-    ).first()
-    
-    total_amount = float(fee_summary.total_amount or 0)
-    total_paid = float(fee_summary.total_paid or 0)
-    total_balance = total_amount - total_paid
-    payment_rate = (total_paid / total_amount * 100) if total_amount > 0 else 0
-    
-    # Get student payment status counts
-    all_fees = query.all()
-    student_count = len(set(fee.student_id for fee in all_fees))
-    
-    # Group fees by student to determine payment status
-    student_payment_status = {}
-    for fee in all_fees:
-        if fee.student_id not in student_payment_status:
-            student_payment_status[fee.student_id] = {
-                "total": 0,
-                "paid": 0
-            }
-        
-        student_payment_status[fee.student_id]["total"] += fee.amount
-        student_payment_status[fee.student_id]["paid"] += fee.paid
-    
-    # Count students by payment status
-    paid_count = 0
-    partial_count = 0
-    unpaid_count = 0
-    
-    for student_id, status in student_payment_status.items():
-        payment_ratio = status["paid"] / status["total"] if status["total"] > 0 else 0
-        
-        if payment_ratio >= 0.99:  # Consider as fully paid (allowing for small rounding errors)
-            paid_count += 1
-        elif payment_ratio > 0:
-            partial_count += 1
-        else:
-            unpaid_count += 1
+    return get_fee_summary_data(db, term, academic_year)
+
+@router.get("/cache-stats")
+async def get_fee_cache_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get hit-rate statistics for the fee-derived result caches"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to view cache statistics")
     
-    return {
-        "total_amount": total_amount,
-        "total_paid": total_paid,
-        "total_balance": total_balance,
-        "payment_rate": payment_rate,
-        "student_count": student_count,
-        "paid_count": paid_count,
-        "partial_count": partial_count,
-        "unpaid_count": unpaid_count
-    }
+    return fee_cache_stats()
 
 @router.get("/chart-data", response_model=FeeChartData)
 async def get_fee_chart_data(
@@ -229,6 +334,182 @@ async def get_student_fees(
     
     return result
 
+def aging_query(db: Session, as_of: date, group_by: Optional[str], term: Optional[str] = None, academic_year: Optional[str] = None):
+    """Bucket outstanding balances by days past due in one grouped query
+
+    group_by None gives a single school-wide row.
+    """
+    outstanding = Fee.amount - Fee.paid
+    
+    # Compare against cut-off dates rather than subtracting dates in SQL, which
+    # keeps the query portable between PostgreSQL and SQLite
+    boundaries = [
+        # NULL fails every comparison below, so undated fees get their own bucket
+        ("no_due_date", Fee.due_date.is_(None)),
+        ("current", Fee.due_date >= as_of),
+        ("days_1_30", Fee.due_date >= as_of - timedelta(days=30)),
+        ("days_31_60", Fee.due_date >= as_of - timedelta(days=60)),
+        ("days_61_90", Fee.due_date >= as_of - timedelta(days=90)),
+    ]
+    bucket = case(*[(condition, name) for name, condition in boundaries], else_="days_over_90")
+    bucket_sums = [
+        func.coalesce(func.sum(case((bucket == name, outstanding), else_=0)), 0).label(name)
+        for name in AGING_BUCKETS
+    ]
+    
+    if group_by is None:
+        query = db.query(
+            func.count(Fee.id).label("fee_count"),
+            *bucket_sums
+        ).select_from(Fee)
+    elif group_by == "family":
+        query = db.query(
+            Student.parent_id.label("group_id"),
+            func.max(User.full_name).label("group_name"),
+            func.count(Fee.id).label("fee_count"),
+            *bucket_sums
+        ).select_from(Fee).join(
+            Student, Student.id == Fee.student_id
+        ).outerjoin(
+            User, User.id == Student.parent_id
+        ).group_by(Student.parent_id)
+    else:
+        # A student enrolled in several classes counts towards each of them, so
+        # class rows may overlap; students in no class form the NULL group
+        query = db.query(
+            Class.id.label("group_id"),
+            func.max(Class.name).label("group_name"),
+            func.count(Fee.id).label("fee_count"),
+            *bucket_sums
+        ).select_from(Fee).outerjoin(
+            student_class, student_class.c.student_id == Fee.student_id
+        ).outerjoin(
+            Class, Class.id == student_class.c.class_id
+        ).group_by(Class.id)
+    
+    query = query.filter(Fee.amount > Fee.paid)
+    
+    if term:
+        query = query.filter(Fee.term == term)
+    
+    if academic_year:
+        query = query.filter(Fee.academic_year == academic_year)
+    
+    return query
+
+@router.get("/aging", response_model=AgingReport)
+def get_aging_report(
+    group_by: str = Query("class", pattern="^(class|family)$"),
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get outstanding balances bucketed by days past due, per class or per family"""
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Not authorized to view the aging report")
+    
+    today = date.today()
+    rows = []
+    
+    for row in aging_query(db, today, group_by, term, academic_year).all():
+        buckets = {name: float(getattr(row, name) or 0) for name in AGING_BUCKETS}
+        rows.append({
+            "group_id": row.group_id,
+            "group_name": row.group_name or "Unassigned",
+            "fee_count": row.fee_count,
+            **buckets,
+            "total": sum(buckets.values())
+        })
+    
+    rows.sort(key=lambda item: item["total"], reverse=True)
+    
+    # Totals come from their own ungrouped aggregate: class rows can overlap
+    overall = aging_query(db, today, None, term, academic_year).one()
+    totals = {name: float(getattr(overall, name) or 0) for name in AGING_BUCKETS}
+    
+    return {
+        "as_of": today,
+        "group_by": group_by,
+        "totals": {
+            "group_id": None,
+            "group_name": "All",
+            "fee_count": overall.fee_count,
+            **totals,
+            "total": sum(totals.values())
+        },
+        "rows": rows
+    }
+
+@router.get("/forecast", response_model=CashFlowForecast)
+def get_cash_flow_forecast(
+    weeks: int = Query(12, ge=1, le=52),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Project weekly fee collections from due dates and each family's payment history"""
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Not authorized to view the forecast")
+    
+    if forecast.np is None:
+        raise HTTPException(status_code=501, detail="Forecasting requires numpy to be installed")
+    
+    return forecast.get_cash_flow_forecast(db, weeks)
+
+@router.get("/accounts", response_model=List[StudentAccountResponse])
+async def get_student_accounts(
+    min_balance: Optional[float] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get per-student account balances, largest balance first"""
+    query = db.query(StudentAccount)
+    
+    # Parents only see their own children's accounts
+    if current_user.role == "parent":
+        query = query.filter(
+            StudentAccount.student_id.in_(select(Student.id).where(Student.parent_id == current_user.id))
+        )
+    elif current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Not authorized to view accounts")
+    
+    # Uses the index on student_accounts.balance
+    if min_balance is not None:
+        query = query.filter(StudentAccount.balance > min_balance)
+    
+    return query.order_by(
+        desc(StudentAccount.balance), StudentAccount.student_id
+    ).offset(skip).limit(limit).all()
+
+@router.get("/accounts/{student_id}", response_model=StudentAccountResponse)
+async def get_student_account(
+    student_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a single student's account balance"""
+    student = db.query(Student).filter(Student.id == student_id).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+    
+    if current_user.role == "parent" and student.parent_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this student's account")
+    
+    account = db.query(StudentAccount).filter(StudentAccount.student_id == student_id).first()
+    if not account:
+        # Students without any fees have an empty account
+        return {
+            "student_id": student_id,
+            "total_billed": 0.0,
+            "total_paid": 0.0,
+            "balance": 0.0,
+            "oldest_unpaid_due_date": None
+        }
+    
+    return account
+
 @router.get("/payments-due", response_model=List[PaymentDue])
 async def get_payments_due(
     days: int = Query(30, ge=0, le=365),
@@ -240,39 +521,25 @@ async def get_payments_due(
     today = date.today()
     end_date = today + timedelta(days=days)
     
-    # Find fees with upcoming due dates that aren't fully paid
-    query = db.query(Fee).filter(
-        Fee.due_date.between(today, end_date),
-        Fee.amount > Fee.paid
-    ).order_by(Fee.due_date)
-    
     # For parents, only show their children's fees
-    if current_user.role == "parent":
-        parent_students = db.query(Student).filter(Student.parent_id == current_user.id).all()
-        parent_student_ids = [student.id for student in parent_students]
-        
-        query = query.filter(Fee.student_id.in_(parent_student_ids))
+    parent_id = current_user.id if current_user.role == "parent" else None
     
-    fees = query.all()
+    rows = payments_due_query(db, today, end_date, parent_id).all()
     
     result = []
-    for fee in fees:
-        # Get student information
-        student = db.query(Student).filter(Student.id == fee.student_id).first()
-        
-        if student:
-            result.append({
-                "id": fee.id,
-                "student_name": f"{student.first_name} {student.last_name}",
-                "student_id": student.id,
-                "amount": fee.amount,
-                "balance": fee.amount - fee.paid,
-                "description": fee.description,
-                "due_date": fee.due_date,
-                "days_left": (fee.due_date - today).days,
-                "term": fee.term,
-                "academic_year": fee.academic_year
-            })
+    for row in rows:
+        result.append({
+            "id": row.id,
+            "student_name": f"{row.first_name} {row.last_name}",
+            "student_id": row.student_id,
+            "amount": row.amount,
+            "balance": row.amount - row.paid,
+            "description": row.description,
+            "due_date": row.due_date,
+            "days_left": (row.due_date - today).days,
+            "term": row.term,
+            "academic_year": row.academic_year
+        })
     
     # If no data (like in development), return sample data
     if not result:
@@ -357,8 +624,8 @@ async def record_fee_payment(
     if current_user.role not in ["admin", "teacher"]:
         raise HTTPException(status_code=403, detail="Not authorized to record payments")
     
-    # Get the fee
-    fee = db.query(Fee).filter(Fee.id == fee_id).first()
+    # Get the fee, locked so a concurrent bank import waits for (or is waited on by) this payment
+    fee = db.query(Fee).filter(Fee.id == fee_id).with_for_update().first()
     if not fee:
         raise HTTPException(status_code=404, detail="Fee not found")
     
@@ -371,6 +638,14 @@ async def record_fee_payment(
     
     # Update the fee
     fee.paid += amount
+    db.add(FeePayment(
+        fee_id=fee.id,
+        student_id=fee.student_id,
+        amount=amount,
+        paid_at=datetime.now(),
+        method="manual",
+        recorded_by=current_user.id
+    ))
     
     # Update status based on payment
     if fee.paid >= fee.amount:
@@ -378,7 +653,10 @@ async def record_fee_payment(
     elif fee.paid > 0:
         fee.status = "partial"
     
+    refresh_student_account(db, fee.student_id)
     db.commit()
+    invalidate_fee_caches()
+    live_updates.payment_recorded(amount)
     db.refresh(fee)
     
     # Return updated fee data
@@ -390,4 +668,302 @@ async def record_fee_payment(
         "balance": fee.amount - fee.paid,
         "status": fee.status,
         "payment_recorded": amount
-    }
\ No newline at end of file
+    }
+
+@router.get("/reports/statement")
+def export_statement(
+    group_by: str = Query("student", pattern="^(student|class)$"),
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Export billed, collected and outstanding amounts by student or class"""
+    _check_report_access(current_user, format)
+    filters = dict(term=term, academic_year=academic_year, start_date=start_date, end_date=end_date)
+    filename = f"statement-by-{group_by}"
+    
+    if format == "csv":
+        return StreamingResponse(
+            iter_statement_csv(group_by, **filters),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
+        )
+    
+    # XLSX is a zip container, so it is written to a temp file first and
+    # removed once the response has been sent
+    handle, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(handle)
+    write_statement_file(path, group_by, format, **filters)
+    
+    return FileResponse(
+        path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=f"{filename}.xlsx",
+        background=BackgroundTask(os.remove, path)
+    )
+
+@router.post("/reports/statement/jobs", response_model=ReportJobResponse, status_code=202)
+def create_statement_job(
+    group_by: str = Query("student", pattern="^(student|class)$"),
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Generate a statement in the background for large years"""
+    _check_report_access(current_user, format)
+    
+    job = submit_statement_job(
+        group_by,
+        format,
+        current_user.id,
+        term=term,
+        academic_year=academic_year,
+        start_date=start_date,
+        end_date=end_date
+    )
+    return _report_job_response(job)
+
+def _get_own_report_job(job_id: str, current_user: User) -> Dict[str, Any]:
+    job = get_report_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    
+    if current_user.role != "admin" and job["requested_by"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this report")
+    
+    return job
+
+@router.get("/reports/jobs/{job_id}", response_model=ReportJobResponse)
+def get_statement_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Check a background report's progress; completed jobs include a download link"""
+    return _report_job_response(_get_own_report_job(job_id, current_user))
+
+@router.get("/reports/jobs/{job_id}/download")
+def download_statement_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download a completed background report"""
+    job = _get_own_report_job(job_id, current_user)
+    
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Report is {job['status']}")
+    
+    media_type = (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        if job["format"] == "xlsx" else "text/csv"
+    )
+    return FileResponse(job["path"], media_type=media_type, filename=f"statement-by-{job['group_by']}.{job['format']}")
+
+
+@router.get("/invoices/student/{student_id}")
+def get_student_invoice(
+    student_id: int,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a student's invoice as a PDF"""
+    student = db.query(Student).filter(Student.id == student_id).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+    
+    if current_user.role == "parent" and student.parent_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this student's invoice")
+    
+    invoices = load_invoices(db, student_ids=[student_id], term=term, academic_year=academic_year)
+    if not invoices:
+        raise HTTPException(status_code=404, detail="No fees found for this student")
+    
+    invoice, path = render_invoices(invoices)[0]
+    return FileResponse(path, media_type="application/pdf", filename=invoice_filename(invoice))
+
+@router.get("/invoices/batch")
+def get_invoice_batch(
+    class_id: Optional[int] = None,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Render invoices for a class (or the whole school) into one zip download"""
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Not authorized to print invoices")
+    
+    if class_id is not None and not db.query(Class.id).filter(Class.id == class_id).first():
+        raise HTTPException(status_code=404, detail="Class not found")
+    
+    # Students are read from a server-side cursor and rendered a chunk at a time;
+    # unchanged invoices come straight from the content-addressed cache
+    invoices = iter_invoices(class_id=class_id, term=term, academic_year=academic_year)
+    rendered = iter_rendered_invoices(invoices)
+    
+    filename = f"invoices-class-{class_id}.zip" if class_id is not None else "invoices-all.zip"
+    return StreamingResponse(
+        iter_zip((invoice_filename(invoice), path) for invoice, path in rendered),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@router.get("/statements/families")
+def get_family_statement_batch(
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    format: str = Query("pdf", pattern="^(pdf|html)$"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Generate consolidated statements for every family, as a zip of PDFs or one HTML bundle"""
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Not authorized to print family statements")
+    
+    # Families are read from a server-side cursor and rendered one at a time
+    statements = iter_family_statements(term=term, academic_year=academic_year)
+    
+    if format == "html":
+        return StreamingResponse(
+            iter_family_statements_html(statements),
+            media_type="text/html",
+            headers={"Content-Disposition": "attachment; filename=family-statements.html"}
+        )
+    
+    return StreamingResponse(
+        iter_zip(
+            (family_statement_filename(statement, "pdf"), render_family_statement_pdf(statement))
+            for statement in statements
+        ),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=family-statements.zip"}
+    )
+
+@router.post("/reconciliation/import", response_model=ReconciliationResult)
+def import_bank_statement(
+    statement: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Match a bank statement CSV against open fees and apply the payments"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to import bank statements")
+    
+    # Read the upload as a text stream rather than loading it whole
+    handle = io.TextIOWrapper(statement.file, encoding="utf-8-sig", newline="")
+    try:
+        summary = reconcile_bank_statement(db, iter_statement_lines(handle), recorded_by=current_user.id)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Could not read statement: {e}")
+    finally:
+        handle.detach()
+    
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another import of the same lines committed first
+        db.rollback()
+        raise HTTPException(status_code=409, detail="This statement is already being imported")
+    invalidate_fee_caches()
+    
+    # Statement lines carry their own dates, so recount rather than apply a delta
+    if summary["matched_lines"]:
+        live_updates.resync()
+    return summary
+
+@router.get("/reconciliation/unmatched", response_model=List[UnmatchedBankLineResponse])
+def get_unmatched_bank_lines(
+    status: str = "pending",
+    import_id: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get statement lines waiting for manual review"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to review bank statements")
+    
+    query = db.query(UnmatchedBankLine).filter(UnmatchedBankLine.status == status)
+    
+    if import_id:
+        query = query.filter(UnmatchedBankLine.import_id == import_id)
+    
+    return query.order_by(UnmatchedBankLine.id).offset(skip).limit(limit).all()
+
+def _get_pending_bank_line(db: Session, line_id: int) -> UnmatchedBankLine:
+    line = db.query(UnmatchedBankLine).filter(UnmatchedBankLine.id == line_id).first()
+    if not line:
+        raise HTTPException(status_code=404, detail="Statement line not found")
+    
+    if line.status != "pending":
+        raise HTTPException(status_code=400, detail=f"Statement line is already {line.status}")
+    
+    return line
+
+@router.put("/reconciliation/unmatched/{line_id}/resolve", response_model=UnmatchedBankLineResponse)
+def resolve_unmatched_bank_line(
+    line_id: int,
+    fee_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Apply a reviewed statement line to a fee"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to review bank statements")
+    
+    line = _get_pending_bank_line(db, line_id)
+    
+    fee = db.query(Fee).filter(Fee.id == fee_id).first()
+    if not fee:
+        raise HTTPException(status_code=404, detail="Fee not found")
+    
+    if not line.amount or line.amount <= 0:
+        raise HTTPException(status_code=400, detail="Statement line has no payable amount")
+    
+    if line.amount > (fee.amount - fee.paid):
+        raise HTTPException(status_code=400, detail="Payment amount exceeds remaining balance")
+    
+    fee.paid += line.amount
+    fee.status = "paid" if fee.paid >= fee.amount else "partial"
+    db.add(FeePayment(
+        fee_id=fee.id,
+        student_id=fee.student_id,
+        amount=line.amount,
+        paid_at=datetime.now(),
+        method="bank",
+        reference=line.reference,
+        recorded_by=current_user.id
+    ))
+    line.status = "resolved"
+    line.fee_id = fee.id
+    
+    refresh_student_account(db, fee.student_id)
+    db.commit()
+    invalidate_fee_caches()
+    live_updates.payment_recorded(line.amount)
+    db.refresh(line)
+    return line
+
+@router.put("/reconciliation/unmatched/{line_id}/dismiss", response_model=UnmatchedBankLineResponse)
+def dismiss_unmatched_bank_line(
+    line_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Mark a statement line as not being a fee payment"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to review bank statements")
+    
+    line = _get_pending_bank_line(db, line_id)
+    line.status = "dismissed"
+    db.commit()
+    db.refresh(line)
+    return line
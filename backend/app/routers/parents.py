@@ -0,0 +1,102 @@
+# backend/app/routers/parents.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, HTMLResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+from pydantic import BaseModel
+
+from ..services.database import get_db
+from ..models.user import User, UserRole
+from ..services.family_statements import (
+    get_family_statement,
+    render_family_statement_pdf,
+    iter_family_statements_html,
+    family_statement_filename
+)
+from ..utils.auth_utils import get_current_active_user
+
+router = APIRouter(
+    prefix="/parents",
+    tags=["parents"],
+    responses={401: {"description": "Not authenticated"}},
+)
+
+# Pydantic models for responses
+class StatementFee(BaseModel):
+    fee_id: int
+    description: Optional[str] = None
+    due_date: Optional[date] = None
+    amount: float
+    paid: float
+    balance: float
+    status: Optional[str] = None
+
+class ChildStatement(BaseModel):
+    student_id: int
+    student_name: str
+    admission_number: Optional[str] = None
+    fees: List[StatementFee]
+    total_amount: float
+    total_paid: float
+    total_balance: float
+
+class FamilyStatement(BaseModel):
+    parent_id: int
+    parent_name: Optional[str] = None
+    parent_email: Optional[str] = None
+    term: Optional[str] = None
+    academic_year: Optional[str] = None
+    generated_on: date
+    children: List[ChildStatement]
+    total_amount: float
+    total_paid: float
+    total_balance: float
+
+def _statement_response(statement, format: str):
+    if format == "pdf":
+        return Response(
+            content=render_family_statement_pdf(statement),
+            media_type="application/pdf",
+            headers={"Content-Disposition": f"attachment; filename={family_statement_filename(statement, 'pdf')}"}
+        )
+    
+    if format == "html":
+        return HTMLResponse("".join(iter_family_statements_html([statement])))
+    
+    return statement
+
+@router.get("/me/statement", response_model=FamilyStatement)
+def get_my_statement(
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|pdf|html)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get one consolidated fee statement covering all of the current parent's children"""
+    if current_user.role != "parent":
+        raise HTTPException(status_code=403, detail="Only parents have a family statement")
+    
+    statement = get_family_statement(db, current_user, term, academic_year)
+    return _statement_response(statement, format)
+
+@router.get("/{parent_id}/statement", response_model=FamilyStatement)
+def get_parent_statement(
+    parent_id: int,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|pdf|html)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a parent's consolidated fee statement"""
+    if current_user.role not in ["admin", "teacher"] and current_user.id != parent_id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this statement")
+    
+    parent = db.query(User).filter(User.id == parent_id, User.role == UserRole.PARENT).first()
+    if not parent:
+        raise HTTPException(status_code=404, detail="Parent not found")
+    
+    statement = get_family_statement(db, parent, term, academic_year)
+    return _statement_response(statement, format)
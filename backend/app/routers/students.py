@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date
 from pydantic import BaseModel
 
@@ -9,6 +9,8 @@ from ..models.user import User
 from ..models.student import Student
 from ..models.grade import Grade, Attendance
 from ..utils.auth_utils import get_current_active_user
+from ..services.student_search import student_search_index
+from ..utils.fieldsets import resolve_fieldsets, load_columns, pick, sparse_response
 
 router = APIRouter(
     prefix="/students",
@@ -82,18 +84,49 @@ def create_student(
     db.refresh(db_student)
     return db_student
 
+# Columns selectable with fields= on the listing
+STUDENT_COLUMNS = list(StudentResponse.model_fields)
+
 @router.get("/", response_model=List[StudentResponse])
 def read_students(
     skip: int = 0, 
     limit: int = 100, 
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
+    columns, _ = resolve_fieldsets(fields, None, STUDENT_COLUMNS)
+    
+    query = db.query(Student)
+    if columns is not None:
+        query = query.options(load_columns(Student, columns))
+    
     if current_user.role == "admin" or current_user.role == "teacher":
-        students = db.query(Student).offset(skip).limit(limit).all()
+        students = query.offset(skip).limit(limit).all()
     else:
-        students = db.query(Student).filter(Student.parent_id == current_user.id).all()
-    return students
+        students = query.filter(Student.parent_id == current_user.id).all()
+    
+    if columns is None:
+        return students
+    return sparse_response([pick(student, columns) for student in students])
+
+class StudentSearchResult(BaseModel):
+    id: int
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    admission_number: Optional[str] = None
+    score: float
+
+@router.get("/search", response_model=List[StudentSearchResult])
+def search_students(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Type-ahead search by name or admission number, with fuzzy name matching"""
+    # Served from the in-memory index, so no session is needed per keystroke
+    parent_id = None if current_user.role in ["admin", "teacher"] else current_user.id
+    return student_search_index.search(q, limit, parent_id)
 
 @router.get("/{student_id}", response_model=StudentResponse)
 def read_student(
@@ -1,7 +1,7 @@
 # backend/app/routers/teachers.py - Teacher management endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from pydantic import BaseModel
 
@@ -9,6 +9,8 @@ from ..services.database import get_db
 from ..models.user import User, UserRole
 from ..models.student import Teacher, Class
 from ..utils.auth_utils import get_current_active_user
+from ..utils.fieldsets import resolve_fieldsets, sparse_response
+from ..services.teacher_directory import TEACHER_COLUMNS, TEACHER_RELATIONS, get_teacher_directory, teacher_entry
 
 router = APIRouter(
     prefix="/teachers",
@@ -56,29 +58,26 @@ def get_all_teachers(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    fields: Optional[str] = None,
+    include: Optional[str] = None
 ):
-    """Get all teachers with their associated users and classes"""
+    """Get all teachers with their associated users and classes
+
+    fields= (e.g. "id,user_id") and include= (user, classes) trim the
+    payload; relations that are not included are never loaded.
+    """
     if current_user.role not in ["admin", "teacher"]:
         raise HTTPException(status_code=403, detail="Not authorized to view teachers")
     
-    teachers = db.query(Teacher).options(
-        # Use SQLAlchemy eager loading to get related data
-        # You'd need to import joinedload from sqlalchemy.orm
-        # from sqlalchemy.orm import joinedload
-        # joinedload(Teacher.user),
-        # joinedload(Teacher.classes)
-    ).offset(skip).limit(limit).all()
+    columns, relations = resolve_fieldsets(fields, include, TEACHER_COLUMNS, TEACHER_RELATIONS)
     
-    # Handle related data manually if not using joinedload
-    for teacher in teachers:
-        if not hasattr(teacher, 'user') or teacher.user is None:
-            teacher.user = db.query(User).filter(User.id == teacher.user_id).first()
-        
-        if not hasattr(teacher, 'classes') or teacher.classes is None:
-            teacher.classes = db.query(Class).filter(Class.teacher_id == teacher.id).all()
+    # Users and classes are selectin-loaded, so a page costs three queries at most
+    teachers = get_teacher_directory(db, skip, limit, columns, relations)
     
-    return teachers
+    if columns is None:
+        return teachers
+    return sparse_response(teachers)
 
 @router.get("/{teacher_id}", response_model=TeacherResponse)
 def get_teacher(
@@ -90,15 +89,14 @@ def get_teacher(
     if current_user.role not in ["admin", "teacher"]:
         raise HTTPException(status_code=403, detail="Not authorized to view teacher details")
     
-    teacher = db.query(Teacher).filter(Teacher.id == teacher_id).first()
+    teacher = db.query(Teacher).options(
+        selectinload(Teacher.user),
+        selectinload(Teacher.classes)
+    ).filter(Teacher.id == teacher_id).first()
     if teacher is None:
         raise HTTPException(status_code=404, detail="Teacher not found")
     
-    # Get related data
-    teacher.user = db.query(User).filter(User.id == teacher.user_id).first()
-    teacher.classes = db.query(Class).filter(Class.teacher_id == teacher.id).all()
-    
-    return teacher
+    return teacher_entry(teacher)
 
 @router.post("/", response_model=TeacherResponse)
 def create_teacher(
@@ -0,0 +1,308 @@
+# backend/app/services/analytics_snapshot.py
+import os
+import json
+import time
+import shutil
+import logging
+import tempfile
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.student import student_class
+from ..models.grade import Grade, Attendance
+from ..models.fee import Fee
+from .database import SessionLocal
+
+# NumPy is optional; without it analytics always run against live SQL
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Snapshots live outside the database so analytics reads never touch it
+SNAPSHOT_ROOT = os.environ.get(
+    "ANALYTICS_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "school_analytics")
+)
+
+# How often snapshots are exported, and how old one may be before "auto" reads go live
+SNAPSHOT_INTERVAL_SECONDS = 15 * 60
+SNAPSHOT_MAX_AGE_SECONDS = 60 * 60
+
+# Rows fetched per round trip while exporting
+EXPORT_BATCH_SIZE = 50_000
+
+# Exported columns per table, with how each is stored:
+#   "date"  -> datetime64[D] (NaT for NULL)
+#   "float" -> float64 (NaN for NULL)
+#   "int"   -> int64 (-1 for NULL)
+#   "code"  -> int32 codes into a vocabulary kept in the manifest (-1 for NULL)
+SNAPSHOT_TABLES = {
+    "attendance": {
+        "student_id": (Attendance.student_id, "int"),
+        "date": (Attendance.date, "date"),
+        "status": (Attendance.status, "code"),
+    },
+    "grades": {
+        "student_id": (Grade.student_id, "int"),
+        "subject": (Grade.subject, "code"),
+        "score": (Grade.score, "float"),
+        "grade_letter": (Grade.grade_letter, "code"),
+        "term": (Grade.term, "code"),
+        "date_recorded": (Grade.date_recorded, "date"),
+    },
+    "fees": {
+        "student_id": (Fee.student_id, "int"),
+        "amount": (Fee.amount, "float"),
+        "paid": (Fee.paid, "float"),
+        "due_date": (Fee.due_date, "date"),
+        "status": (Fee.status, "code"),
+        "term": (Fee.term, "code"),
+    },
+    "student_class": {
+        "student_id": (student_class.c.student_id, "int"),
+        "class_id": (student_class.c.class_id, "int"),
+    },
+}
+
+def _to_array(values: List, kind: str, vocabulary: Dict[str, int]):
+    if kind == "date":
+        return np.array(values, dtype="datetime64[D]")
+    if kind == "float":
+        return np.array([value if value is not None else np.nan for value in values], dtype=np.float64)
+    if kind == "int":
+        return np.array([value if value is not None else -1 for value in values], dtype=np.int64)
+    return np.array(
+        [vocabulary.setdefault(value, len(vocabulary)) if value is not None else -1 for value in values],
+        dtype=np.int32
+    )
+
+def export_table(db: Session, table: str, directory: str) -> Dict[str, Any]:
+    """Dump one table's columns to .npy files; returns its manifest entry"""
+    columns = SNAPSHOT_TABLES[table]
+    names = list(columns)
+    vocabularies = {name: {} for name, (_, kind) in columns.items() if kind == "code"}
+    parts = {name: [] for name in names}
+
+    result = db.execute(
+        select(*(column for column, _ in columns.values())).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for rows in result.partitions():
+        for index, name in enumerate(names):
+            kind = columns[name][1]
+            parts[name].append(_to_array([row[index] for row in rows], kind, vocabularies.get(name, {})))
+
+    row_count = 0
+    for name in names:
+        kind = columns[name][1]
+        array = np.concatenate(parts[name]) if parts[name] else _to_array([], kind, {})
+        np.save(os.path.join(directory, f"{table}.{name}.npy"), array)
+        row_count = len(array)
+
+    return {
+        "rows": row_count,
+        "vocabularies": {name: list(vocabulary) for name, vocabulary in vocabularies.items()},
+    }
+
+def export_snapshot(db: Session) -> str:
+    """Export every snapshot table into a new directory and make it current
+
+    Readers switch over when current.json is replaced, which is atomic, so
+    they never see a half-written snapshot.
+    """
+    snapshot_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    directory = os.path.join(SNAPSHOT_ROOT, snapshot_id)
+    os.makedirs(directory, exist_ok=True)
+
+    manifest = {
+        "id": snapshot_id,
+        "taken_at": time.time(),
+        "tables": {table: export_table(db, table, directory) for table in SNAPSHOT_TABLES},
+    }
+    with open(os.path.join(directory, "manifest.json"), "w") as handle:
+        json.dump(manifest, handle)
+
+    pointer = os.path.join(SNAPSHOT_ROOT, "current.json")
+    temp_pointer = f"{pointer}.{os.getpid()}.tmp"
+    with open(temp_pointer, "w") as handle:
+        json.dump({"id": snapshot_id}, handle)
+    os.replace(temp_pointer, pointer)
+
+    _remove_old_snapshots()
+    return snapshot_id
+
+def _remove_old_snapshots(keep: int = 2):
+    # The previous snapshot is kept for readers that opened it just before
+    # the switch; older ones can go (open memory maps survive unlinking)
+    directories = sorted(
+        name for name in os.listdir(SNAPSHOT_ROOT) if os.path.isdir(os.path.join(SNAPSHOT_ROOT, name))
+    )
+    for name in directories[:-keep]:
+        shutil.rmtree(os.path.join(SNAPSHOT_ROOT, name), ignore_errors=True)
+
+def run_snapshot_export():
+    """Scheduled entry point: export a fresh analytics snapshot"""
+    if np is None:
+        return
+
+    db = SessionLocal()
+    try:
+        snapshot_id = export_snapshot(db)
+        logger.info("Exported analytics snapshot %s", snapshot_id)
+    finally:
+        db.close()
+
+def _sorted_codes(vocabulary: List[Optional[str]]) -> List[int]:
+    # Codes in value order (NULL first), matching SQL's GROUP BY output
+    return sorted(range(len(vocabulary)), key=lambda code: (vocabulary[code] is not None, vocabulary[code] or ""))
+
+def _date_of(day) -> date:
+    return date.fromisoformat(str(day))
+
+class AnalyticsSnapshot:
+    """Read-only view of one exported snapshot with vectorized group-bys
+
+    Columns are memory-mapped on first use, so the OS page cache shares
+    them between workers and only touched columns are read from disk.
+    """
+
+    def __init__(self, directory: str, manifest: Dict[str, Any]):
+        self.directory = directory
+        self.manifest = manifest
+        self.taken_at = manifest["taken_at"]
+        self._columns: Dict[str, Any] = {}
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.taken_at
+
+    def column(self, table: str, name: str):
+        key = f"{table}.{name}"
+        if key not in self._columns:
+            self._columns[key] = np.load(os.path.join(self.directory, f"{key}.npy"), mmap_mode="r")
+        return self._columns[key]
+
+    def vocabulary(self, table: str, name: str) -> List[Optional[str]]:
+        return self.manifest["tables"][table]["vocabularies"][name]
+
+    def code(self, table: str, name: str, value: str) -> int:
+        vocabulary = self.vocabulary(table, name)
+        return vocabulary.index(value) if value in vocabulary else -2
+
+    def class_mask(self, table: str, class_id: Optional[int]):
+        """Boolean mask of rows whose student belongs to the class (all rows when None)"""
+        student_ids = self.column(table, "student_id")
+        if class_id is None:
+            return np.ones(len(student_ids), dtype=bool)
+        members = self.column("student_class", "student_id")[self.column("student_class", "class_id") == class_id]
+        return np.isin(student_ids, members)
+
+    def weekly_attendance(self, start_date: date, class_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Weekly present/absent counts since start_date, weeks starting on Monday"""
+        days = self.column("attendance", "date")
+        mask = (days >= np.datetime64(start_date, "D")) & self.class_mask("attendance", class_id)
+
+        day_numbers = days[mask].astype(np.int64)
+        # 1970-01-01 was a Thursday, so Monday-based weekdays are offset by 3
+        weeks = day_numbers - (day_numbers + 3) % 7
+        statuses = self.column("attendance", "status")[mask]
+
+        week_keys, week_index = np.unique(weeks, return_inverse=True)
+        present = np.bincount(week_index, weights=statuses == self.code("attendance", "status", "present"), minlength=len(week_keys))
+        absent = np.bincount(week_index, weights=statuses == self.code("attendance", "status", "absent"), minlength=len(week_keys))
+
+        return [
+            {
+                "date": _date_of(np.datetime64(int(week), "D")).strftime("%b %d"),
+                "present": int(present[index]),
+                "absent": int(absent[index])
+            }
+            for index, week in enumerate(week_keys)
+        ]
+
+    def grade_distribution(self, class_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Count of grades per letter"""
+        letters = self.column("grades", "grade_letter")[self.class_mask("grades", class_id)]
+        counts = np.bincount(letters + 1, minlength=len(self.vocabulary("grades", "grade_letter")) + 1)
+        vocabulary = [None] + self.vocabulary("grades", "grade_letter")
+        return [
+            {"grade": vocabulary[code], "count": int(counts[code])}
+            for code in _sorted_codes(vocabulary)
+            if counts[code]
+        ]
+
+    def monthly_grade_stats(self, months: List[date]) -> List[Dict[str, Any]]:
+        """Average, highest and lowest score for each month given (by any day in it)"""
+        recorded = self.column("grades", "date_recorded").astype("datetime64[M]")
+        scores = self.column("grades", "score")
+        results = []
+
+        for month_date in months:
+            month_scores = scores[recorded == np.datetime64(month_date, "M")]
+            month_scores = month_scores[~np.isnan(month_scores)]
+            if len(month_scores) and month_scores.mean():
+                results.append({
+                    "month": month_date.strftime("%b"),
+                    "averageScore": round(float(month_scores.mean()), 1),
+                    "highestScore": round(float(month_scores.max()), 1),
+                    "lowestScore": round(float(month_scores.min()), 1),
+                    "subject": "Overall"
+                })
+
+        return results
+
+    def monthly_fee_collection(self, months: List[date]) -> List[Dict[str, Any]]:
+        """Fees collected per month of due date"""
+        due = self.column("fees", "due_date").astype("datetime64[M]")
+        paid = np.nan_to_num(self.column("fees", "paid"))
+        return [
+            {
+                "month": month_date.strftime("%b"),
+                "amount": float(paid[due == np.datetime64(month_date, "M")].sum())
+            }
+            for month_date in months
+        ]
+
+    def fee_status_counts(self) -> List[Dict[str, Any]]:
+        """Count of fees per status"""
+        counts = np.bincount(self.column("fees", "status") + 1, minlength=len(self.vocabulary("fees", "status")) + 1)
+        vocabulary = [None] + self.vocabulary("fees", "status")
+        return [
+            {"status": vocabulary[code], "count": int(counts[code])}
+            for code in _sorted_codes(vocabulary)
+            if counts[code]
+        ]
+
+_current: Optional[AnalyticsSnapshot] = None
+_current_lock = threading.Lock()
+
+def current_snapshot(max_age_seconds: Optional[float] = SNAPSHOT_MAX_AGE_SECONDS) -> Optional[AnalyticsSnapshot]:
+    """Return the latest snapshot, or None if there is none recent enough"""
+    global _current
+    if np is None:
+        return None
+
+    try:
+        with open(os.path.join(SNAPSHOT_ROOT, "current.json")) as handle:
+            snapshot_id = json.load(handle)["id"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+    with _current_lock:
+        if _current is None or _current.manifest["id"] != snapshot_id:
+            directory = os.path.join(SNAPSHOT_ROOT, snapshot_id)
+            try:
+                with open(os.path.join(directory, "manifest.json")) as handle:
+                    _current = AnalyticsSnapshot(directory, json.load(handle))
+            except (OSError, ValueError):
+                return None
+        snapshot = _current
+
+    if max_age_seconds is not None and snapshot.age_seconds > max_age_seconds:
+        return None
+    return snapshot
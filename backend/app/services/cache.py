@@ -0,0 +1,101 @@
+# backend/app/services/cache.py
+import time
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+# Caches registered under a group name are invalidated together
+_cache_groups: Dict[str, List["ResultCache"]] = {}
+
+class ResultCache:
+    """Thread-safe in-process cache for computed query results
+
+    Entries expire after ttl_seconds (None keeps them until invalidated). Each
+    invalidation bumps a generation counter so a computation that started
+    before the invalidation cannot store its now-stale result.
+    """
+
+    def __init__(self, name: str, ttl_seconds: Optional[float] = None, max_entries: int = 1024, group: Optional[str] = None):
+        self.name = name
+        self.group = group
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        if group is not None:
+            _cache_groups.setdefault(group, []).append(self)
+
+    def _lookup(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        return entry
+
+    def get_entry(self, key: Hashable):
+        """Return (value, stored_at) for a live entry, or None, counting hit/miss"""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # Drop the oldest entry; dicts keep insertion order
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (value, time.monotonic())
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        entry = self.get_entry(key)
+        if entry is not None:
+            return entry[0]
+
+        with self._lock:
+            generation = self._generation
+        value = compute()
+        self.set(key, value, generation)
+        return value
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one key, or every entry when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups * 100) if lookups > 0 else 0,
+                "invalidations": self.invalidations,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+def invalidate_group(group: str):
+    """Invalidate every cache registered under a group"""
+    for cache in _cache_groups.get(group, []):
+        cache.invalidate()
+
+def group_stats(group: str) -> List[Dict[str, Any]]:
+    return [cache.stats() for cache in _cache_groups.get(group, [])]
@@ -0,0 +1,141 @@
+# backend/app/services/calendar_month.py
+import calendar
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, and_, inspect
+from sqlalchemy.orm import Session, joinedload
+
+from ..models.grade import Attendance
+from ..models.fee import Fee
+from ..models.timetable import Event
+from .cache import ResultCache
+from .commit_hooks import after_commit_of_writes
+from .counters import get_headline_counts
+
+# Finished months are cached; fee writes clear the "calendar" group (see
+# invalidate_fee_caches), while back-dated attendance and committed event
+# writes clear just the months they touch. The TTL picks up events written
+# by other processes, such as the populate scripts.
+calendar_month_cache = ResultCache("calendar_month", ttl_seconds=24 * 60 * 60, max_entries=240, group="calendar")
+
+def month_bounds(year: int, month: int):
+    first = date(year, month, 1)
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    return first, last
+
+def build_calendar_month(db: Session, year: int, month: int) -> Dict[str, Any]:
+    """Every day's attendance, events and fees for a month from three range-grouped queries"""
+    first, last = month_bounds(year, month)
+    student_count = get_headline_counts(db)["student_count"]
+    
+    attendance_rows = db.query(
+        Attendance.date,
+        Attendance.status,
+        func.count(Attendance.id)
+    ).filter(
+        Attendance.date >= first,
+        Attendance.date <= last
+    ).group_by(Attendance.date, Attendance.status).all()
+    
+    # Events without an end date are single-day events
+    events = db.query(Event).options(joinedload(Event.creator)).filter(
+        Event.start_date <= last,
+        func.coalesce(Event.end_date, Event.start_date) >= first
+    ).order_by(Event.start_date, Event.id).all()
+    
+    fee_rows = db.query(
+        Fee.due_date,
+        func.coalesce(func.sum(Fee.paid), 0),
+        func.coalesce(func.sum(Fee.amount - Fee.paid), 0),
+        func.count(Fee.id)
+    ).filter(
+        Fee.due_date >= first,
+        Fee.due_date <= last
+    ).group_by(Fee.due_date).all()
+    
+    days: Dict[date, Dict[str, Any]] = {}
+    for offset in range((last - first).days + 1):
+        day = first + timedelta(days=offset)
+        days[day] = {
+            "date": day.isoformat(),
+            "attendance": {"present": 0, "absent": 0, "late": 0, "excused": 0, "total": student_count, "rate": 0},
+            "events": [],
+            "fees": {"collected": 0, "pending": 0},
+            "fee_count": 0,
+            "attendance_count": 0
+        }
+    
+    for day, status, count in attendance_rows:
+        entry = days[day]
+        if status in entry["attendance"]:
+            entry["attendance"][status] += count
+        entry["attendance_count"] += count
+    
+    for event in events:
+        start = max(event.start_date, first)
+        end = min(event.end_date or event.start_date, last)
+        summary = {
+            "id": event.id,
+            "title": event.title,
+            "event_type": event.event_type,
+            "all_day": event.all_day,
+            "creator_name": event.creator.full_name if event.creator else "Unknown"
+        }
+        for offset in range((end - start).days + 1):
+            days[start + timedelta(days=offset)]["events"].append(summary)
+    
+    for day, collected, pending, count in fee_rows:
+        days[day]["fees"] = {"collected": float(collected), "pending": float(pending)}
+        days[day]["fee_count"] = count
+    
+    results: List[Dict[str, Any]] = []
+    for entry in days.values():
+        attendance = entry["attendance"]
+        attendance["rate"] = (attendance["present"] / student_count * 100) if student_count > 0 else 0
+        attendance_count = entry.pop("attendance_count")
+        fee_count = entry.pop("fee_count")
+        entry["has_data"] = bool(attendance_count or entry["events"] or fee_count)
+        results.append(entry)
+    
+    return {"year": year, "month": month, "days": results}
+
+def get_calendar_month(db: Session, year: int, month: int) -> Dict[str, Any]:
+    """Calendar data for a month; finished months are served from cache"""
+    _, last = month_bounds(year, month)
+    if last >= date.today():
+        return build_calendar_month(db, year, month)
+    return calendar_month_cache.get_or_compute((year, month), lambda: build_calendar_month(db, year, month))
+
+def invalidate_calendar_day(day: date):
+    """Drop the cached month containing a back-dated write"""
+    calendar_month_cache.invalidate((day.year, day.month))
+
+def invalidate_calendar_range(start: date, end: Optional[date] = None):
+    """Drop every cached month from start's to end's, for writes spanning several days"""
+    year, month = start.year, start.month
+    end = end if end and end > start else start
+    while (year, month) <= (end.year, end.month):
+        calendar_month_cache.invalidate((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def event_spans(event: Event):
+    """(start, end) of an event as written, and as it was before an update"""
+    attrs = inspect(event).attrs
+    start_history, end_history = attrs.start_date.history, attrs.end_date.history
+    spans = {
+        (event.start_date, event.end_date),
+        (
+            start_history.deleted[0] if start_history.deleted else event.start_date,
+            end_history.deleted[0] if end_history.deleted else event.end_date
+        )
+    }
+    return {span for span in spans if span[0] is not None}
+
+def invalidate_event_spans(spans):
+    for start, end in spans:
+        invalidate_calendar_range(start, end)
+
+# Committed event inserts, updates and deletes drop the months they cover,
+# both the old and the new dates of a moved event
+after_commit_of_writes("calendar_events_dirty", (Event,), invalidate_event_spans, keys_of=event_spans)
@@ -0,0 +1,44 @@
+# backend/app/services/commit_hooks.py
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+def after_commit_of_writes(
+    key: str,
+    models: Iterable[type],
+    callback: Callable[..., None],
+    keys_of: Optional[Callable[[object], Iterable]] = None
+):
+    """Call callback once a session that inserted, updated or deleted any of models commits
+    
+    Writes only mark the session (under session.info[key]); the callback
+    runs after the commit, so nothing reacting to it can observe
+    uncommitted data, and a rollback discards the mark. With keys_of, the
+    callback instead receives the set of keys_of(row) over every row written.
+    """
+    def mark_dirty(mapper, connection, target):
+        session = object_session(target)
+        if session is None:
+            return
+        if keys_of is None:
+            session.info[key] = True
+        else:
+            session.info.setdefault(key, set()).update(keys_of(target))
+    
+    for model in models:
+        for event_name in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, event_name, mark_dirty)
+    
+    def run_after_commit(session):
+        marked = session.info.pop(key, None)
+        if marked and keys_of is None:
+            callback()
+        elif marked:
+            callback(marked)
+    
+    def discard_after_rollback(session):
+        session.info.pop(key, None)
+    
+    event.listen(Session, "after_commit", run_after_commit)
+    event.listen(Session, "after_rollback", discard_after_rollback)
@@ -0,0 +1,156 @@
+# backend/app/services/counters.py
+import logging
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import event, func, update, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.user import User, UserRole
+from ..models.student import Student, Class, Teacher
+from ..models.counter import EntityCounter
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# How often maintained counts are checked against COUNT(*)
+COUNTER_RECONCILE_INTERVAL_SECONDS = 15 * 60
+
+# Counters kept for one model each; users are counted per role as "users:<role>"
+MODEL_COUNTERS = {
+    Student: "students",
+    Teacher: "teachers",
+    Class: "classes",
+}
+
+def user_counter(role) -> str:
+    return f"users:{getattr(role, 'value', role)}"
+
+def _bump(connection, name: str, delta: int):
+    # Relative UPDATE inside the writer's transaction, so concurrent writers
+    # serialize on the counter row instead of losing increments
+    connection.execute(
+        update(EntityCounter.__table__)
+        .where(EntityCounter.__table__.c.name == name)
+        .values(value=EntityCounter.__table__.c.value + delta)
+    )
+
+def _register_model_counter(model, name: str):
+    @event.listens_for(model, "after_insert")
+    def after_insert(mapper, connection, target):
+        _bump(connection, name, 1)
+    
+    @event.listens_for(model, "after_delete")
+    def after_delete(mapper, connection, target):
+        _bump(connection, name, -1)
+
+for _model, _name in MODEL_COUNTERS.items():
+    _register_model_counter(_model, _name)
+
+@event.listens_for(User, "after_insert")
+def _user_inserted(mapper, connection, target):
+    _bump(connection, user_counter(target.role), 1)
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    _bump(connection, user_counter(target.role), -1)
+
+@event.listens_for(User, "before_update")
+def _user_role_changed(mapper, connection, target):
+    history = inspect(target).attrs.role.history
+    if not history.added:
+        return
+    
+    # The old role is only in history if it was loaded before the change
+    if history.deleted:
+        old_role = history.deleted[0]
+    else:
+        old_role = connection.execute(select(User.role).where(User.id == target.id)).scalar()
+    
+    if user_counter(old_role) != user_counter(history.added[0]):
+        _bump(connection, user_counter(old_role), -1)
+        _bump(connection, user_counter(history.added[0]), 1)
+
+def count_entities(db: Session) -> Dict[str, int]:
+    """Count every tracked entity from scratch"""
+    counts = {
+        name: db.query(func.count()).select_from(model).scalar() or 0
+        for model, name in MODEL_COUNTERS.items()
+    }
+    counts.update({user_counter(role): 0 for role in UserRole})
+    for role, count in db.query(User.role, func.count(User.id)).group_by(User.role).all():
+        counts[user_counter(role)] = count
+    return counts
+
+def reconcile_counters(db: Session) -> Dict[str, int]:
+    """Overwrite maintained counters with true counts; returns the drift per counter
+
+    Writes that bypass the ORM (bulk inserts, raw SQL, deletes by query) do
+    not fire mapper events, so counters are periodically corrected here.
+    """
+    counts = count_entities(db)
+    existing = {counter.name: counter for counter in db.query(EntityCounter).with_for_update().all()}
+    now = datetime.now()
+    drift = {}
+    
+    for name in set(counts) | set(existing):
+        value = counts.get(name, 0)
+        counter = existing.get(name)
+        if counter is None:
+            counter = EntityCounter(name=name, value=value)
+            db.add(counter)
+            drift[name] = value
+        elif counter.value != value:
+            drift[name] = value - counter.value
+            counter.value = value
+        counter.reconciled_at = now
+    
+    db.flush()
+    return drift
+
+def get_headline_counts(db: Session) -> Dict[str, int]:
+    """Student, teacher, parent and class counts from the counters table"""
+    values = dict(db.query(EntityCounter.name, EntityCounter.value).all())
+    
+    # Counter rows are seeded at startup; until then count live rather than
+    # write from a request
+    if not values:
+        values = count_entities(db)
+    
+    return {
+        "student_count": values.get("students", 0),
+        "teacher_count": values.get("teachers", 0),
+        "parent_count": values.get(user_counter("parent"), 0),
+        "class_count": values.get("classes", 0)
+    }
+
+def seed_counters():
+    """Create the counter rows before the app serves requests
+
+    Another worker process starting at the same time may insert them first;
+    its rows are just as correct, so the conflict is ignored.
+    """
+    db = SessionLocal()
+    try:
+        reconcile_counters(db)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        logger.info("Entity counters were seeded by another worker")
+    finally:
+        db.close()
+
+def run_counter_reconciliation():
+    """Scheduled entry point: correct counter drift in a fresh session"""
+    db = SessionLocal()
+    try:
+        drift = reconcile_counters(db)
+        db.commit()
+        if drift:
+            logger.info("Corrected entity counters: %s", drift)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import sys
@@ -10,7 +10,19 @@ from config import DATABASE_URL
 
 SQLALCHEMY_DATABASE_URL = DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Every request holds one connection and a dashboard's sections hold up to
+# SECTION_WORKERS more (sections.py), so the pool is sized well above both
+DB_POOL_SIZE = 20
+DB_MAX_OVERFLOW = 10
+
+def pool_options(url: str) -> dict:
+    # In-memory SQLite keeps one connection per thread and takes no pool sizing
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW}
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **pool_options(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Dependency
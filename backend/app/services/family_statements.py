@@ -0,0 +1,234 @@
+# backend/app/services/family_statements.py
+import html
+from datetime import date
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.user import User
+from ..models.student import Student
+from ..models.fee import Fee
+from ..utils.pdf_utils import build_text_pdf
+from ..utils.export_utils import stream_query_rows
+from .cache import ResultCache
+from .database import SessionLocal
+from .invoices import SCHOOL_NAME, SCHOOL_MOTTO
+
+# Per-parent statements are precomputed on first request and dropped on any fee write
+family_statement_cache = ResultCache("family_statement", ttl_seconds=300, group="fees")
+
+def _totals(lines: List[Dict]) -> Dict[str, float]:
+    return {
+        "total_amount": sum(line["amount"] for line in lines),
+        "total_paid": sum(line["paid"] for line in lines),
+        "total_balance": sum(line["balance"] for line in lines),
+    }
+
+def family_statement_query(
+    db: Session,
+    parent_ids: Optional[List[int]] = None,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None
+):
+    """One Fee/Student/User join for many parents, ordered parent by parent"""
+    query = db.query(
+        User.id,
+        User.full_name,
+        User.email,
+        Student.id,
+        Student.first_name,
+        Student.last_name,
+        Student.admission_number,
+        Fee.id,
+        Fee.description,
+        Fee.due_date,
+        Fee.amount,
+        Fee.paid,
+        Fee.status
+    ).join(Student, Student.parent_id == User.id).join(Fee, Fee.student_id == Student.id)
+    
+    if parent_ids is not None:
+        query = query.filter(User.id.in_(parent_ids))
+    
+    if term:
+        query = query.filter(Fee.term == term)
+    
+    if academic_year:
+        query = query.filter(Fee.academic_year == academic_year)
+    
+    return query.order_by(
+        User.id, Student.last_name, Student.first_name, Student.id, Fee.due_date, Fee.id
+    )
+
+def group_family_statements(
+    rows: Iterable,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None
+) -> Iterator[Dict]:
+    """Fold family_statement_query rows into statements, holding one family at a time"""
+    for parent_id, parent_rows in groupby(rows, key=lambda row: row[0]):
+        parent_rows = list(parent_rows)
+        children = []
+        for student_id, student_rows in groupby(parent_rows, key=lambda row: row[3]):
+            student_rows = list(student_rows)
+            first = student_rows[0]
+            lines = [
+                {
+                    "fee_id": row[7],
+                    "description": row[8],
+                    "due_date": row[9],
+                    "amount": float(row[10] or 0),
+                    "paid": float(row[11] or 0),
+                    "balance": float((row[10] or 0) - (row[11] or 0)),
+                    "status": row[12],
+                }
+                for row in student_rows
+            ]
+            children.append({
+                "student_id": student_id,
+                "student_name": f"{first[4]} {first[5]}",
+                "admission_number": first[6],
+                "fees": lines,
+                **_totals(lines),
+            })
+        
+        yield empty_family_statement(
+            parent_id, parent_rows[0][1], parent_rows[0][2], term, academic_year, children
+        )
+
+def load_family_statements(
+    db: Session,
+    parent_ids: Optional[List[int]] = None,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None
+) -> List[Dict]:
+    """Build consolidated statements for a few parents from one Fee/Student/User join"""
+    rows = family_statement_query(db, parent_ids, term, academic_year).all()
+    return list(group_family_statements(rows, term, academic_year))
+
+def iter_family_statements(term: Optional[str] = None, academic_year: Optional[str] = None) -> Iterator[Dict]:
+    """Every family's statement, read from a server-side cursor in a session owned by the stream"""
+    rows = stream_query_rows(SessionLocal, lambda db: family_statement_query(db, None, term, academic_year))
+    return group_family_statements(rows, term, academic_year)
+
+def empty_family_statement(
+    parent_id: int,
+    parent_name: Optional[str],
+    parent_email: Optional[str],
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    children: Optional[List[Dict]] = None
+) -> Dict:
+    children = children or []
+    return {
+        "parent_id": parent_id,
+        "parent_name": parent_name,
+        "parent_email": parent_email,
+        "term": term,
+        "academic_year": academic_year,
+        "generated_on": date.today(),
+        "children": children,
+        "total_amount": sum(child["total_amount"] for child in children),
+        "total_paid": sum(child["total_paid"] for child in children),
+        "total_balance": sum(child["total_balance"] for child in children),
+    }
+
+def get_family_statement(db: Session, parent: User, term: Optional[str] = None, academic_year: Optional[str] = None) -> Dict:
+    """Get one parent's consolidated statement, computing it only after fee changes"""
+    def compute():
+        statements = load_family_statements(db, [parent.id], term, academic_year)
+        if statements:
+            return statements[0]
+        return empty_family_statement(parent.id, parent.full_name, parent.email, term, academic_year)
+    
+    return family_statement_cache.get_or_compute((parent.id, term, academic_year, date.today()), compute)
+
+def family_statement_filename(statement: Dict, extension: str) -> str:
+    return f"statement-parent-{statement['parent_id']}.{extension}"
+
+def render_family_statement_pdf(statement: Dict) -> bytes:
+    """Render a family statement with one section per child"""
+    period = " ".join(part for part in [statement["term"], statement["academic_year"]] if part) or "All terms"
+    lines = [
+        (SCHOOL_NAME, True),
+        (SCHOOL_MOTTO, False),
+        ("", False),
+        ("FAMILY STATEMENT", True),
+        (f"Parent: {statement['parent_name'] or statement['parent_email'] or statement['parent_id']}", False),
+        (f"Period: {period}", False),
+        (f"Date: {statement['generated_on'].isoformat()}", False),
+    ]
+    
+    for child in statement["children"]:
+        lines.extend([
+            ("", False),
+            (f"{child['student_name']} ({child['admission_number']})", True),
+            (f"{'Description':<34}{'Due':<12}{'Amount':>10}{'Paid':>10}{'Balance':>10}", True),
+        ])
+        for fee in child["fees"]:
+            due = fee["due_date"].isoformat() if fee["due_date"] else ""
+            lines.append((
+                f"{(fee['description'] or '')[:32]:<34}{due:<12}"
+                f"{fee['amount']:>10.2f}{fee['paid']:>10.2f}{fee['balance']:>10.2f}",
+                False
+            ))
+        lines.append((
+            f"{'Subtotal':<46}{child['total_amount']:>10.2f}{child['total_paid']:>10.2f}{child['total_balance']:>10.2f}",
+            False
+        ))
+    
+    lines.extend([
+        ("", False),
+        (f"{'Family total':<46}{statement['total_amount']:>10.2f}{statement['total_paid']:>10.2f}{statement['total_balance']:>10.2f}", True),
+        (f"Amount due: {statement['total_balance']:.2f}", True),
+    ])
+    
+    return build_text_pdf(lines)
+
+HTML_HEAD = (
+    "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Family statements</title>"
+    "<style>body{font-family:sans-serif}section{page-break-after:always}"
+    "table{border-collapse:collapse;width:100%}td,th{padding:4px;border-bottom:1px solid #ddd}"
+    "td.num,th.num{text-align:right}</style></head><body>"
+)
+HTML_TAIL = "</body></html>"
+
+def render_family_statement_html(statement: Dict) -> str:
+    """Render a family statement as a printable HTML section"""
+    escape = html.escape
+    period = " ".join(part for part in [statement["term"], statement["academic_year"]] if part) or "All terms"
+    parts = [
+        "<section>",
+        f"<h1>{escape(SCHOOL_NAME)}</h1><p>{escape(SCHOOL_MOTTO)}</p>",
+        f"<h2>Family statement: {escape(str(statement['parent_name'] or statement['parent_id']))}</h2>",
+        f"<p>Period: {escape(period)} &middot; Date: {statement['generated_on'].isoformat()}</p>",
+    ]
+    
+    for child in statement["children"]:
+        parts.append(f"<h3>{escape(child['student_name'])} ({escape(child['admission_number'] or '')})</h3>")
+        parts.append(
+            "<table><tr><th>Description</th><th>Due</th><th class=\"num\">Amount</th>"
+            "<th class=\"num\">Paid</th><th class=\"num\">Balance</th></tr>"
+        )
+        for fee in child["fees"]:
+            due = fee["due_date"].isoformat() if fee["due_date"] else ""
+            parts.append(
+                f"<tr><td>{escape(fee['description'] or '')}</td><td>{due}</td>"
+                f"<td class=\"num\">{fee['amount']:.2f}</td><td class=\"num\">{fee['paid']:.2f}</td>"
+                f"<td class=\"num\">{fee['balance']:.2f}</td></tr>"
+            )
+        parts.append(
+            f"<tr><th colspan=\"2\">Subtotal</th><th class=\"num\">{child['total_amount']:.2f}</th>"
+            f"<th class=\"num\">{child['total_paid']:.2f}</th><th class=\"num\">{child['total_balance']:.2f}</th></tr></table>"
+        )
+    
+    parts.append(f"<h3>Amount due: {statement['total_balance']:.2f}</h3></section>")
+    return "".join(parts)
+
+def iter_family_statements_html(statements: Iterable[Dict]) -> Iterator[str]:
+    """Stream many statements as one HTML document, one printed page per family"""
+    yield HTML_HEAD
+    for statement in statements:
+        yield render_family_statement_html(statement)
+    yield HTML_TAIL
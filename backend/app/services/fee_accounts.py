@@ -0,0 +1,176 @@
+# backend/app/services/fee_accounts.py
+from typing import Dict, Iterable, List
+
+from sqlalchemy import func, case, insert, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models.fee import Fee, StudentAccount
+from ..utils.sql_dates import dialect_name
+
+# Differences below this are treated as rounding noise by the checker
+BALANCE_TOLERANCE = 0.005
+
+def _fee_totals_query(db: Session):
+    return db.query(
+        Fee.student_id,
+        func.coalesce(func.sum(Fee.amount), 0).label("total_billed"),
+        func.coalesce(func.sum(Fee.paid), 0).label("total_paid"),
+        func.min(case((Fee.amount > Fee.paid, Fee.due_date))).label("oldest_unpaid_due_date")
+    ).group_by(Fee.student_id)
+
+def _apply_totals_to(values: Dict, total_billed, total_paid, oldest_unpaid_due_date):
+    values["total_billed"] = float(total_billed or 0)
+    values["total_paid"] = float(total_paid or 0)
+    values["balance"] = values["total_billed"] - values["total_paid"]
+    values["oldest_unpaid_due_date"] = oldest_unpaid_due_date
+
+def _apply_totals(account: StudentAccount, total_billed, total_paid, oldest_unpaid_due_date):
+    values = {}
+    _apply_totals_to(values, total_billed, total_paid, oldest_unpaid_due_date)
+    for name, value in values.items():
+        setattr(account, name, value)
+
+def _insert_missing_accounts(db: Session, student_ids: List[int]):
+    """Create empty account rows for the students, skipping rows that exist
+
+    An upsert rather than select-then-insert, so two transactions creating
+    the same account cannot both insert and fail on the primary key.
+    """
+    rows = [{"student_id": student_id} for student_id in student_ids]
+    dialect = dialect_name(db)
+    
+    if dialect == "postgresql":
+        db.execute(postgresql_insert(StudentAccount).values(rows).on_conflict_do_nothing(index_elements=["student_id"]))
+    elif dialect == "sqlite":
+        db.execute(sqlite_insert(StudentAccount).values(rows).on_conflict_do_nothing(index_elements=["student_id"]))
+    elif dialect == "mysql":
+        statement = mysql_insert(StudentAccount).values(rows)
+        db.execute(statement.on_duplicate_key_update(student_id=statement.inserted.student_id))
+    else:
+        existing = {
+            student_id for (student_id,) in
+            db.query(StudentAccount.student_id).filter(StudentAccount.student_id.in_(student_ids)).all()
+        }
+        missing = [row for row in rows if row["student_id"] not in existing]
+        if missing:
+            db.execute(insert(StudentAccount), missing)
+
+def refresh_student_accounts(db: Session, student_ids: Iterable[int]) -> int:
+    """Recompute several students' accounts in a fixed number of statements
+
+    Call after adding or changing fees and before committing, so the account
+    rows are written in the same transaction as the fees. Returns the number
+    of accounts refreshed.
+    """
+    student_ids = sorted({student_id for student_id in student_ids if student_id is not None})
+    if not student_ids:
+        return 0
+    
+    db.flush()
+    _insert_missing_accounts(db, student_ids)
+    
+    # Lock the account rows (in id order, so batches cannot deadlock) before
+    # reading totals, so concurrent payments for a student serialize instead
+    # of overwriting each other's totals
+    db.query(StudentAccount.student_id).filter(
+        StudentAccount.student_id.in_(student_ids)
+    ).order_by(StudentAccount.student_id).with_for_update().all()
+    
+    totals = {row.student_id: row for row in _fee_totals_query(db).filter(Fee.student_id.in_(student_ids)).all()}
+    
+    values = []
+    for student_id in student_ids:
+        row = totals.get(student_id)
+        account = {"student_id": student_id}
+        _apply_totals_to(
+            account,
+            row.total_billed if row else 0,
+            row.total_paid if row else 0,
+            row.oldest_unpaid_due_date if row else None
+        )
+        values.append(account)
+    
+    db.execute(update(StudentAccount), values)
+    return len(values)
+
+def refresh_student_account(db: Session, student_id: int) -> StudentAccount:
+    """Recompute one student's account inside the caller's transaction"""
+    refresh_student_accounts(db, [student_id])
+    return db.get(StudentAccount, student_id, populate_existing=True)
+
+def find_account_mismatches(db: Session) -> List[Dict]:
+    """Compare every stored account with totals recomputed from fees"""
+    expected = {
+        row.student_id: row
+        for row in _fee_totals_query(db).all()
+        if row.student_id is not None
+    }
+    stored = {account.student_id: account for account in db.query(StudentAccount).all()}
+    
+    mismatches = []
+    for student_id in set(expected) | set(stored):
+        row = expected.get(student_id)
+        account = stored.get(student_id)
+        
+        billed = float(row.total_billed) if row else 0.0
+        paid = float(row.total_paid) if row else 0.0
+        oldest = row.oldest_unpaid_due_date if row else None
+        
+        if account is None:
+            if row is not None:
+                mismatches.append({"student_id": student_id, "problem": "missing account"})
+            continue
+        
+        if (
+            abs(account.total_billed - billed) > BALANCE_TOLERANCE
+            or abs(account.total_paid - paid) > BALANCE_TOLERANCE
+            or abs(account.balance - (billed - paid)) > BALANCE_TOLERANCE
+            or account.oldest_unpaid_due_date != oldest
+        ):
+            mismatches.append({
+                "student_id": student_id,
+                "problem": "totals differ",
+                "stored": {
+                    "total_billed": account.total_billed,
+                    "total_paid": account.total_paid,
+                    "balance": account.balance,
+                    "oldest_unpaid_due_date": account.oldest_unpaid_due_date
+                },
+                "expected": {
+                    "total_billed": billed,
+                    "total_paid": paid,
+                    "balance": billed - paid,
+                    "oldest_unpaid_due_date": oldest
+                }
+            })
+    
+    return sorted(mismatches, key=lambda mismatch: mismatch["student_id"])
+
+def rebuild_student_accounts(db: Session) -> int:
+    """Rewrite every account from the fees table and return how many were written"""
+    db.query(StudentAccount).delete(synchronize_session=False)
+    
+    accounts = []
+    for row in _fee_totals_query(db).all():
+        if row.student_id is None:
+            continue
+        account = StudentAccount(student_id=row.student_id)
+        _apply_totals(account, row.total_billed, row.total_paid, row.oldest_unpaid_due_date)
+        accounts.append(account)
+    
+    db.add_all(accounts)
+    db.flush()
+    return len(accounts)
+
+def ensure_student_accounts(db: Session) -> int:
+    """Build the accounts table on first start if fees exist but accounts don't"""
+    has_accounts = db.query(StudentAccount.student_id).first() is not None
+    has_fees = db.query(Fee.id).first() is not None
+    
+    if has_accounts or not has_fees:
+        return 0
+    
+    return rebuild_student_accounts(db)
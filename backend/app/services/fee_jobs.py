@@ -0,0 +1,55 @@
+# backend/app/services/fee_jobs.py
+import logging
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from ..models.fee import Fee
+from .database import SessionLocal
+from .fee_accounts import ensure_student_accounts
+
+logger = logging.getLogger(__name__)
+
+# How often the overdue sweep runs
+OVERDUE_SWEEP_INTERVAL_SECONDS = 60 * 60
+
+def mark_overdue_fees(db: Session, today: Optional[date] = None) -> int:
+    """Flag every unpaid fee past its due date as overdue in one UPDATE"""
+    today = today or date.today()
+    
+    updated = db.query(Fee).filter(
+        Fee.due_date < today,
+        Fee.amount > Fee.paid,
+        or_(Fee.status.is_(None), Fee.status != "overdue")
+    ).update({Fee.status: "overdue"}, synchronize_session=False)
+    
+    return updated
+
+def run_overdue_sweep():
+    """Scheduled entry point: sweep overdue fees in a fresh session"""
+    db = SessionLocal()
+    try:
+        updated = mark_overdue_fees(db)
+        db.commit()
+        logger.info("Overdue sweep marked %d fee(s) as overdue", updated)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def build_missing_accounts():
+    """Startup entry point: populate student_accounts the first time it is empty"""
+    db = SessionLocal()
+    try:
+        built = ensure_student_accounts(db)
+        db.commit()
+        if built:
+            logger.info("Built %d student account(s) from existing fees", built)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
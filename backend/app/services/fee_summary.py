@@ -0,0 +1,104 @@
+# backend/app/services/fee_summary.py
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.fee import Fee, StudentAccount
+from .cache import ResultCache, invalidate_group, group_stats
+
+# Summaries are invalidated on every fee write made through the routers; the
+# TTL only bounds staleness from writes made by other processes
+fee_summary_cache = ResultCache("fee_summary", ttl_seconds=300, group="fees")
+
+def compute_fee_summary(db: Session, term: Optional[str] = None, academic_year: Optional[str] = None) -> Dict[str, Any]:
+    """Compute fee totals and per-student payment status counts"""
+    query = db.query(Fee)
+    
+    if term:
+        query = query.filter(Fee.term == term)
+    
+    if academic_year:
+        query = query.filter(Fee.academic_year == academic_year)
+    
+    # Get total amounts
+    fee_summary = query.with_entities(
+        func.sum(Fee.amount).label("total_amount"),
+        func.sum(Fee.paid).label("total_paid")
+    ).first()
+    
+    total_amount = float(fee_summary.total_amount or 0)
+    total_paid = float(fee_summary.total_paid or 0)
+    total_balance = total_amount - total_paid
+    payment_rate = (total_paid / total_amount * 100) if total_amount > 0 else 0
+    
+    # Get per-student totals to determine payment status
+    if term or academic_year:
+        student_totals = query.with_entities(
+            func.sum(Fee.amount),
+            func.sum(Fee.paid)
+        ).group_by(Fee.student_id).all()
+    else:
+        # Unfiltered totals are maintained per student in student_accounts
+        student_totals = db.query(
+            StudentAccount.total_billed,
+            StudentAccount.total_paid
+        ).all()
+    
+    student_count = len(student_totals)
+    
+    # Count students by payment status
+    paid_count = 0
+    partial_count = 0
+    unpaid_count = 0
+    
+    for student_total, student_paid in student_totals:
+        student_total = student_total or 0
+        student_paid = student_paid or 0
+        payment_ratio = student_paid / student_total if student_total > 0 else 0
+        
+        if payment_ratio >= 0.99:  # Consider as fully paid (allowing for small rounding errors)
+            paid_count += 1
+        elif payment_ratio > 0:
+            partial_count += 1
+        else:
+            unpaid_count += 1
+    
+    return {
+        "total_amount": total_amount,
+        "total_paid": total_paid,
+        "total_balance": total_balance,
+        "payment_rate": payment_rate,
+        "student_count": student_count,
+        "paid_count": paid_count,
+        "partial_count": partial_count,
+        "unpaid_count": unpaid_count
+    }
+
+def get_fee_summary_data(db: Session, term: Optional[str] = None, academic_year: Optional[str] = None) -> Dict[str, Any]:
+    """Get the fee summary for (term, academic_year), computing it on a cache miss"""
+    summary = fee_summary_cache.get_or_compute(
+        (term or None, academic_year or None),
+        lambda: compute_fee_summary(db, term, academic_year)
+    )
+    # Hand out a copy so callers can't mutate the cached entry
+    return dict(summary)
+
+def get_fee_totals(db: Session, term: Optional[str] = None, academic_year: Optional[str] = None) -> Dict[str, float]:
+    """Get just the amount totals used by the dashboard financial blocks"""
+    summary = get_fee_summary_data(db, term, academic_year)
+    return {
+        "total_amount": summary["total_amount"],
+        "total_paid": summary["total_paid"],
+        "total_balance": summary["total_balance"],
+        "payment_rate": summary["payment_rate"]
+    }
+
+def invalidate_fee_caches():
+    """Call after committing any fee create, update or payment"""
+    invalidate_group("fees")
+    # Calendar months show each day's fee totals
+    invalidate_group("calendar")
+
+def fee_cache_stats():
+    return group_stats("fees")
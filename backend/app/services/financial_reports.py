@@ -0,0 +1,219 @@
+# backend/app/services/financial_reports.py
+import os
+import csv
+import uuid
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import func, distinct
+from sqlalchemy.orm import Session
+
+from ..models.student import Student, Class, student_class
+from ..models.fee import Fee
+from .database import SessionLocal
+from ..utils.export_utils import iter_csv, stream_query_rows
+
+# openpyxl is optional; only XLSX output needs it
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+logger = logging.getLogger(__name__)
+
+# Where finished background reports are written
+REPORTS_DIR = os.path.join(tempfile.gettempdir(), "school_reports")
+
+# Finished reports, and their job records, are deleted this long after completing
+REPORT_RETENTION_SECONDS = 24 * 60 * 60
+
+# How often the cleanup job looks for expired reports
+REPORT_CLEANUP_INTERVAL_SECONDS = 60 * 60
+
+# Background reports are rendered off the request thread, a couple at a time
+report_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report")
+
+STATEMENT_COLUMNS = {
+    "student": ["student_id", "admission_number", "student_name", "fee_count", "billed", "collected", "outstanding"],
+    "class": ["class_id", "class_name", "grade_level", "student_count", "billed", "collected", "outstanding"],
+}
+
+def statement_query(
+    db: Session,
+    group_by: str,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """Build the billed / collected / outstanding statement grouped by student or class"""
+    billed = func.coalesce(func.sum(Fee.amount), 0)
+    collected = func.coalesce(func.sum(Fee.paid), 0)
+    outstanding = func.coalesce(func.sum(Fee.amount - Fee.paid), 0)
+
+    if group_by == "class":
+        # A student enrolled in several classes counts towards each of them
+        query = db.query(
+            Class.id,
+            Class.name,
+            Class.grade_level,
+            func.count(distinct(Fee.student_id)),
+            billed,
+            collected,
+            outstanding
+        ).join(
+            student_class, student_class.c.class_id == Class.id
+        ).join(
+            Fee, Fee.student_id == student_class.c.student_id
+        ).group_by(
+            Class.id, Class.name, Class.grade_level
+        ).order_by(Class.name, Class.id)
+    else:
+        query = db.query(
+            Student.id,
+            Student.admission_number,
+            (Student.first_name + " " + Student.last_name),
+            func.count(Fee.id),
+            billed,
+            collected,
+            outstanding
+        ).join(
+            Fee, Fee.student_id == Student.id
+        ).group_by(
+            Student.id, Student.admission_number, Student.first_name, Student.last_name
+        ).order_by(Student.last_name, Student.first_name, Student.id)
+
+    if term:
+        query = query.filter(Fee.term == term)
+
+    if academic_year:
+        query = query.filter(Fee.academic_year == academic_year)
+
+    if start_date:
+        query = query.filter(Fee.due_date >= start_date)
+
+    if end_date:
+        query = query.filter(Fee.due_date <= end_date)
+
+    return query
+
+def iter_statement_rows(group_by: str, **filters):
+    """Stream statement rows from a server-side cursor in a dedicated session"""
+    return stream_query_rows(SessionLocal, lambda db: statement_query(db, group_by, **filters))
+
+def iter_statement_csv(group_by: str, **filters):
+    return iter_csv(iter_statement_rows(group_by, **filters), STATEMENT_COLUMNS[group_by])
+
+def write_statement_file(path: str, group_by: str, file_format: str, **filters):
+    """Write a statement to disk row by row, as CSV or write-only XLSX"""
+    columns = STATEMENT_COLUMNS[group_by]
+    rows = iter_statement_rows(group_by, **filters)
+
+    if file_format == "xlsx":
+        if Workbook is None:
+            raise RuntimeError("XLSX export requires openpyxl")
+
+        # Write-only mode flushes rows to disk instead of building the sheet in memory
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=f"By {group_by}")
+        sheet.append(columns)
+        for row in rows:
+            sheet.append(list(row))
+        workbook.save(path)
+        return
+
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([value.isoformat() if isinstance(value, date) else value for value in row])
+
+# In-process registry of background report jobs, keyed by job id
+report_jobs: Dict[str, Dict] = {}
+report_jobs_lock = threading.Lock()
+
+def _run_report_job(job_id: str):
+    with report_jobs_lock:
+        job = report_jobs[job_id]
+        job["status"] = "running"
+
+    try:
+        write_statement_file(job["path"], job["group_by"], job["format"], **job["filters"])
+        status, error = "completed", None
+    except Exception as e:
+        logger.exception("Report job %s failed", job_id)
+        status, error = "failed", str(e)
+
+    with report_jobs_lock:
+        job["status"] = status
+        job["error"] = error
+        job["finished_at"] = datetime.now()
+
+def submit_statement_job(group_by: str, file_format: str, requested_by: int, **filters) -> Dict:
+    """Queue a statement export and return its job record"""
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    job_id = uuid.uuid4().hex
+
+    job = {
+        "id": job_id,
+        "status": "queued",
+        "group_by": group_by,
+        "format": file_format,
+        "filters": filters,
+        "requested_by": requested_by,
+        "path": os.path.join(REPORTS_DIR, f"statement-{job_id}.{file_format}"),
+        "error": None,
+        "created_at": datetime.now(),
+        "finished_at": None,
+    }
+
+    with report_jobs_lock:
+        report_jobs[job_id] = job
+
+    report_executor.submit(_run_report_job, job_id)
+    return job
+
+def get_report_job(job_id: str) -> Optional[Dict]:
+    with report_jobs_lock:
+        job = report_jobs.get(job_id)
+        return dict(job) if job else None
+
+def prune_report_jobs(now: Optional[datetime] = None) -> int:
+    """Forget jobs finished before the retention window and delete expired report files
+
+    Files are matched by age rather than by job, so reports left behind by
+    an earlier process (whose registry is gone) are removed too; files of
+    queued or running jobs are never touched. Returns the files deleted.
+    """
+    cutoff = (now or datetime.now()) - timedelta(seconds=REPORT_RETENTION_SECONDS)
+
+    with report_jobs_lock:
+        for job_id in [job_id for job_id, job in report_jobs.items() if job["finished_at"] and job["finished_at"] < cutoff]:
+            del report_jobs[job_id]
+        live_paths = {job["path"] for job in report_jobs.values()}
+
+    if not os.path.isdir(REPORTS_DIR):
+        return 0
+
+    removed = 0
+    for name in os.listdir(REPORTS_DIR):
+        path = os.path.join(REPORTS_DIR, name)
+        if path in live_paths:
+            continue
+        try:
+            if datetime.fromtimestamp(os.path.getmtime(path)) < cutoff:
+                os.remove(path)
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+def run_report_cleanup():
+    """Scheduled entry point: prune expired background reports"""
+    removed = prune_report_jobs()
+    if removed:
+        logger.info("Deleted %s expired report files", removed)
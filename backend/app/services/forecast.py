@@ -0,0 +1,183 @@
+# backend/app/services/forecast.py
+from datetime import date, timedelta
+from typing import Any, Dict
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from ..models.student import Student
+from ..models.fee import Fee, FeePayment
+from ..utils.sql_dates import days_between
+from .cache import ResultCache
+from .database import SessionLocal
+
+# NumPy is optional; only the forecast needs it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The scheduler warms the inputs this often, so the first request after a
+# payment (or after midnight) usually only runs the projection
+FORECAST_REFRESH_INTERVAL_SECONDS = 5 * 60
+
+# Inputs for today, kept until the next fee write or payment clears the "fees" group
+forecast_inputs_cache = ResultCache("cash_flow_forecast_inputs", max_entries=1, group="fees")
+
+# Projections from the current inputs, cleared with them
+forecast_cache = ResultCache("cash_flow_forecast", group="fees")
+
+# Delay assumed when no family has any payment history yet
+DEFAULT_DELAY_DAYS = 14.0
+
+# How many payments of school-wide history a family's own history is blended with
+PRIOR_WEIGHT = 3.0
+
+# Probability of collection falls linearly with typical delay, within these bounds
+DELAY_FOR_ZERO_PROBABILITY = 180.0
+MIN_PROBABILITY = 0.2
+MAX_PROBABILITY = 0.98
+
+# Fees already later than their family usually pays are expected within a
+# week, with probability decaying the further past expectation they are
+STALE_RESCHEDULE_DAYS = 7
+STALE_DECAY_DAYS = 60.0
+
+def load_forecast_inputs(db: Session) -> Dict[str, Any]:
+    """Load open fees and per-family payment delays in three narrow queries
+    
+    Neither fee query joins students: open fees are read from the
+    ix_fees_unpaid_due_date columns and delays are summed per student,
+    then both are mapped to families with one sorted lookup in NumPy.
+    """
+    open_fees = db.execute(
+        select(Fee.due_date, Fee.amount - Fee.paid, Fee.student_id).where(Fee.amount > Fee.paid)
+    ).all()
+    
+    delay = days_between(db, FeePayment.paid_at, Fee.due_date)
+    history = db.execute(
+        select(FeePayment.student_id, func.sum(delay), func.count(FeePayment.id))
+        .join(Fee, Fee.id == FeePayment.fee_id)
+        .where(Fee.due_date.isnot(None), FeePayment.paid_at.isnot(None))
+        .group_by(FeePayment.student_id)
+    ).all()
+    
+    families = db.execute(select(Student.id, Student.parent_id).order_by(Student.id)).all()
+    family_student = np.array([student_id for student_id, _ in families], dtype=np.int64)
+    family_parent = np.array([parent_id or 0 for _, parent_id in families], dtype=np.int64)
+    
+    def family_of(student_ids):
+        # Students without a row (or without a parent) fall into family 0
+        if not len(family_student):
+            return np.zeros_like(student_ids)
+        position = np.clip(np.searchsorted(family_student, student_ids), 0, len(family_student) - 1)
+        return np.where(family_student[position] == student_ids, family_parent[position], 0)
+    
+    today_ordinal = date.today().toordinal()
+    count = len(open_fees)
+    
+    history_student = np.array([student_id or 0 for student_id, _, _ in history], dtype=np.int64)
+    history_total = np.array([float(total or 0) for _, total, _ in history], dtype=np.float64)
+    history_payments = np.array([n for _, _, n in history], dtype=np.float64)
+    history_family, slot = np.unique(family_of(history_student), return_inverse=True)
+    # astype: bincount of an empty history comes back as integers
+    history_count = np.bincount(slot, weights=history_payments, minlength=len(history_family)).astype(np.float64)
+    history_delay = np.bincount(slot, weights=history_total, minlength=len(history_family)).astype(np.float64)
+    
+    return {
+        "due": np.fromiter(
+            (due.toordinal() if due else today_ordinal for due, _, _ in open_fees), dtype=np.int64, count=count
+        ),
+        "balance": np.fromiter((balance or 0.0 for _, balance, _ in open_fees), dtype=np.float64, count=count),
+        "family": family_of(np.fromiter((student_id or 0 for _, _, student_id in open_fees), dtype=np.int64, count=count)),
+        "history_family": history_family,
+        "history_delay": np.divide(
+            history_delay, history_count, out=np.zeros_like(history_delay), where=history_count > 0
+        ),
+        "history_count": history_count,
+    }
+
+def project_weekly_collections(inputs: Dict[str, Any], today: date, weeks: int) -> Dict[str, Any]:
+    """Project expected collections per week with one vectorized pass over all fees"""
+    due = inputs["due"]
+    balance = inputs["balance"]
+    family = inputs["family"]
+    history_family = inputs["history_family"]
+    history_delay = inputs["history_delay"]
+    history_count = inputs["history_count"]
+    today_ordinal = today.toordinal()
+    
+    # School-wide average delay is the prior every family is shrunk towards
+    if history_count.sum() > 0:
+        prior_delay = float(np.average(history_delay, weights=history_count))
+    else:
+        prior_delay = DEFAULT_DELAY_DAYS
+    
+    # Look up each fee's family history with a sorted search instead of a dict
+    order = np.argsort(history_family)
+    sorted_family = history_family[order]
+    position = np.clip(np.searchsorted(sorted_family, family), 0, max(len(sorted_family) - 1, 0))
+    if len(sorted_family):
+        found = sorted_family[position] == family
+        family_delay = np.where(found, history_delay[order][position], 0.0)
+        family_count = np.where(found, history_count[order][position], 0.0)
+    else:
+        family_delay = np.zeros_like(balance)
+        family_count = np.zeros_like(balance)
+    
+    delay = (family_count * family_delay + PRIOR_WEIGHT * prior_delay) / (family_count + PRIOR_WEIGHT)
+    probability = np.clip(1.0 - delay / DELAY_FOR_ZERO_PROBABILITY, MIN_PROBABILITY, MAX_PROBABILITY)
+    
+    expected = due + np.rint(delay).astype(np.int64)
+    stale_days = np.maximum(today_ordinal - expected, 0)
+    probability = probability * np.exp(-stale_days / STALE_DECAY_DAYS)
+    expected = np.where(stale_days > 0, today_ordinal + STALE_RESCHEDULE_DAYS, expected)
+    
+    week = (expected - today_ordinal) // 7
+    in_horizon = week < weeks
+    expected_amount = balance * probability
+    
+    projected = np.bincount(week[in_horizon], weights=expected_amount[in_horizon], minlength=weeks)
+    fee_counts = np.bincount(week[in_horizon], minlength=weeks)
+    
+    return {
+        "as_of": today,
+        "weeks": [
+            {
+                "week_start": today + timedelta(days=7 * index),
+                "projected_amount": round(float(projected[index]), 2),
+                "fee_count": int(fee_counts[index])
+            }
+            for index in range(weeks)
+        ],
+        "open_balance": round(float(balance.sum()), 2),
+        "projected_total": round(float(projected.sum()), 2),
+        "beyond_horizon": round(float(expected_amount[~in_horizon].sum()), 2),
+        "fee_count": int(len(balance)),
+        "prior_delay_days": round(prior_delay, 1)
+    }
+
+def current_forecast_inputs(db: Session) -> Dict[str, Any]:
+    """Get today's inputs, loading them if a fee write or payment has cleared them"""
+    return forecast_inputs_cache.get_or_compute(date.today(), lambda: load_forecast_inputs(db))
+
+def refresh_forecast_inputs(db: Session):
+    """Warm the inputs cache; a no-op while the cached inputs are still current"""
+    current_forecast_inputs(db)
+
+def run_forecast_refresh():
+    """Scheduled entry point: warm the forecast inputs"""
+    if np is None:
+        return
+    db = SessionLocal()
+    try:
+        refresh_forecast_inputs(db)
+    finally:
+        db.close()
+
+def get_cash_flow_forecast(db: Session, weeks: int) -> Dict[str, Any]:
+    """Get the weekly forecast, reusing today's inputs until the next fee write or payment"""
+    today = date.today()
+    return forecast_cache.get_or_compute(
+        (today, weeks), lambda: project_weekly_collections(current_forecast_inputs(db), today, weeks)
+    )
@@ -0,0 +1,213 @@
+# backend/app/services/invoices.py
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.student import Student, student_class
+from ..models.fee import Fee
+from ..utils.pdf_utils import build_text_pdf
+from ..utils.export_utils import stream_query_rows
+from .database import SessionLocal
+
+# Bump when the invoice layout changes so cached PDFs are re-rendered
+INVOICE_LAYOUT_VERSION = 1
+
+# Rendered invoices are stored by content hash and reused across requests
+INVOICE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "school_invoices")
+
+# Batches smaller than this render inline; the pool start-up isn't worth it
+POOL_THRESHOLD = 20
+
+# Streamed batches are rendered this many invoices at a time
+RENDER_CHUNK_SIZE = 200
+
+SCHOOL_NAME = "Downtown Nursery School"
+SCHOOL_MOTTO = "We shall reach the shore"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 2)
+        return _pool
+
+def invoice_query(
+    db: Session,
+    student_ids: Optional[List[int]] = None,
+    class_id: Optional[int] = None,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None
+):
+    """One Fee/Student join for many students, ordered student by student"""
+    query = db.query(
+        Student.id,
+        Student.first_name,
+        Student.last_name,
+        Student.admission_number,
+        Fee.id,
+        Fee.description,
+        Fee.due_date,
+        Fee.amount,
+        Fee.paid,
+        Fee.term,
+        Fee.academic_year
+    ).join(Fee, Fee.student_id == Student.id)
+
+    if student_ids is not None:
+        query = query.filter(Student.id.in_(student_ids))
+
+    if class_id is not None:
+        query = query.filter(
+            Student.id.in_(select(student_class.c.student_id).where(student_class.c.class_id == class_id))
+        )
+
+    if term:
+        query = query.filter(Fee.term == term)
+
+    if academic_year:
+        query = query.filter(Fee.academic_year == academic_year)
+
+    return query.order_by(Student.last_name, Student.first_name, Student.id, Fee.due_date, Fee.id)
+
+def group_invoices(rows: Iterable, term: Optional[str] = None, academic_year: Optional[str] = None) -> Iterator[Dict]:
+    """Fold invoice_query rows into invoices, holding one student at a time"""
+    for student_id, student_rows in groupby(rows, key=lambda row: row[0]):
+        student_rows = list(student_rows)
+        first = student_rows[0]
+        lines = [
+            {
+                "fee_id": row[4],
+                "description": row[5],
+                "due_date": row[6].isoformat() if row[6] else None,
+                "amount": float(row[7] or 0),
+                "paid": float(row[8] or 0),
+                "balance": float((row[7] or 0) - (row[8] or 0)),
+            }
+            for row in student_rows
+        ]
+        yield {
+            "student_id": student_id,
+            "student_name": f"{first[1]} {first[2]}",
+            "admission_number": first[3],
+            "term": term,
+            "academic_year": academic_year,
+            "lines": lines,
+            "total_amount": sum(line["amount"] for line in lines),
+            "total_paid": sum(line["paid"] for line in lines),
+            "total_balance": sum(line["balance"] for line in lines),
+        }
+
+def load_invoices(
+    db: Session,
+    student_ids: Optional[List[int]] = None,
+    class_id: Optional[int] = None,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None
+) -> List[Dict]:
+    """Load invoice data for a few students with a single Fee/Student join"""
+    rows = invoice_query(db, student_ids, class_id, term, academic_year).all()
+    return list(group_invoices(rows, term, academic_year))
+
+def iter_invoices(
+    class_id: Optional[int] = None,
+    term: Optional[str] = None,
+    academic_year: Optional[str] = None
+) -> Iterator[Dict]:
+    """Invoices for a class or the whole school, read from a server-side cursor in a session owned by the stream"""
+    rows = stream_query_rows(SessionLocal, lambda db: invoice_query(db, None, class_id, term, academic_year))
+    return group_invoices(rows, term, academic_year)
+
+def invoice_hash(invoice: Dict) -> str:
+    """Hash everything that appears on the invoice, plus the layout version"""
+    payload = json.dumps({"layout": INVOICE_LAYOUT_VERSION, "invoice": invoice}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def invoice_cache_path(digest: str) -> str:
+    return os.path.join(INVOICE_CACHE_DIR, digest[:2], f"{digest}.pdf")
+
+def invoice_filename(invoice: Dict) -> str:
+    return f"invoice-{invoice['admission_number'] or invoice['student_id']}.pdf"
+
+def render_invoice_pdf(invoice: Dict) -> bytes:
+    """Render one invoice as a PDF document"""
+    period = " ".join(part for part in [invoice["term"], invoice["academic_year"]] if part) or "All terms"
+    lines = [
+        (SCHOOL_NAME, True),
+        (SCHOOL_MOTTO, False),
+        ("", False),
+        ("INVOICE", True),
+        (f"Student: {invoice['student_name']}", False),
+        (f"Admission number: {invoice['admission_number']}", False),
+        (f"Period: {period}", False),
+        ("", False),
+        (f"{'Description':<34}{'Due':<12}{'Amount':>10}{'Paid':>10}{'Balance':>10}", True),
+    ]
+
+    for line in invoice["lines"]:
+        lines.append((
+            f"{(line['description'] or '')[:32]:<34}{line['due_date'] or '':<12}"
+            f"{line['amount']:>10.2f}{line['paid']:>10.2f}{line['balance']:>10.2f}",
+            False
+        ))
+
+    lines.extend([
+        ("", False),
+        (f"{'Total':<46}{invoice['total_amount']:>10.2f}{invoice['total_paid']:>10.2f}{invoice['total_balance']:>10.2f}", True),
+        (f"Amount due: {invoice['total_balance']:.2f}", True),
+    ])
+
+    return build_text_pdf(lines)
+
+def _render_to_cache(invoice: Dict, path: str) -> str:
+    """Render an invoice into the cache; runs inside pool workers"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pdf = render_invoice_pdf(invoice)
+
+    # Write then rename so readers never see a partially written file
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(pdf)
+    os.replace(temp_path, path)
+    return path
+
+def render_invoices(invoices: List[Dict]) -> List[Tuple[Dict, str]]:
+    """Return the cached PDF path for each invoice, rendering only new content"""
+    results = []
+    missing = []
+
+    for invoice in invoices:
+        path = invoice_cache_path(invoice_hash(invoice))
+        results.append((invoice, path))
+        if not os.path.exists(path):
+            missing.append((invoice, path))
+
+    if len(missing) >= POOL_THRESHOLD:
+        pool = _get_pool()
+        futures = [pool.submit(_render_to_cache, invoice, path) for invoice, path in missing]
+        for future in futures:
+            future.result()
+    else:
+        for invoice, path in missing:
+            _render_to_cache(invoice, path)
+
+    return results
+
+def iter_rendered_invoices(invoices: Iterable[Dict], chunk_size: int = RENDER_CHUNK_SIZE) -> Iterator[Tuple[Dict, str]]:
+    """render_invoices over a stream of invoices, one chunk at a time"""
+    invoices = iter(invoices)
+    while True:
+        chunk = list(islice(invoices, chunk_size))
+        if not chunk:
+            return
+        yield from render_invoices(chunk)
@@ -0,0 +1,189 @@
+# backend/app/services/live_updates.py
+import copy
+import json
+import time
+import asyncio
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func
+
+from ..models.grade import Attendance
+from ..models.fee import FeePayment
+from .database import SessionLocal
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15
+
+# The maintained totals are recomputed from the database at most this often,
+# correcting any drift from writes that bypass the publishers
+RESYNC_SECONDS = 5 * 60
+
+# Events buffered per client before it is sent a fresh snapshot instead
+SUBSCRIBER_QUEUE_SIZE = 100
+
+ATTENDANCE_STATUSES = ["present", "absent", "late", "excused"]
+
+class LiveUpdateHub:
+    """In-process pub/sub for live dashboard figures
+
+    Write paths publish small deltas; the hub applies them to one shared
+    copy of today's totals and fans each event out to every open stream, so
+    N dashboards cost one computation rather than N polling loops.
+    Publishers may run on any thread; each subscriber's queue belongs to the
+    event loop it subscribed from.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._subscribers: Dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._version = 0
+        self._state: Optional[Dict[str, Any]] = None
+        self._loaded_at = 0.0
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _load_state(self) -> Dict[str, Any]:
+        today = date.today()
+        db = self.session_factory()
+        try:
+            counts = dict(
+                db.query(Attendance.status, func.count(Attendance.id))
+                .filter(Attendance.date == today)
+                .group_by(Attendance.status)
+                .all()
+            )
+            total, payments = db.query(
+                func.coalesce(func.sum(FeePayment.amount), 0), func.count(FeePayment.id)
+            ).filter(
+                FeePayment.paid_at >= datetime.combine(today, datetime.min.time())
+            ).one()
+        finally:
+            db.close()
+
+        return {
+            "date": today,
+            "attendance": {status: counts.get(status, 0) for status in ATTENDANCE_STATUSES},
+            "payments_today": {"total": float(total or 0), "count": payments},
+        }
+
+    def _versioned_state(self) -> Tuple[int, Dict[str, Any]]:
+        """The event version and a private copy of today's totals, read together
+
+        Publishers update the shared totals in place, so callers only ever
+        see a copy taken under the lock. The totals are reloaded (and
+        broadcast) first when stale or on a new day.
+        """
+        with self._lock:
+            state = self._state
+            if (
+                state is not None
+                and state["date"] == date.today()
+                and time.monotonic() - self._loaded_at < RESYNC_SECONDS
+            ):
+                return self._version, copy.deepcopy(state)
+
+        state = self._load_state()
+        with self._lock:
+            self._state = state
+            self._loaded_at = time.monotonic()
+        self._publish("snapshot", state)
+        with self._lock:
+            return self._version, copy.deepcopy(self._state)
+
+    def current_state(self) -> Dict[str, Any]:
+        """A copy of today's totals, reloaded (and broadcast) when stale or on a new day"""
+        return self._versioned_state()[1]
+
+    def snapshot_event(self) -> str:
+        """The current totals formatted as an SSE snapshot event"""
+        version, state = self._versioned_state()
+        return format_sse(version, "snapshot", jsonable_encoder(state))
+
+    def _publish(self, event: str, data: Dict[str, Any]):
+        with self._lock:
+            self._version += 1
+            message = (self._version, event, jsonable_encoder(data))
+            subscribers = list(self._subscribers.items())
+
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, message)
+            except RuntimeError:
+                # The subscriber's loop has closed; drop it
+                self.unsubscribe(queue)
+
+    def _deliver(self, queue: asyncio.Queue, message):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A client this far behind gets the current totals instead of the backlog
+            while not queue.empty():
+                queue.get_nowait()
+            # Publishers update the totals in place from other threads
+            with self._lock:
+                snapshot = jsonable_encoder(self._state) if self._state is not None else None
+            if snapshot is not None:
+                queue.put_nowait((message[0], "snapshot", snapshot))
+
+    def attendance_recorded(self, day: date, old_status: Optional[str], new_status: str):
+        """Publish a change to one student's attendance"""
+        if day != date.today() or old_status == new_status:
+            return
+
+        changes = {new_status: 1}
+        if old_status:
+            changes[old_status] = -1
+
+        counts = None
+        with self._lock:
+            if self._state is not None and self._state["date"] == day:
+                attendance = self._state["attendance"]
+                for status, delta in changes.items():
+                    attendance[status] = attendance.get(status, 0) + delta
+                counts = dict(attendance)
+
+        self._publish("attendance", {"date": day, "changes": changes, "counts": counts})
+
+    def payment_recorded(self, amount: float):
+        """Publish a payment dated now"""
+        if amount <= 0:
+            return
+
+        totals = None
+        with self._lock:
+            if self._state is not None and self._state["date"] == date.today():
+                payments_today = self._state["payments_today"]
+                payments_today["total"] += amount
+                payments_today["count"] += 1
+                totals = dict(payments_today)
+
+        self._publish("payment", {"amount": amount, "payments_today": totals})
+
+    def resync(self):
+        """Reload the totals now and broadcast them, after a bulk write"""
+        with self._lock:
+            if self._state is None and not self._subscribers:
+                return
+            self._loaded_at = 0.0
+        self.current_state()
+
+live_updates = LiveUpdateHub()
+
+def format_sse(version: int, event: str, data: Dict[str, Any]) -> str:
+    return f"id: {version}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
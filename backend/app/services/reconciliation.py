@@ -0,0 +1,296 @@
+# backend/app/services/reconciliation.py
+import re
+import csv
+import uuid
+import hashlib
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from sqlalchemy import update, case, bindparam
+from sqlalchemy.orm import Session
+
+from ..models.student import Student
+from ..models.fee import Fee, FeePayment, UnmatchedBankLine, ImportedBankLine
+from .fee_accounts import refresh_student_accounts
+
+# Fee references are quoted as FEE-<id> (FEE 12, FEE12 and fee-12 also match)
+FEE_REFERENCE_PATTERN = re.compile(r"\bFEE[-\s]?(\d+)\b")
+
+# Candidate admission numbers: runs of letters, digits, "/" and "-"
+TOKEN_PATTERN = re.compile(r"[A-Z0-9/\-]+")
+
+# Header aliases accepted for each statement column
+COLUMN_ALIASES = {
+    "date": ["date", "transaction date", "value date", "posting date"],
+    "amount": ["amount", "credit", "paid in", "deposit"],
+    "reference": ["reference", "description", "narrative", "details", "memo"],
+}
+
+# Money is compared in cents to avoid float drift while allocating
+def _cents(value: float) -> int:
+    return int(round((value or 0) * 100))
+
+def iter_statement_lines(handle: TextIO) -> Iterator[Dict[str, str]]:
+    """Read a bank CSV row by row, mapping its headers onto date/amount/reference"""
+    reader = csv.DictReader(handle)
+    headers = {(name or "").strip().lower(): name for name in (reader.fieldnames or [])}
+
+    columns = {}
+    for column, aliases in COLUMN_ALIASES.items():
+        columns[column] = next((headers[alias] for alias in aliases if alias in headers), None)
+
+    if columns["amount"] is None or columns["reference"] is None:
+        raise ValueError("Statement needs an amount column and a reference/description column")
+
+    for row in reader:
+        yield {
+            "date": (row.get(columns["date"]) or "").strip() if columns["date"] else "",
+            "amount": (row.get(columns["amount"]) or "").strip(),
+            "reference": (row.get(columns["reference"]) or "").strip(),
+        }
+
+def _parse_amount(text: str) -> Optional[int]:
+    cleaned = re.sub(r"[^0-9.\-]", "", text or "")
+    try:
+        return _cents(float(cleaned))
+    except ValueError:
+        return None
+
+# Statement date formats tried in order; unparseable dates fall back to the import time
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d %b %Y"]
+
+def _parse_date(text: str, default: datetime) -> datetime:
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return default
+
+# Statement lines are fingerprinted, checked against imported_bank_lines and
+# written this many at a time, so memory stays flat however long the statement
+IMPORT_BATCH_SIZE = 500
+
+def line_fingerprints(lines: Iterable[Dict[str, str]]) -> Iterator[tuple]:
+    """Yield (line number, line, hash) with a hash that is stable across re-imports
+
+    Identical lines within one statement are legitimate (two equal payments on
+    the same day), so each hash includes how many times that line has already
+    appeared in the statement. Occurrences are counted by a short digest of
+    the line rather than the line itself.
+    """
+    seen: Dict[bytes, int] = {}
+    for line_number, line in enumerate(lines, start=2):
+        key = (line["date"], re.sub(r"\s+", " ", line["amount"]), re.sub(r"\s+", " ", line["reference"]).upper())
+        key_digest = hashlib.blake2b("\x1f".join(key).encode(), digest_size=16).digest()
+        occurrence = seen.get(key_digest, 0)
+        seen[key_digest] = occurrence + 1
+        digest = hashlib.sha256("\x1f".join(key + (str(occurrence),)).encode()).hexdigest()
+        yield line_number, line, digest
+
+def _already_imported(db: Session, hashes: List[str]) -> set:
+    return {
+        line_hash for (line_hash,) in
+        db.query(ImportedBankLine.line_hash).filter(ImportedBankLine.line_hash.in_(hashes)).all()
+    }
+
+class ReconciliationIndex:
+    """Hash indexes over open fees, built once per import
+
+    The open fees stay locked (SELECT ... FOR UPDATE, in id order) until the
+    import commits, so a payment recorded meanwhile waits instead of being
+    allocated against stale balances.
+    """
+
+    def __init__(self, db: Session):
+        # admission number -> student id
+        self.students_by_admission = {
+            (admission_number or "").upper(): student_id
+            for student_id, admission_number in db.query(Student.id, Student.admission_number).all()
+            if admission_number
+        }
+
+        # fee id -> mutable fee state, and student id -> open fees oldest first
+        self.open_fees: Dict[int, Dict] = {}
+        self.open_fees_by_student: Dict[int, List[Dict]] = {}
+
+        open_fees = db.query(
+            Fee.id, Fee.student_id, Fee.amount, Fee.paid, Fee.due_date
+        ).filter(
+            Fee.amount > Fee.paid
+        ).order_by(Fee.id).with_for_update().all()
+
+        # Each student's fees oldest first; undated fees last
+        open_fees.sort(key=lambda row: (row[1] or 0, row[4] is None, row[4] or date.min, row[0]))
+
+        for fee_id, student_id, amount, paid, _ in open_fees:
+            state = {
+                "id": fee_id,
+                "student_id": student_id,
+                "amount": _cents(amount),
+                "paid": _cents(paid),
+                "applied": 0,
+            }
+            self.open_fees[fee_id] = state
+            self.open_fees_by_student.setdefault(student_id, []).append(state)
+
+    def match(self, reference: str):
+        """Return (fees to allocate to, student id) for a statement reference"""
+        text = reference.upper()
+
+        for fee_id in FEE_REFERENCE_PATTERN.findall(text):
+            fee = self.open_fees.get(int(fee_id))
+            if fee:
+                # The quoted fee first, then the family's other open fees
+                others = [
+                    other for other in self.open_fees_by_student.get(fee["student_id"], [])
+                    if other["id"] != fee["id"]
+                ]
+                return [fee] + others, fee["student_id"]
+
+        for token in TOKEN_PATTERN.findall(text):
+            student_id = self.students_by_admission.get(token)
+            if student_id is not None:
+                return self.open_fees_by_student.get(student_id, []), student_id
+
+        return None, None
+
+def _allocate(fees: List[Dict], amount: int) -> List[tuple]:
+    """Spread a payment over fees in order and return (fee, cents applied) pairs"""
+    remaining = amount
+    allocations = []
+    for fee in fees:
+        if remaining <= 0:
+            break
+        due = fee["amount"] - fee["paid"]
+        if due <= 0:
+            continue
+        applied = min(due, remaining)
+        fee["paid"] += applied
+        fee["applied"] += applied
+        remaining -= applied
+        allocations.append((fee, applied))
+    return allocations
+
+def reconcile_bank_statement(db: Session, lines: Iterable[Dict[str, str]], recorded_by: Optional[int] = None) -> Dict:
+    """Match statement lines to fees, apply payments in bulk and queue the rest
+
+    Lines are read, checked and written IMPORT_BATCH_SIZE at a time. Lines
+    imported before (by an earlier upload of the same or an overlapping
+    statement) are skipped. Their fingerprints are unique in
+    imported_bank_lines, so two concurrent imports of one file cannot both
+    commit. Runs in one transaction; the caller commits.
+    """
+    import_id = uuid.uuid4().hex
+    index = ReconciliationIndex(db)
+    now = datetime.now()
+
+    unmatched = []
+    payments = []
+    summary = {
+        "import_id": import_id,
+        "lines": 0,
+        "matched_lines": 0,
+        "unmatched_lines": 0,
+        "amount_applied": 0.0,
+        "amount_unmatched": 0.0,
+        "fees_updated": 0,
+        "duplicate_lines": 0,
+    }
+
+    def queue(line_number, line, amount, reason):
+        unmatched.append({
+            "import_id": import_id,
+            "line_number": line_number,
+            "transaction_date": line["date"],
+            "amount": amount / 100 if amount is not None else None,
+            "reference": line["reference"],
+            "reason": reason,
+            "status": "pending",
+            "created_at": now,
+        })
+        summary["unmatched_lines"] += 1
+        summary["amount_unmatched"] += (amount or 0) / 100
+
+    def flush():
+        if payments:
+            db.bulk_insert_mappings(FeePayment, payments)
+        if unmatched:
+            db.bulk_insert_mappings(UnmatchedBankLine, unmatched)
+        if imported:
+            db.bulk_insert_mappings(ImportedBankLine, imported)
+        payments.clear()
+        unmatched.clear()
+        imported.clear()
+
+    imported = []
+    fingerprints = line_fingerprints(lines)
+    while True:
+        batch = list(islice(fingerprints, IMPORT_BATCH_SIZE))
+        if not batch:
+            break
+        already_imported = _already_imported(db, [digest for _, _, digest in batch])
+
+        for line_number, line, digest in batch:
+            summary["lines"] += 1
+            if digest in already_imported:
+                summary["duplicate_lines"] += 1
+                continue
+            imported.append({"line_hash": digest, "import_id": import_id, "line_number": line_number, "imported_at": now})
+
+            amount = _parse_amount(line["amount"])
+
+            if amount is None or amount <= 0:
+                queue(line_number, line, amount, "invalid amount")
+                continue
+
+            fees, student_id = index.match(line["reference"])
+            if student_id is None:
+                queue(line_number, line, amount, "no match")
+                continue
+
+            if not fees:
+                queue(line_number, line, amount, "no open fees")
+                continue
+
+            allocations = _allocate(fees, amount)
+            left_over = amount - sum(applied for _, applied in allocations)
+            summary["matched_lines"] += 1
+
+            paid_at = _parse_date(line["date"], now)
+            for fee, applied in allocations:
+                payments.append({
+                    "fee_id": fee["id"],
+                    "student_id": fee["student_id"],
+                    "amount": applied / 100,
+                    "paid_at": paid_at,
+                    "method": "bank",
+                    "reference": line["reference"],
+                    "recorded_by": recorded_by,
+                })
+            summary["amount_applied"] += (amount - left_over) / 100
+
+            if left_over > 0:
+                queue(line_number, line, left_over, "overpayment")
+
+        flush()
+
+    # Add what was applied to each touched fee in one executemany UPDATE,
+    # relative to the stored value rather than overwriting it
+    changed = [fee for fee in index.open_fees.values() if fee["applied"]]
+    if changed:
+        applied = bindparam("applied")
+        paid = Fee.__table__.c.paid + applied
+        db.connection().execute(
+            update(Fee.__table__).where(Fee.__table__.c.id == bindparam("fee_id")).values(
+                paid=paid,
+                # Half a cent of slack, as amounts are compared in cents elsewhere
+                status=case((paid + 0.005 >= Fee.__table__.c.amount, "paid"), else_="partial"),
+            ),
+            [{"fee_id": fee["id"], "applied": fee["applied"] / 100} for fee in changed]
+        )
+        refresh_student_accounts(db, {fee["student_id"] for fee in changed})
+
+    summary["fees_updated"] = len(changed)
+    return summary
@@ -0,0 +1,193 @@
+# backend/app/services/risk_scoring.py
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import func, case, delete, insert
+from sqlalchemy.orm import Session
+
+from ..models.student import Student
+from ..models.grade import Grade, Attendance
+from ..models.fee import StudentAccount
+from ..models.risk import StudentRiskScore
+from ..utils.sql_dates import days_between
+from .database import SessionLocal
+
+# NumPy is optional; without it the scoring job is skipped
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# The job runs daily; the first run happens at start-up
+RISK_SCORING_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Look-back windows for attendance and grade trends
+ATTENDANCE_WINDOW_DAYS = 90
+GRADE_WINDOW_DAYS = 365
+
+# Weights of the three components in the composite score
+WEIGHTS = {"attendance": 0.4, "grades": 0.35, "fees": 0.25}
+
+# Score thresholds for the reported risk level
+HIGH_RISK_SCORE = 60
+MEDIUM_RISK_SCORE = 35
+
+def load_risk_inputs(db: Session, today: date) -> Dict[str, "np.ndarray"]:
+    """Pull per-student attendance, grade trend and balance with three aggregate queries"""
+    # Every student, with their fee balance and oldest unpaid due date
+    accounts = db.query(
+        Student.id,
+        func.coalesce(StudentAccount.balance, 0),
+        StudentAccount.oldest_unpaid_due_date
+    ).outerjoin(StudentAccount, StudentAccount.student_id == Student.id).order_by(Student.id).all()
+    
+    attended = case((Attendance.status.in_(["present", "late"]), 1), else_=0)
+    attendance = db.query(
+        Attendance.student_id,
+        func.count(Attendance.id),
+        func.sum(attended)
+    ).filter(
+        Attendance.date >= today - timedelta(days=ATTENDANCE_WINDOW_DAYS)
+    ).group_by(Attendance.student_id).all()
+    
+    # Sums for a least-squares line of score against day number
+    window_start = today - timedelta(days=GRADE_WINDOW_DAYS)
+    day = days_between(db, Grade.date_recorded, window_start)
+    grades = db.query(
+        Grade.student_id,
+        func.count(Grade.id),
+        func.sum(day),
+        func.sum(Grade.score),
+        func.sum(day * Grade.score),
+        func.sum(day * day)
+    ).filter(
+        Grade.date_recorded >= window_start,
+        Grade.score.isnot(None)
+    ).group_by(Grade.student_id).all()
+    
+    today_ordinal = today.toordinal()
+    return {
+        "student_id": np.array([row[0] for row in accounts], dtype=np.int64),
+        "balance": np.array([float(row[1] or 0) for row in accounts], dtype=np.float64),
+        "days_overdue": np.array(
+            [max(today_ordinal - row[2].toordinal(), 0) if row[2] else 0 for row in accounts], dtype=np.float64
+        ),
+        "attendance": np.array([(row[0], row[1], row[2] or 0) for row in attendance], dtype=np.float64).reshape(-1, 3),
+        "grades": np.array([[value or 0 for value in row] for row in grades], dtype=np.float64).reshape(-1, 6),
+    }
+
+def _spread(student_ids, keys, values):
+    """Align per-student aggregate values onto the full (sorted) student id array, NaN where missing"""
+    result = np.full(len(student_ids), np.nan, dtype=np.float64)
+    if len(keys):
+        position = np.searchsorted(student_ids, keys)
+        found = (position < len(student_ids)) & (student_ids[np.minimum(position, len(student_ids) - 1)] == keys)
+        result[position[found]] = values[found]
+    return result
+
+def score_students(inputs: Dict[str, "np.ndarray"]) -> Dict[str, "np.ndarray"]:
+    """Compute every student's composite risk score in one vectorized pass"""
+    student_ids = inputs["student_id"]
+    attendance = inputs["attendance"]
+    grades = inputs["grades"]
+    
+    # Attendance: share of sessions attended in the window
+    attendance_rate = _spread(
+        student_ids, attendance[:, 0].astype(np.int64), attendance[:, 2] / np.maximum(attendance[:, 1], 1)
+    )
+    
+    # Grades: average and least-squares slope (points per 30 days)
+    n, sum_x, sum_y, sum_xy, sum_xx = (grades[:, column] for column in range(1, 6))
+    denominator = n * sum_xx - sum_x ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where((n >= 3) & (denominator > 0), (n * sum_xy - sum_x * sum_y) / denominator * 30, np.nan)
+        average = sum_y / n
+    grade_keys = grades[:, 0].astype(np.int64)
+    grade_slope = _spread(student_ids, grade_keys, slope)
+    grade_average = _spread(student_ids, grade_keys, average)
+    
+    # Components in [0, 1]; missing data contributes no risk
+    attendance_risk = np.nan_to_num(np.clip((0.95 - attendance_rate) / 0.35, 0, 1))
+    decline_risk = np.nan_to_num(np.clip(-grade_slope / 10, 0, 1))
+    low_score_risk = np.nan_to_num(np.clip((60 - grade_average) / 30, 0, 1))
+    grade_risk = 0.6 * decline_risk + 0.4 * low_score_risk
+    
+    balance = inputs["balance"]
+    owing = balance[balance > 0]
+    typical_balance = float(np.median(owing)) if len(owing) else 1.0
+    fee_risk = 0.5 * np.clip(balance / (2 * typical_balance), 0, 1) + 0.5 * np.clip(inputs["days_overdue"] / 90, 0, 1)
+    
+    score = 100 * (
+        WEIGHTS["attendance"] * attendance_risk
+        + WEIGHTS["grades"] * grade_risk
+        + WEIGHTS["fees"] * fee_risk
+    )
+    
+    return {
+        "student_id": student_ids,
+        "score": np.round(score, 1),
+        "attendance_rate": attendance_rate,
+        "grade_average": grade_average,
+        "grade_slope": grade_slope,
+        "balance": balance,
+        "days_overdue": inputs["days_overdue"],
+    }
+
+def _optional(value) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
+
+def risk_level(score: float) -> str:
+    if score >= HIGH_RISK_SCORE:
+        return "high"
+    if score >= MEDIUM_RISK_SCORE:
+        return "medium"
+    return "low"
+
+def refresh_risk_scores(db: Session, today: Optional[date] = None) -> int:
+    """Recompute and replace every student's risk score; the caller commits"""
+    today = today or date.today()
+    scores = score_students(load_risk_inputs(db, today))
+    now = datetime.now()
+    
+    rows = [
+        {
+            "student_id": int(student_id),
+            "score": float(score),
+            "risk_level": risk_level(score),
+            "attendance_rate": _optional(attendance_rate),
+            "grade_average": _optional(grade_average),
+            "grade_slope": _optional(grade_slope),
+            "balance": float(balance),
+            "days_overdue": int(days_overdue),
+            "computed_at": now,
+        }
+        for student_id, score, attendance_rate, grade_average, grade_slope, balance, days_overdue in zip(
+            scores["student_id"], scores["score"], scores["attendance_rate"], scores["grade_average"],
+            scores["grade_slope"], scores["balance"], scores["days_overdue"]
+        )
+    ]
+    
+    # Replace the whole table in one transaction so readers never see a mix
+    db.execute(delete(StudentRiskScore))
+    if rows:
+        db.execute(insert(StudentRiskScore), rows)
+    return len(rows)
+
+def run_risk_scoring():
+    """Scheduled entry point: rescore every student in a fresh session"""
+    if np is None:
+        return
+    
+    db = SessionLocal()
+    try:
+        scored = refresh_risk_scores(db)
+        db.commit()
+        logger.info("Scored %d student(s) for risk", scored)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
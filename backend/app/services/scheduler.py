@@ -0,0 +1,59 @@
+# backend/app/services/scheduler.py
+import logging
+import threading
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+class ScheduledJob:
+    """A function run on a fixed interval in its own daemon thread"""
+
+    def __init__(self, name: str, func: Callable[[], None], interval_seconds: float, run_at_start: bool = True):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.run_at_start = run_at_start
+        self.thread = None
+
+    def run_once(self):
+        try:
+            self.func()
+        except Exception:
+            # A failing run must not kill the job; the next interval retries it
+            logger.exception("Scheduled job %s failed", self.name)
+
+class Scheduler:
+    """Minimal in-process scheduler for periodic maintenance jobs"""
+
+    def __init__(self):
+        self.jobs: List[ScheduledJob] = []
+        self._stop = threading.Event()
+
+    def add_job(self, name: str, func: Callable[[], None], interval_seconds: float, run_at_start: bool = True):
+        job = ScheduledJob(name, func, interval_seconds, run_at_start)
+        self.jobs.append(job)
+        return job
+
+    def _loop(self, job: ScheduledJob):
+        if job.run_at_start:
+            job.run_once()
+        while not self._stop.wait(job.interval_seconds):
+            job.run_once()
+
+    def start(self):
+        self._stop.clear()
+        for job in self.jobs:
+            if job.thread is not None and job.thread.is_alive():
+                continue
+            job.thread = threading.Thread(target=self._loop, args=(job,), name=f"job-{job.name}", daemon=True)
+            job.thread.start()
+            logger.info("Scheduled job %s every %ss", job.name, job.interval_seconds)
+
+    def shutdown(self, timeout: float = 5.0):
+        self._stop.set()
+        for job in self.jobs:
+            if job.thread is not None:
+                job.thread.join(timeout)
+                job.thread = None
+
+scheduler = Scheduler()
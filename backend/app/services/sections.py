@@ -0,0 +1,61 @@
+# backend/app/services/sections.py
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# How long a dashboard waits for any one section before degrading it
+SECTION_TIMEOUT_SECONDS = 5.0
+
+# Shared by every dashboard request: enough for a full dashboard at once, and
+# well below the connection pool (DB_POOL_SIZE + DB_MAX_OVERFLOW), so sections,
+# including timed-out ones still finishing, never starve request sessions
+SECTION_WORKERS = 8
+_executor = ThreadPoolExecutor(max_workers=SECTION_WORKERS, thread_name_prefix="dashboard-section")
+
+def _run_in_session(section: Callable[[Session], Any], session_factory) -> Any:
+    db = session_factory()
+    try:
+        return section(db)
+    finally:
+        db.close()
+
+def run_sections(
+    sections: Dict[str, Callable[[Session], Any]],
+    fallbacks: Optional[Dict[str, Any]] = None,
+    timeout: float = SECTION_TIMEOUT_SECONDS,
+    session_factory=SessionLocal
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Run independent query sections concurrently, each with its own session
+
+    Returns the section results and the names of sections that failed or
+    missed the deadline; those take their fallback value instead of
+    failing the whole response. A timed-out section keeps running in the
+    background until its query returns, then closes its session.
+    """
+    fallbacks = fallbacks or {}
+    futures = {
+        name: _executor.submit(_run_in_session, section, session_factory)
+        for name, section in sections.items()
+    }
+    
+    # Sections start together, so one deadline gives each the same budget
+    deadline = time.monotonic() + timeout
+    results = {}
+    degraded = []
+    
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception:
+            logger.warning("Dashboard section %s failed or timed out", name, exc_info=True)
+            results[name] = fallbacks.get(name)
+            degraded.append(name)
+    
+    return results, degraded
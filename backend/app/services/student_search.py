@@ -0,0 +1,230 @@
+# backend/app/services/student_search.py
+import re
+import time
+import logging
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from ..models.student import Student
+from .database import SessionLocal
+from .commit_hooks import after_commit_of_writes
+
+logger = logging.getLogger(__name__)
+
+# The index is rebuilt at most this often even without local writes, picking
+# up changes made by other workers or by bulk imports that skip mapper events
+REBUILD_SECONDS = 5 * 60
+
+# The scheduled refresh runs a little sooner, so searches rarely wait on a rebuild
+REFRESH_INTERVAL_SECONDS = 4 * 60
+
+# Trigram similarity a name must reach to count as a fuzzy match (pg_trgm's default)
+FUZZY_THRESHOLD = 0.3
+
+# Terms shorter than this only prefix-match; fuzzy matching them is mostly noise
+FUZZY_MIN_LENGTH = 3
+
+TERM_PATTERN = re.compile(r"[^\W_]+(?:[-/'][^\W_]+)*")
+
+def normalize(text: Optional[str]) -> str:
+    return (text or "").strip().lower()
+
+def trigrams(token: str) -> Set[str]:
+    """Padded character trigrams, as pg_trgm builds them for a word"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class StudentSearchIndex:
+    """In-memory prefix and trigram index over student names and admission numbers
+    
+    Tokens are kept sorted, so a prefix is a bisect plus a short scan;
+    fuzzy matches compare trigrams against the (much smaller) set of
+    distinct name tokens rather than every student. After a committed
+    student write, or once REBUILD_SECONDS pass, the next search starts a
+    rebuild on a background thread and keeps answering from the current
+    index until the new one is swapped in.
+    """
+    
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._built_at = 0.0
+        self._stale = True
+        self._data: Dict[str, Any] = {}
+    
+    def mark_stale(self):
+        self._stale = True
+    
+    def build(self, db: Session):
+        """Load every student and replace the index
+    
+        The index is one dict swapped in whole, so concurrent searches
+        always see a consistent version:
+          students:      student id -> (first name, last name, admission number, parent id)
+          rank:          student id -> position in (last name, first name) order
+          tokens:        sorted distinct tokens
+          postings:      token -> student ids
+          name_trigrams: trigram -> name tokens containing it (admission numbers are prefix-only)
+        """
+        rows = db.query(
+            Student.id, Student.first_name, Student.last_name, Student.admission_number, Student.parent_id
+        ).all()
+    
+        students = {row[0]: tuple(row[1:]) for row in rows}
+        ordered = sorted(students, key=lambda student_id: (
+            normalize(students[student_id][1]), normalize(students[student_id][0]), student_id
+        ))
+    
+        postings: Dict[str, List[int]] = {}
+        name_tokens = set()
+        for student_id, (first_name, last_name, admission_number, _) in students.items():
+            tokens = set(TERM_PATTERN.findall(normalize(f"{first_name} {last_name}")))
+            name_tokens |= tokens
+            admission = normalize(admission_number)
+            if admission:
+                tokens.add(admission)
+            for token in tokens:
+                postings.setdefault(token, []).append(student_id)
+    
+        name_trigrams: Dict[str, List[str]] = {}
+        for token in name_tokens:
+            for trigram in trigrams(token):
+                name_trigrams.setdefault(trigram, []).append(token)
+    
+        self._data = {
+            "students": students,
+            "rank": {student_id: position for position, student_id in enumerate(ordered)},
+            "tokens": sorted(postings),
+            "postings": postings,
+            "name_trigrams": name_trigrams,
+        }
+    
+    def _is_fresh(self) -> bool:
+        return not self._stale and time.monotonic() - self._built_at < REBUILD_SECONDS
+    
+    def _rebuild(self):
+        # Callers hold the lock. Cleared first, so a write committed during the build triggers another
+        self._stale = False
+        db = self.session_factory()
+        try:
+            self.build(db)
+        finally:
+            db.close()
+        self._built_at = time.monotonic()
+    
+    def _rebuild_in_background(self):
+        # A rebuild already running will do
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._rebuild()
+        except Exception:
+            logger.exception("Student search index rebuild failed")
+        finally:
+            self._lock.release()
+    
+    def ensure_fresh(self, force: bool = False):
+        """Rebuild a stale index, in the background when there is one to serve meanwhile
+        
+        Only the first build, and forced (scheduled) rebuilds, block the caller.
+        """
+        if not force and self._is_fresh():
+            return
+        if not force and self._data:
+            if not self._lock.locked():
+                threading.Thread(target=self._rebuild_in_background, name="student-search-rebuild", daemon=True).start()
+            return
+        with self._lock:
+            if not force and self._is_fresh():
+                return
+            self._rebuild()
+    
+    @staticmethod
+    def _prefix_matches(data: Dict[str, Any], term: str) -> Dict[int, float]:
+        matches: Dict[int, float] = {}
+        tokens, postings = data["tokens"], data["postings"]
+        index = bisect_left(tokens, term)
+        while index < len(tokens) and tokens[index].startswith(term):
+            token = tokens[index]
+            score = 1.0 if token == term else 0.8
+            for student_id in postings[token]:
+                if matches.get(student_id, 0) < score:
+                    matches[student_id] = score
+            index += 1
+        return matches
+    
+    @staticmethod
+    def _fuzzy_matches(data: Dict[str, Any], term: str) -> Dict[int, float]:
+        term_trigrams = trigrams(term)
+        shared: Dict[str, int] = {}
+        for trigram in term_trigrams:
+            for token in data["name_trigrams"].get(trigram, ()):
+                shared[token] = shared.get(token, 0) + 1
+    
+        matches: Dict[int, float] = {}
+        for token, count in shared.items():
+            similarity = count / (len(term_trigrams) + len(trigrams(token)) - count)
+            if similarity < FUZZY_THRESHOLD:
+                continue
+            # Scaled below any prefix match
+            score = 0.6 * similarity
+            for student_id in data["postings"][token]:
+                if matches.get(student_id, 0) < score:
+                    matches[student_id] = score
+        return matches
+    
+    def search(self, query: str, limit: int = 20, parent_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Students matching every term of the query, best matches first
+    
+        A term matches a name or admission number it prefixes; terms of
+        FUZZY_MIN_LENGTH or more also match similarly spelt names.
+        """
+        terms = TERM_PATTERN.findall(normalize(query))
+        if not terms:
+            return []
+    
+        self.ensure_fresh()
+        data = self._data
+        scores: Optional[Dict[int, float]] = None
+        for term in terms:
+            matches = self._prefix_matches(data, term)
+            if len(term) >= FUZZY_MIN_LENGTH:
+                for student_id, score in self._fuzzy_matches(data, term).items():
+                    if matches.get(student_id, 0) < score:
+                        matches[student_id] = score
+    
+            if scores is None:
+                scores = matches
+            else:
+                scores = {student_id: scores[student_id] + score for student_id, score in matches.items() if student_id in scores}
+            if not scores:
+                return []
+    
+        students = data["students"]
+        if parent_id is not None:
+            scores = {student_id: score for student_id, score in scores.items() if students[student_id][3] == parent_id}
+    
+        rank = data["rank"]
+        best = sorted(scores, key=lambda student_id: (-scores[student_id], rank[student_id]))[:limit]
+        return [
+            {
+                "id": student_id,
+                "first_name": students[student_id][0],
+                "last_name": students[student_id][1],
+                "admission_number": students[student_id][2],
+                "score": round(scores[student_id] / len(terms), 3)
+            }
+            for student_id in best
+        ]
+
+student_search_index = StudentSearchIndex()
+
+def run_search_index_refresh():
+    """Scheduled entry point: rebuild the student search index"""
+    student_search_index.ensure_fresh(force=True)
+
+# The index goes stale once a session that wrote students commits
+after_commit_of_writes("student_search_dirty", (Student,), student_search_index.mark_stale)
@@ -0,0 +1,77 @@
+# backend/app/services/teacher_directory.py
+import os
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session, selectinload
+
+from ..models.user import User
+from ..models.student import Teacher, Class
+from ..utils.fieldsets import load_columns, pick
+from .cache import ResultCache, invalidate_group
+from .commit_hooks import after_commit_of_writes
+
+# Seconds a directory page is kept; set TEACHER_DIRECTORY_CACHE_SECONDS=0 to disable
+TEACHER_DIRECTORY_CACHE_SECONDS = float(os.environ.get("TEACHER_DIRECTORY_CACHE_SECONDS", 5 * 60))
+
+teacher_directory_cache = ResultCache(
+    "teacher_directory", ttl_seconds=TEACHER_DIRECTORY_CACHE_SECONDS, max_entries=256, group="directory"
+)
+
+TEACHER_COLUMNS = ["id", "specialization", "user_id"]
+TEACHER_RELATIONS = ["user", "classes"]
+
+USER_FIELDS = ["id", "username", "email", "full_name", "role", "is_active"]
+CLASS_FIELDS = ["id", "name", "grade_level"]
+
+def teacher_entry(teacher: Teacher, columns: List[str] = TEACHER_COLUMNS, relations: List[str] = TEACHER_RELATIONS) -> Dict[str, Any]:
+    """A teacher with the requested relations, as plain data safe to cache"""
+    entry = pick(teacher, columns)
+    if "user" in relations:
+        entry["user"] = pick(teacher.user, USER_FIELDS) if teacher.user else None
+    if "classes" in relations:
+        entry["classes"] = [pick(cls, CLASS_FIELDS) for cls in sorted(teacher.classes, key=lambda cls: cls.id)]
+    return entry
+
+def load_teacher_directory(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    columns: List[str] = TEACHER_COLUMNS,
+    relations: List[str] = TEACHER_RELATIONS
+) -> List[Dict[str, Any]]:
+    """One page of teachers in at most three queries: teachers, their users and their classes"""
+    query = db.query(Teacher)
+    if columns != TEACHER_COLUMNS:
+        query = query.options(load_columns(Teacher, set(columns) | {"id", "user_id"}))
+    if "user" in relations:
+        query = query.options(selectinload(Teacher.user))
+    if "classes" in relations:
+        query = query.options(selectinload(Teacher.classes))
+    
+    teachers = query.order_by(Teacher.id).offset(skip).limit(limit).all()
+    return [teacher_entry(teacher, columns, relations) for teacher in teachers]
+
+def get_teacher_directory(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    columns: Optional[List[str]] = None,
+    relations: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """A directory page, served from the cache when enabled"""
+    columns = columns or TEACHER_COLUMNS
+    relations = TEACHER_RELATIONS if relations is None else relations
+    
+    def compute():
+        return load_teacher_directory(db, skip, limit, columns, relations)
+    
+    if not TEACHER_DIRECTORY_CACHE_SECONDS:
+        return compute()
+    return teacher_directory_cache.get_or_compute((skip, limit, tuple(columns), tuple(relations)), compute)
+
+def invalidate_directory_caches():
+    invalidate_group("directory")
+
+# Writes to teachers, their users or classes drop the cache once their session
+# commits, so no reader can cache pre-commit data
+after_commit_of_writes("teacher_directory_dirty", (Teacher, Class, User), invalidate_directory_caches)
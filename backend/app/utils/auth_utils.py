@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
@@ -15,6 +15,11 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
+# Stream tokens let EventSource clients, which cannot send an Authorization
+# header, authenticate with ?token=; they only need to outlive the connect
+STREAM_TOKEN_SCOPE = "stream"
+STREAM_TOKEN_EXPIRE_SECONDS = 60
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
@@ -42,7 +47,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def create_stream_token(username: str):
+    return create_access_token(
+        {"sub": username, "scope": STREAM_TOKEN_SCOPE}, timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS)
+    )
+
+def user_from_token(db: Session, token: str, scope: Optional[str] = None):
+    """The user a token was issued to; a token is only accepted where its scope is expected"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -51,7 +62,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        if username is None or payload.get("scope") != scope:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
@@ -60,6 +71,13 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         raise credentials_exception
     return user
 
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    return user_from_token(db, token)
+
+async def get_stream_user(token: str = Query(...), db: Session = Depends(get_db)):
+    """The active user of a ?token= stream token"""
+    return await get_current_active_user(user_from_token(db, token, STREAM_TOKEN_SCOPE))
+
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -0,0 +1,82 @@
+# backend/app/utils/export_utils.py
+import csv
+import io
+import json
+import zipfile
+from datetime import date, datetime
+from typing import Iterable, Iterator, List, Sequence
+
+# Rows fetched from the database per round trip while streaming
+STREAM_BATCH_SIZE = 1000
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def iter_ndjson(rows: Iterable[Sequence], columns: List[str]) -> Iterator[str]:
+    """Serialize rows as newline-delimited JSON, one object per line"""
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+
+def iter_csv(rows: Iterable[Sequence], columns: List[str]) -> Iterator[str]:
+    """Serialize rows as CSV with a header line, one chunk per row"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerow([value.isoformat() if isinstance(value, (date, datetime)) else value for value in row])
+        yield buffer.getvalue()
+
+def stream_query_rows(session_factory, build_query):
+    """Yield rows from a server-side cursor in a session owned by the stream
+
+    The request's session may be closed before a streamed body finishes, so the
+    generator opens and closes its own session around the export.
+    """
+    db = session_factory()
+    try:
+        query = build_query(db).execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE)
+        for row in query:
+            yield row
+    finally:
+        db.close()
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def iter_zip(entries: Iterable) -> Iterator[bytes]:
+    """Stream a zip archive of (name, path_or_bytes) entries without buffering it
+
+    Each member is emitted as soon as it is compressed, so memory use is
+    bounded by the largest single member rather than the whole archive.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in entries:
+            if isinstance(content, bytes):
+                archive.writestr(name, content)
+            else:
+                archive.write(content, arcname=name)
+            yield sink.drain()
+    yield sink.drain()
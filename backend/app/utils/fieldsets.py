@@ -0,0 +1,63 @@
+# backend/app/utils/fieldsets.py
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import load_only
+
+def parse_fieldset(value: Optional[str], allowed: Sequence[str], parameter: str = "fields") -> Optional[List[str]]:
+    """Split a comma-separated fields=/include= value, rejecting unknown names
+    
+    Returns None when the parameter was not given, so callers can keep
+    their full default payload.
+    """
+    if value is None:
+        return None
+    
+    requested = list(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {parameter}: {', '.join(unknown)} (allowed: {', '.join(allowed)})"
+        )
+    return requested
+
+def resolve_fieldsets(
+    fields: Optional[str],
+    include: Optional[str],
+    columns: Sequence[str],
+    relations: Sequence[str] = ()
+):
+    """Return (columns, relations) to load, or (None, None) for the full payload
+    
+    Naming fields without include drops the relations; naming include
+    without fields keeps every column. "id" is always returned.
+    """
+    selected_columns = parse_fieldset(fields, columns)
+    selected_relations = parse_fieldset(include, relations, "include")
+    
+    if selected_columns is None and selected_relations is None:
+        return None, None
+    
+    if selected_columns is None:
+        selected_columns = list(columns)
+    elif "id" in columns and "id" not in selected_columns:
+        selected_columns.insert(0, "id")
+    
+    return selected_columns, selected_relations or []
+
+def load_columns(model, names: Iterable[str]):
+    """load_only() option restricting a query to the named mapped columns"""
+    return load_only(*(getattr(model, name) for name in names))
+
+def pick(item: Any, names: Iterable[str]) -> Dict[str, Any]:
+    """The named attributes (or keys) of an ORM object or dict"""
+    if isinstance(item, dict):
+        return {name: item[name] for name in names}
+    return {name: getattr(item, name) for name in names}
+
+def sparse_response(items: List[Dict[str, Any]], headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    """Serialize trimmed rows directly, bypassing the route's full response model"""
+    return JSONResponse(content=jsonable_encoder(items), headers=headers)
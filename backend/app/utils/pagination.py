@@ -0,0 +1,39 @@
+# backend/app/utils/pagination.py
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    payload = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_filter(sort_column, id_column, cursor: Optional[str], descending: bool = False):
+    """Build the WHERE clause that continues a (sort_column, id) ordered listing"""
+    if not cursor:
+        return None
+    
+    values = decode_cursor(cursor)
+    if len(values) != 2:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    last_value, last_id = values
+    
+    # Dates travel as ISO strings inside the cursor
+    python_type = getattr(sort_column.type, "python_type", None)
+    if python_type is date and isinstance(last_value, str):
+        last_value = date.fromisoformat(last_value)
+    
+    if descending:
+        return or_(sort_column < last_value, and_(sort_column == last_value, id_column < last_id))
+    return or_(sort_column > last_value, and_(sort_column == last_value, id_column > last_id))
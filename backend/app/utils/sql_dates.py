@@ -0,0 +1,76 @@
+# backend/app/utils/sql_dates.py
+from datetime import date, datetime
+
+from sqlalchemy import func, cast, case, extract, Date
+from sqlalchemy.orm import Session
+
+def dialect_name(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+def days_between(db: Session, later, earlier):
+    """SQL expression for the number of days from earlier to later"""
+    dialect = dialect_name(db)
+    
+    if dialect == "sqlite":
+        return func.julianday(later) - func.julianday(earlier)
+    
+    if dialect == "mysql":
+        return func.datediff(later, earlier)
+    
+    # PostgreSQL: subtracting dates yields an integer number of days
+    return cast(later, Date) - cast(earlier, Date)
+
+# Months in which each school term begins; a term runs until the next one starts
+TERM_START_MONTHS = (1, 5, 9)
+
+def date_bucket(db: Session, column, period: str):
+    """SQL expression grouping a date column into day/week/month/term buckets
+
+    Weeks start on Monday. Day, week and month buckets evaluate to the
+    bucket's first day; term buckets to the integer year * 100 + start month.
+    Pass the value through bucket_start to get a date on any backend.
+    """
+    dialect = dialect_name(db)
+    
+    if period == "day":
+        return column
+    
+    if period == "week":
+        if dialect == "sqlite":
+            # Forward to Sunday (unless already one), then back to its Monday
+            return func.date(column, "weekday 0", "-6 days")
+        if dialect == "mysql":
+            return func.subdate(column, func.weekday(column))
+        return cast(func.date_trunc("week", column), Date)
+    
+    if period == "month":
+        if dialect == "sqlite":
+            return func.date(column, "start of month")
+        if dialect == "mysql":
+            return func.date_format(column, "%Y-%m-01")
+        return cast(func.date_trunc("month", column), Date)
+    
+    if period == "term":
+        month = extract("month", column)
+        start_month = case(
+            *[(month >= start, start) for start in reversed(TERM_START_MONTHS[1:])],
+            else_=TERM_START_MONTHS[0]
+        )
+        return extract("year", column) * 100 + start_month
+    
+    raise ValueError(f"Unknown bucket period: {period}")
+
+def bucket_start(value, period: str) -> date:
+    """First day of a bucket returned by a date_bucket expression"""
+    if period == "term":
+        key = int(value)
+        return date(key // 100, key % 100, 1)
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def term_number(start: date) -> int:
+    """1-based position of the term starting on the given date"""
+    return TERM_START_MONTHS.index(start.month) + 1
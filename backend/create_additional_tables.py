@@ -24,6 +24,7 @@ from app.models.user import Base, User, UserRole
 from app.models.student import Student, Class, Teacher
 from app.models.grade import Grade, Attendance
 from app.models.fee import Fee
+from app.models.risk import StudentRiskScore
 
 # Define new tables
 
@@ -0,0 +1,52 @@
+# backend/create_indexes.py
+
+import os
+import sys
+
+# Add the parent directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.schema import CreateIndex
+from config import DATABASE_URL
+
+# Import the models so their indexes are registered on the metadata
+from app.models.user import Base
+from app.models.fee import Fee
+from app.models.grade import Grade
+
+# Indexes added to tables that already existed. create_all() skips existing
+# tables, so databases created before these indexes need this script; it is
+# safe to run any number of times.
+ADDED_INDEXES = [
+    # /financial/payments-due
+    ("fees", "ix_fees_student_id"),
+    ("fees", "ix_fees_due_date"),
+    ("fees", "ix_fees_unpaid_due_date"),
+    # Subject comparison and grade analytics
+    ("grades", "ix_grades_student_subject_term"),
+]
+
+def find_index(table_name, index_name):
+    for index in Base.metadata.tables[table_name].indexes:
+        if index.name == index_name:
+            return index
+    raise ValueError(f"No index {index_name} on {table_name}")
+
+def create_indexes(engine):
+    for table_name, index_name in ADDED_INDEXES:
+        index = find_index(table_name, index_name)
+        with engine.begin() as connection:
+            if connection.dialect.name in ("postgresql", "sqlite"):
+                connection.execute(CreateIndex(index, if_not_exists=True))
+            else:
+                # No CREATE INDEX IF NOT EXISTS (MySQL); check the catalog first
+                index.create(connection, checkfirst=True)
+        print(f"Index {index_name} on {table_name} is in place")
+
+if __name__ == "__main__":
+    try:
+        create_indexes(create_engine(DATABASE_URL))
+        print("\nIndexes created successfully!")
+    except Exception as e:
+        print(f"Error creating indexes: {e}")
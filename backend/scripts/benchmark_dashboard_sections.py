@@ -0,0 +1,91 @@
+# backend/scripts/benchmark_dashboard_sections.py
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+# Add the parent directory to the path so we can import modules properly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmark_utils import Base, seed_students, seed_fees, seed_grades, seed_attendance, time_call
+from app.services.dashboard import shared_sections
+from app.services.sections import run_sections
+from app.services.fee_summary import fee_summary_cache
+from app.routers.analytics import (
+    attendance_counts_today,
+    attendance_series,
+    grade_distribution_data,
+    performance_trends_data,
+    fee_collection_data,
+    fee_distribution_data
+)
+
+STUDENT_COUNT = 20_000
+FEE_COUNT = 300_000
+GRADE_COUNT = 300_000
+ATTENDANCE_DAYS = 30
+
+def all_sections():
+    """Every independent dashboard and analytics section"""
+    sections = shared_sections()
+    sections.update({
+        "attendance_counts": attendance_counts_today,
+        "attendance_data": lambda db: attendance_series(db, date.today() - timedelta(days=180)),
+        "grade_distribution": grade_distribution_data,
+        "performance_trends": performance_trends_data,
+        "fee_collection": fee_collection_data,
+        "fee_distribution": fee_distribution_data
+    })
+    return sections
+
+def benchmark_dashboard_sections(url: str = None):
+    """Compare sequential and concurrent section latency against the slowest section
+
+    Pass the URL of an empty PostgreSQL database to measure against a real
+    server; the default is a temporary SQLite file. SQLite queries run on
+    this machine's CPUs, so they only overlap when several cores are free.
+    """
+    url = url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'dashboard.db')}"
+    engine = create_engine(url, pool_size=16)
+    Base.metadata.create_all(bind=engine)
+    SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    db = SessionFactory()
+    student_ids = seed_students(db, STUDENT_COUNT)
+    seed_fees(db, student_ids, FEE_COUNT)
+    seed_grades(db, student_ids, GRADE_COUNT)
+    seed_attendance(db, student_ids, ATTENDANCE_DAYS)
+    
+    sections = all_sections()
+    
+    # Keep the fee summary cache out of the measurement
+    def uncached(section):
+        def run(section_db):
+            fee_summary_cache.invalidate()
+            return section(section_db)
+        return run
+    sections = {name: uncached(section) for name, section in sections.items()}
+    
+    print(f"{'section':<20} {'ms':>8}")
+    slowest = 0.0
+    for name, section in sections.items():
+        elapsed = time_call(lambda: section(db), repeat=5)
+        slowest = max(slowest, elapsed)
+        print(f"{name:<20} {elapsed:>8.1f}")
+    
+    sequential = time_call(lambda: [section(db) for section in sections.values()], repeat=5)
+    concurrent = time_call(lambda: run_sections(sections, session_factory=SessionFactory), repeat=5)
+    
+    print()
+    print(f"cpus:             {os.cpu_count():>8}")
+    print(f"sequential total: {sequential:>8.1f} ms")
+    print(f"concurrent total: {concurrent:>8.1f} ms")
+    print(f"slowest section:  {slowest:>8.1f} ms")
+    db.close()
+
+if __name__ == "__main__":
+    benchmark_dashboard_sections(sys.argv[1] if len(sys.argv) > 1 else None)
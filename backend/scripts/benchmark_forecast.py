@@ -0,0 +1,78 @@
+# backend/scripts/benchmark_forecast.py
+
+import os
+import sys
+import random
+from datetime import date, datetime, timedelta
+
+# Add the parent directory to the path so we can import modules properly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+
+from benchmark_utils import make_session, seed_students, seed_fees, time_call
+from app.models.fee import FeePayment
+from app.services.forecast import (
+    load_forecast_inputs, project_weekly_collections, refresh_forecast_inputs, get_cash_flow_forecast,
+    forecast_cache, forecast_inputs_cache
+)
+from app.services.fee_summary import invalidate_fee_caches
+
+# A forecast request must stay well under this once the scheduler has loaded the inputs
+REQUEST_BUDGET_MS = 1000
+
+FEE_COUNT = 300_000
+STUDENT_COUNT = 30_000
+PAYMENT_COUNT = 100_000
+
+def seed_payments(db, fee_count: int, payment_count: int, seed: int = 7):
+    """Insert payment history with a delay of up to 60 days after an arbitrary due date"""
+    rng = random.Random(seed)
+    start = datetime.combine(date.today() - timedelta(days=365), datetime.min.time())
+    db.execute(insert(FeePayment), [
+        {
+            "fee_id": fee_id,
+            "student_id": (fee_id - 1) % STUDENT_COUNT + 1,
+            "amount": 100.0,
+            "paid_at": start + timedelta(days=rng.randint(0, 400)),
+            "method": "manual"
+        }
+        for fee_id in (rng.randint(1, fee_count) for _ in range(payment_count))
+    ])
+    db.commit()
+
+def benchmark_forecast():
+    """Time the input load and a forecast request at 300k fees"""
+    db = make_session()
+    student_ids = seed_students(db, STUDENT_COUNT)
+    seed_fees(db, student_ids, FEE_COUNT, spread_days=180)
+    seed_payments(db, FEE_COUNT, PAYMENT_COUNT)
+    
+    inputs = load_forecast_inputs(db)
+    today = date.today()
+    
+    load_ms = time_call(lambda: load_forecast_inputs(db), repeat=3)
+    project_ms = time_call(lambda: project_weekly_collections(inputs, today, 12))
+    
+    # What a request pays: the scheduler has warmed the inputs, the projection is not cached
+    refresh_forecast_inputs(db)
+    
+    def request():
+        forecast_cache.invalidate()
+        return get_cash_flow_forecast(db, 12)
+    
+    request_ms = time_call(request, repeat=5)
+    
+    print(f"open fees: {len(inputs['balance'])}, families with history: {len(inputs['history_family'])}")
+    print(f"input load (3 queries):     {load_ms:.1f} ms")
+    print(f"projection:                 {project_ms:.1f} ms")
+    print(f"request:                    {request_ms:.1f} ms (budget {REQUEST_BUDGET_MS} ms)")
+    assert request_ms < REQUEST_BUDGET_MS
+    
+    # A recorded payment must clear the inputs, not wait for the next warm-up
+    invalidate_fee_caches()
+    assert forecast_inputs_cache.stats()["entries"] == 0
+    db.close()
+
+if __name__ == "__main__":
+    benchmark_forecast()
@@ -0,0 +1,37 @@
+# backend/scripts/benchmark_payments_due.py
+
+import os
+import sys
+from datetime import date, timedelta
+
+# Add the parent directory to the path so we can import modules properly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_utils import make_session, seed_students, seed_fees, time_call
+from app.routers.financial import payments_due_query
+
+# Fee table sizes to benchmark; due dates are spread so the 30 day window
+# always holds roughly the same number of rows
+SIZES = [1_000, 10_000, 100_000]
+ROWS_PER_DAY = 20
+
+def benchmark_payments_due():
+    """Time /financial/payments-due's query as the fee table grows"""
+    today = date.today()
+    end_date = today + timedelta(days=30)
+    
+    print(f"{'fees':>10} {'rows':>8} {'admin ms':>10} {'parent ms':>10}")
+    for size in SIZES:
+        db = make_session()
+        student_ids = seed_students(db, max(100, size // 10))
+        seed_fees(db, student_ids, size, spread_days=max(60, size // ROWS_PER_DAY))
+        
+        rows = payments_due_query(db, today, end_date).all()
+        admin_ms = time_call(lambda: payments_due_query(db, today, end_date).all())
+        parent_ms = time_call(lambda: payments_due_query(db, today, end_date, parent_id=1).all())
+        
+        print(f"{size:>10} {len(rows):>8} {admin_ms:>10.2f} {parent_ms:>10.2f}")
+        db.close()
+
+if __name__ == "__main__":
+    benchmark_payments_due()
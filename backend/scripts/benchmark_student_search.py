@@ -0,0 +1,89 @@
+# backend/scripts/benchmark_student_search.py
+
+import os
+import sys
+import random
+import statistics
+import time
+
+# Add the parent directory to the path so we can import modules properly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import update
+
+from benchmark_utils import make_session, seed_students
+from app.models.student import Student
+from app.services.student_search import StudentSearchIndex
+
+STUDENT_COUNT = 50_000
+
+# Type-ahead latency budget per keystroke
+TARGET_MS = 10
+
+SYLLABLES = ["ka", "mo", "ri", "an", "jo", "el", "wa", "ni", "sa", "to", "be", "lu", "da", "mi", "ke", "ro", "na", "ch", "ze", "pa"]
+
+def seed_names(db, student_ids, seed: int = 42):
+    """Give students varied names: a few hundred first names, a few thousand surnames"""
+    rng = random.Random(seed)
+    
+    def name(parts: int) -> str:
+        return "".join(rng.choice(SYLLABLES) for _ in range(parts)).capitalize()
+    
+    first_names = [name(2) for _ in range(400)] + ["John", "Mary", "Johnson", "Joan", "Johnny"]
+    last_names = [name(3) for _ in range(4000)] + ["Smith", "Smyth", "Smithers"]
+    rows = [
+        {"id": student_id, "first_name": rng.choice(first_names), "last_name": rng.choice(last_names)}
+        for student_id in student_ids
+    ]
+    # A few known students for the multi-term queries to find
+    for row, (first_name, last_name) in zip(rows, [("John", "Smith"), ("Jon", "Smyth"), ("Johnny", "Smithers")] * 10):
+        row.update(first_name=first_name, last_name=last_name)
+    db.execute(update(Student), rows)
+    db.commit()
+
+def time_query(index: StudentSearchIndex, query: str, repeat: int = 50):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = index.search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1], len(results)
+
+def benchmark_student_search():
+    """Time index builds and type-ahead queries over 50k students"""
+    db = make_session()
+    student_ids = seed_students(db, STUDENT_COUNT)
+    seed_names(db, student_ids)
+    
+    index = StudentSearchIndex(session_factory=lambda: db)
+    start = time.perf_counter()
+    index.ensure_fresh()
+    print(f"index build over {STUDENT_COUNT} students: {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    queries = [
+        ("j", "one letter"),
+        ("jo", "prefix"),
+        ("joh", "prefix"),
+        ("john sm", "two prefixes"),
+        ("smith", "exact surname"),
+        ("smiht", "typo"),
+        ("jon smiht", "prefix + typo"),
+        ("adm0123", "admission prefix"),
+        ("ADM012345", "admission exact"),
+        ("zzzz", "no match"),
+    ]
+    
+    print(f"{'query':<14} {'kind':<18} {'results':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    slowest = 0.0
+    for query, kind in queries:
+        median, p95, count = time_query(index, query)
+        slowest = max(slowest, p95)
+        print(f"{query:<14} {kind:<18} {count:>8} {median:>8.2f} {p95:>8.2f}")
+    
+    print()
+    print(f"slowest p95: {slowest:.2f} ms (target {TARGET_MS} ms)")
+    db.close()
+
+if __name__ == "__main__":
+    benchmark_student_search()
@@ -0,0 +1,184 @@
+# backend/scripts/benchmark_utils.py
+
+import os
+import sys
+import time
+import random
+import statistics
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+# Add the parent directory to the path so we can import modules properly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, update, event, func
+from sqlalchemy.orm import sessionmaker
+
+# Import every model module so all relationships resolve
+from app.models.user import Base, User, UserRole
+from app.models.student import Student, Class, Teacher, student_class
+from app.models.grade import Grade, Attendance
+from app.models.fee import Fee
+from app.models.counter import EntityCounter
+from app.models.risk import StudentRiskScore
+from app.models.timetable import TimeSlot, Event, Message, ReportCard, GradeSummary, LearningMaterial, ClassMaterial
+
+def make_session(url: str = "sqlite://"):
+    """Create a throwaway database with the full schema and return a session"""
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return SessionLocal()
+
+def seed_students(db, student_count: int, parent_count: int = None, class_count: int = 10):
+    """Insert parents, classes and students in bulk and return the student ids"""
+    parent_count = parent_count or max(1, student_count // 2)
+    
+    db.execute(insert(User), [
+        {
+            "username": f"parent{i}",
+            "email": f"parent{i}@example.com",
+            "full_name": f"Parent {i}",
+            "hashed_password": "x",
+            "role": UserRole.PARENT,
+            "is_active": True
+        }
+        for i in range(parent_count)
+    ])
+    db.execute(insert(Class), [
+        {"name": f"Class {i}", "grade_level": str(i % 3)}
+        for i in range(class_count)
+    ])
+    db.execute(insert(Student), [
+        {
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "date_of_birth": date(2020, 1, 1),
+            "admission_number": f"ADM{i:06d}",
+            "parent_id": (i % parent_count) + 1
+        }
+        for i in range(student_count)
+    ])
+    db.execute(insert(student_class), [
+        {"student_id": i + 1, "class_id": (i % class_count) + 1}
+        for i in range(student_count)
+    ])
+    db.commit()
+    return list(range(1, student_count + 1))
+
+def seed_teachers(db, teacher_count: int):
+    """Insert teacher users and profiles, assign every class round-robin and return the teacher ids"""
+    first_user_id = (db.query(func.max(User.id)).scalar() or 0) + 1
+    db.execute(insert(User), [
+        {
+            "username": f"teacher{i}",
+            "email": f"teacher{i}@example.com",
+            "full_name": f"Teacher {i}",
+            "hashed_password": "x",
+            "role": UserRole.TEACHER,
+            "is_active": True
+        }
+        for i in range(teacher_count)
+    ])
+    db.execute(insert(Teacher), [
+        {"specialization": ["Math", "English", "Science"][i % 3], "user_id": first_user_id + i}
+        for i in range(teacher_count)
+    ])
+    teacher_ids = [teacher_id for (teacher_id,) in db.query(Teacher.id).order_by(Teacher.id).all()][-teacher_count:]
+    
+    class_ids = [class_id for (class_id,) in db.query(Class.id).order_by(Class.id).all()]
+    if class_ids:
+        db.execute(update(Class), [
+            {"id": class_id, "teacher_id": teacher_ids[i % teacher_count]}
+            for i, class_id in enumerate(class_ids)
+        ])
+    db.commit()
+    return teacher_ids
+
+def seed_fees(db, student_ids, fee_count: int, spread_days: int = 365, seed: int = 42):
+    """Insert fee rows spread evenly around today with a mix of payment states"""
+    rng = random.Random(seed)
+    today = date.today()
+    rows = []
+    
+    for i in range(fee_count):
+        amount = float(rng.choice([500, 750, 1000, 1500]))
+        paid = rng.choice([0.0, amount / 2, amount])
+        rows.append({
+            "student_id": student_ids[i % len(student_ids)],
+            "amount": amount,
+            "description": "Tuition Fee",
+            "due_date": today + timedelta(days=rng.randint(-spread_days // 2, spread_days // 2)),
+            "paid": paid,
+            "status": "paid" if paid >= amount else ("partial" if paid > 0 else "pending"),
+            "term": rng.choice(["Term 1", "Term 2", "Term 3"]),
+            "academic_year": "2024-2025"
+        })
+    
+    db.execute(insert(Fee), rows)
+    db.commit()
+
+def seed_grades(db, student_ids, grade_count: int, seed: int = 42):
+    """Insert grades across a few subjects and terms over the past year"""
+    rng = random.Random(seed)
+    today = date.today()
+    letters = [(90, "A"), (80, "B"), (70, "C"), (60, "D"), (0, "F")]
+    rows = []
+    
+    for i in range(grade_count):
+        score = float(rng.randint(35, 100))
+        rows.append({
+            "student_id": student_ids[i % len(student_ids)],
+            "subject": rng.choice(["Math", "English", "Science", "Art", "Music"]),
+            "score": score,
+            "grade_letter": next(letter for floor, letter in letters if score >= floor),
+            "term": rng.choice(["Term 1", "Term 2", "Term 3"]),
+            "date_recorded": today - timedelta(days=rng.randint(0, 365))
+        })
+    
+    db.execute(insert(Grade), rows)
+    db.commit()
+
+def seed_attendance(db, student_ids, days: int, seed: int = 42):
+    """Insert one attendance record per student per school day for the past days"""
+    rng = random.Random(seed)
+    today = date.today()
+    rows = []
+    
+    for offset in range(days):
+        day = today - timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        for student_id in student_ids:
+            rows.append({
+                "student_id": student_id,
+                "date": day,
+                "status": rng.choices(["present", "absent", "late", "excused"], [85, 8, 5, 2])[0]
+            })
+    
+    db.execute(insert(Attendance), rows)
+    db.commit()
+
+def time_call(fn, repeat: int = 20):
+    """Run fn repeatedly and return the median wall time in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+@contextmanager
+def count_queries(db):
+    """Count the SQL statements a session's engine executes inside the block"""
+    counter = {"count": 0}
+    
+    def before_cursor_execute(*args):
+        counter["count"] += 1
+    
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
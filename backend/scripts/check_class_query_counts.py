@@ -0,0 +1,59 @@
+# backend/scripts/check_class_query_counts.py
+
+import os
+import sys
+
+# Add the parent directory to the path so we can import modules properly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_utils import make_session, seed_students, seed_teachers, count_queries
+from app.models.user import User, UserRole
+from app.routers.classes import get_all_classes, get_class
+
+# Class counts compared; the query count must not grow with the listing
+SIZES = [1, 100]
+
+STUDENTS_PER_CLASS = 5
+
+def measure(size: int):
+    """Return the number of queries the class endpoints issue with size classes"""
+    db = make_session()
+    seed_students(db, size * STUDENTS_PER_CLASS, parent_count=size, class_count=size)
+    seed_teachers(db, max(1, size // 2))
+    
+    admin = db.query(User).filter(User.role == UserRole.TEACHER).first()
+    admin.role = "admin"
+    parent = db.query(User).filter(User.role == UserRole.PARENT).first()
+    db.commit()
+    
+    counts = {}
+    checks = {
+        "list (admin)": lambda: get_all_classes(db=db, current_user=admin),
+        "list (parent)": lambda: get_all_classes(db=db, current_user=parent),
+        "detail (parent)": lambda: get_class(class_id=1, db=db, current_user=parent),
+    }
+    for name, check in checks.items():
+        # Start from an empty identity map so nothing is served from memory
+        db.expire_all()
+        with count_queries(db) as counter:
+            result = check()
+        counts[name] = counter["count"]
+        if name == "list (admin)":
+            assert len(result) == size and all(len(cls["students"]) == STUDENTS_PER_CLASS for cls in result)
+    db.close()
+    return counts
+
+def check_class_query_counts():
+    """Assert that the class listing uses a constant number of queries"""
+    results = {size: measure(size) for size in SIZES}
+    
+    print(f"{'endpoint':<18}" + "".join(f"{size:>8}" for size in SIZES))
+    for name in results[SIZES[0]]:
+        print(f"{name:<18}" + "".join(f"{results[size][name]:>8}" for size in SIZES))
+    
+    for name, count in results[SIZES[0]].items():
+        assert all(results[size][name] == count for size in SIZES), f"{name} query count grows with the number of classes"
+    print("OK: query counts are independent of the number of classes")
+
+if __name__ == "__main__":
+    check_class_query_counts()
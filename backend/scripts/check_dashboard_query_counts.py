@@ -0,0 +1,90 @@
+# backend/scripts/check_dashboard_query_counts.py
+
+import os
+import sys
+import asyncio
+from datetime import date, datetime, timedelta
+
+# Add the parent directory to the path so we can import modules properly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, delete
+
+from benchmark_utils import make_session, seed_students, count_queries
+from app.models.user import User
+from app.models.timetable import Event, Message
+from app.services.dashboard import _upcoming_events, compute_latest_messages
+from app.routers.dashboard import get_events, get_calendar_day_summary
+
+# Listing sizes compared; the query count must not grow with the list
+SIZES = [1, 50]
+
+def seed_events_and_messages(db, count: int):
+    """Replace all events and messages with count of each, spread over several users"""
+    db.execute(delete(Event))
+    db.execute(delete(Message))
+    today = date.today()
+    db.execute(insert(Event), [
+        {
+            "title": f"Event {i}",
+            "start_date": today,
+            "end_date": today + timedelta(days=1),
+            "event_type": "activity",
+            "created_by": (i % 10) + 1
+        }
+        for i in range(count)
+    ])
+    db.execute(insert(Message), [
+        {
+            "sender_id": (i % 10) + 1,
+            "recipient_id": ((i + 1) % 10) + 1,
+            "subject": f"Subject {i}",
+            "content": "Hello",
+            "sent_at": datetime.now() - timedelta(minutes=i),
+            "read": False
+        }
+        for i in range(count)
+    ])
+    db.commit()
+
+def measure(db, admin):
+    """Return the number of queries each dashboard listing issues"""
+    counts = {}
+    checks = {
+        "upcoming events": lambda: _upcoming_events(db),
+        "latest messages": lambda: compute_latest_messages(db, admin),
+        "events": lambda: asyncio.run(get_events(db=db, current_user=admin)),
+        "calendar day": lambda: asyncio.run(get_calendar_day_summary(day_date=date.today(), db=db, current_user=admin)),
+    }
+    for name, check in checks.items():
+        # Start from an empty identity map so nothing is served from memory
+        db.expire_all()
+        with count_queries(db) as counter:
+            check()
+        counts[name] = counter["count"]
+    return counts
+
+def check_dashboard_query_counts():
+    """Assert that dashboard listings use a constant number of queries"""
+    db = make_session()
+    seed_students(db, 20, parent_count=10)
+    admin = db.query(User).first()
+    admin.role = "admin"
+    db.commit()
+    
+    results = {}
+    for size in SIZES:
+        seed_events_and_messages(db, size)
+        results[size] = measure(db, admin)
+    
+    print(f"{'listing':<18}" + "".join(f"{size:>8}" for size in SIZES))
+    for name in results[SIZES[0]]:
+        print(f"{name:<18}" + "".join(f"{results[size][name]:>8}" for size in SIZES))
+    
+    for name, count in results[SIZES[0]].items():
+        assert all(results[size][name] == count for size in SIZES), f"{name} query count grows with the listing"
+    print("OK: query counts are independent of listing size")
+    db.close()
+
+if __name__ == "__main__":
+    check_dashboard_query_counts()
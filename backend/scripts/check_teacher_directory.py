@@ -0,0 +1,64 @@
+# backend/scripts/check_teacher_directory.py
+
+import os
+import sys
+
+# Add the parent directory to the path so we can import modules properly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_utils import make_session, seed_students, seed_teachers, count_queries
+from app.models.user import User, UserRole
+from app.models.student import Class
+from app.services.teacher_directory import load_teacher_directory, get_teacher_directory, teacher_directory_cache
+
+# Teacher counts compared; the query count must not grow with the directory
+SIZES = [1, 100]
+
+def measure(size: int) -> int:
+    """Return the number of queries one uncached directory page takes with size teachers"""
+    db = make_session()
+    seed_students(db, 10, class_count=size * 2)
+    seed_teachers(db, size)
+    
+    db.expire_all()
+    with count_queries(db) as counter:
+        directory = load_teacher_directory(db, limit=size)
+    assert len(directory) == size and all(len(entry["classes"]) == 2 for entry in directory)
+    db.close()
+    return counter["count"]
+
+def check_invalidation():
+    """A committed class or user change must drop cached directory pages"""
+    db = make_session()
+    seed_students(db, 10, class_count=4)
+    seed_teachers(db, 2)
+    teacher_directory_cache.invalidate()
+    
+    first = get_teacher_directory(db)
+    with count_queries(db) as counter:
+        assert get_teacher_directory(db) == first
+    assert counter["count"] == 0, "a repeated page should come from the cache"
+    
+    db.add(Class(name="New class", grade_level="1", teacher_id=first[0]["id"]))
+    db.commit()
+    assert len(get_teacher_directory(db)[0]["classes"]) == len(first[0]["classes"]) + 1
+    
+    user = db.query(User).filter(User.role == UserRole.TEACHER).first()
+    user.full_name = "Renamed Teacher"
+    db.flush()
+    assert get_teacher_directory(db)[0]["user"]["full_name"] != "Renamed Teacher", "uncommitted changes stay invisible"
+    db.commit()
+    assert get_teacher_directory(db)[0]["user"]["full_name"] == "Renamed Teacher"
+    db.close()
+
+def check_teacher_directory():
+    """Assert a constant query count per directory page and cache invalidation on writes"""
+    results = {size: measure(size) for size in SIZES}
+    print("queries per page: " + ", ".join(f"{size} teachers -> {count}" for size, count in results.items()))
+    assert len(set(results.values())) == 1, "directory query count grows with the number of teachers"
+    
+    check_invalidation()
+    print("OK: constant query count, and the cache is invalidated on commit")
+
+if __name__ == "__main__":
+    check_teacher_directory()
@@ -0,0 +1,59 @@
+# backend/scripts/rebuild_student_accounts.py
+
+import os
+import sys
+import argparse
+
+# Add the parent directory to the path so we can import modules properly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from config import DATABASE_URL
+
+# Import every model module so all relationships resolve
+from app.models.user import Base
+from app.models.student import Student
+from app.models.grade import Grade, Attendance
+from app.models.fee import Fee, StudentAccount
+from app.models.risk import StudentRiskScore
+from app.models.timetable import ReportCard
+from app.services.fee_accounts import find_account_mismatches, rebuild_student_accounts
+
+# Create database engine
+engine = create_engine(DATABASE_URL)
+Base.metadata.create_all(bind=engine, tables=[StudentAccount.__table__])
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+db = SessionLocal()
+
+def main():
+    parser = argparse.ArgumentParser(description="Check or rebuild the per-student fee accounts")
+    parser.add_argument("--rebuild", action="store_true", help="rewrite all accounts from the fees table")
+    args = parser.parse_args()
+    
+    if args.rebuild:
+        count = rebuild_student_accounts(db)
+        db.commit()
+        print(f"Rebuilt {count} student accounts.")
+        return 0
+    
+    mismatches = find_account_mismatches(db)
+    for mismatch in mismatches:
+        print(mismatch)
+    
+    if mismatches:
+        print(f"{len(mismatches)} account(s) out of sync. Run with --rebuild to fix.")
+        return 1
+    
+    print("All student accounts match the fees table.")
+    return 0
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+        sys.exit(2)
+    finally:
+        db.close()
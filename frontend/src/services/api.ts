@@ -410,6 +410,12 @@ export const dashboardApi = {
     }
   },
 
+  // EventSource cannot send the Authorization header, so the stream is opened with a short-lived token
+  openLiveUpdates: async (): Promise<EventSource> => {
+    const response = await api.post('/dashboard/live/token');
+    return new EventSource(`${BASE_URL}/dashboard/live?token=${encodeURIComponent(response.data.token)}`);
+  },
+
   getCalendarDaySummary: async (date: string): Promise<CalendarDaySummary> => {
     try {
       const response = await api.get(`/dashboard/calendar-day?day_date=${date}`);
@@ -854,10 +860,19 @@ export const dashboardApi = {
   },
 
   // Fee endpoints
+  // /fees/all is paged; follow X-Next-Cursor until every fee is loaded
   getFees: async (): Promise<Fee[]> => {
     try {
-      const response = await api.get('/fees/all');
-      return response.data;
+      const fees: Fee[] = [];
+      let cursor: string | undefined;
+      do {
+        const params = new URLSearchParams({ limit: '1000' });
+        if (cursor) params.append('cursor', cursor);
+        const response = await api.get(`/fees/all?${params.toString()}`);
+        fees.push(...response.data);
+        cursor = response.headers['x-next-cursor'];
+      } while (cursor);
+      return fees;
     } catch (error) {
       console.error('Error fetching fees:', error);
       